@@ -1,43 +1,115 @@
-// Script KWin: distribui cada instância gamescope em um monitor diferente (modo fullscreen do GUI)
-
-function getGamescopeClients() {
-  var allClients = workspace.windowList();
-  var gamescopeClients = [];
-  for (var i = 0; i < allClients.length; i++) {
-    if (allClients[i].resourceClass == "gamescope") {
-      gamescopeClients.push(allClients[i]);
+// KWin script loaded by Twinverse: places each gamescope window on the geometry its instance was sized for.
+// The geometry is not part of the script. It is read from Twinverse over D-Bus whenever a gamescope window
+// appears, so the same script keeps working when the session layout changes.
+
+var service = __TWINVERSE_DBUS_SERVICE__;
+var objectPath = __TWINVERSE_DBUS_PATH__;
+var interfaceName = __TWINVERSE_DBUS_INTERFACE__;
+
+var layout = { generation: -1, keepAbove: false, slots: [] };
+// Gamescope windows keyed by window id, with the slot they were given (-1 while waiting for one)
+var placed = {};
+var freeSlots = [];
+
+function isGamescope(window) {
+  return window && window.resourceClass == "gamescope";
+}
+
+function takeSlot(window) {
+  // Prefer the slot whose size gamescope was started with, so instances launched in parallel
+  // still end up where they were sized for
+  var size = window.frameGeometry;
+  for (var i = 0; i < freeSlots.length; i++) {
+    var slot = layout.slots[freeSlots[i]];
+    if (slot.width == size.width && slot.height == size.height) {
+      return freeSlots.splice(i, 1)[0];
+    }
+  }
+  return freeSlots.length > 0 ? freeSlots.shift() : -1;
+}
+
+function releaseSlot(index) {
+  var position = 0;
+  while (position < freeSlots.length && freeSlots[position] < index) {
+    position++;
+  }
+  freeSlots.splice(position, 0, index);
+}
+
+function placeWaitingWindows() {
+  for (var id in placed) {
+    var entry = placed[id];
+    if (entry.slot >= 0) {
+      continue;
+    }
+    entry.slot = takeSlot(entry.window);
+    if (entry.slot < 0) {
+      continue;
     }
+    var slot = layout.slots[entry.slot];
+    entry.window.noBorder = true;
+    entry.window.frameGeometry = { x: slot.x, y: slot.y, width: slot.width, height: slot.height };
   }
-  return gamescopeClients;
 }
 
-function gamescopePerMonitor() {
-  var gamescopeClients = getGamescopeClients();
-  var screens = workspace.screens;
-  var totalScreens = screens.length;
+function applyLayout(next) {
+  layout = next;
+  freeSlots = layout.slots.map(function (slot, index) {
+    return index;
+  });
+  // Windows already on screen are placed again on the new geometry, in the order they appeared
+  for (var id in placed) {
+    placed[id].slot = -1;
+  }
+}
 
-  // Só permite uma instância por monitor
-  var count = Math.min(gamescopeClients.length, totalScreens);
+function refreshLayout() {
+  callDBus(service, objectPath, interfaceName, "GetLayout", function (result) {
+    var next = JSON.parse(result);
+    if (next.generation != layout.generation) {
+      applyLayout(next);
+    }
+    placeWaitingWindows();
+  });
+}
 
-  for (var i = 0; i < count; i++) {
-    var monitor = screens[i];
-    var monitorX = monitor.geometry.x;
-    var monitorY = monitor.geometry.y;
-    var monitorWidth = monitor.geometry.width;
-    var monitorHeight = monitor.geometry.height;
+function onWindowAdded(window) {
+  if (!isGamescope(window)) {
+    return;
+  }
+  placed[window.internalId] = { window: window, slot: -1 };
+  refreshLayout();
+}
 
-    gamescopeClients[i].noBorder = true;
-    gamescopeClients[i].frameGeometry = {
-      x: monitorX,
-      y: monitorY,
-      width: monitorWidth,
-      height: monitorHeight,
-    };
+function onWindowRemoved(window) {
+  var entry = placed[window.internalId];
+  if (!entry) {
+    return;
+  }
+  delete placed[window.internalId];
+  if (entry.slot >= 0) {
+    releaseSlot(entry.slot);
   }
 }
 
-// Atualiza sempre que uma janela é adicionada/removida
-workspace.windowAdded.connect(gamescopePerMonitor);
-workspace.windowRemoved.connect(gamescopePerMonitor);
+function onWindowActivated(window) {
+  if (!layout.keepAbove) {
+    return;
+  }
+  var above = isGamescope(window);
+  for (var id in placed) {
+    placed[id].window.keepAbove = above;
+  }
+}
+
+var existing = workspace.windowList();
+for (var i = 0; i < existing.length; i++) {
+  if (isGamescope(existing[i])) {
+    placed[existing[i].internalId] = { window: existing[i], slot: -1 };
+  }
+}
+refreshLayout();
 
-// Este script deve ser chamado pelo sistema apenas quando a opção "fullscreen" do GUI estiver ativada.
+workspace.windowAdded.connect(onWindowAdded);
+workspace.windowRemoved.connect(onWindowRemoved);
+workspace.windowActivated.connect(onWindowActivated);
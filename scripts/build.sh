@@ -104,7 +104,6 @@ hidden_imports = [
     'pydantic',
     'cairo',
     'evdev',
-    'pydbus',
     'screeninfo'
 ]
 
@@ -2,21 +2,26 @@
 
 from .config import Config
 from .exceptions import (
+    DBusCallError,
     DependencyError,
+    InstanceHealthError,
     ProfileNotFoundError,
     TwinverseError,
     VirtualDeviceError,
 )
-from .layout import LayoutCalculator
+from .layout import InstanceGeometry, LayoutCalculator
 from .logger import Logger
 from .utils import Utils
 
 __all__ = [
     "Config",
+    "DBusCallError",
     "DependencyError",
+    "InstanceHealthError",
     "TwinverseError",
     "ProfileNotFoundError",
     "VirtualDeviceError",
+    "InstanceGeometry",
     "LayoutCalculator",
     "Logger",
     "Utils",
@@ -32,3 +32,15 @@ class VirtualDeviceError(TwinverseError):
     """Raised when there is an error creating or managing a virtual device."""
 
     pass
+
+
+class DBusCallError(TwinverseError):
+    """Raised when a D-Bus method call fails or does not answer in time."""
+
+    pass
+
+
+class InstanceHealthError(TwinverseError):
+    """Raised when the Steam installation of an instance fails its health check."""
+
+    pass
@@ -2,10 +2,24 @@
 Layout calculator module for the Twinverse application.
 
 This module provides functions to calculate screen layouts for splitscreen modes
-using predefined coordinate and dimension arrays.
+using predefined coordinate and dimension arrays for up to four players per
+screen and generated grids beyond that, and to place every instance of a
+session on the available monitors.
 """
 
-from typing import List, Tuple, cast
+import math
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple, cast
+
+
+class InstanceGeometry(NamedTuple):
+    """Placement of a single instance on the desktop, in absolute pixel coordinates."""
+
+    instance_num: int
+    monitor_id: int
+    x: int
+    y: int
+    width: int
+    height: int
 
 
 class LayoutCalculator:
@@ -18,14 +32,19 @@ class LayoutCalculator:
         """
         Get coordinates and dimensions for screen layouts based on number of players and orientation.
 
+        Up to four players use fixed layouts; larger groups are arranged in a grid.
+
         Args:
-            num_players: Number of players (1-4)
+            num_players: Number of players on the screen
             orientation: "horizontal" or "vertical"
 
         Returns:
             Tuple of (x_coords, y_coords, widths, heights) as lists of floats representing
             proportional coordinates and dimensions (0-1 scale)
         """
+        if num_players > 4:
+            return LayoutCalculator._get_grid_coordinates(num_players, orientation)
+
         # Layout definitions for horizontal orientation
         horizontal_layouts = {
             "x": [[], [0], [0, 0], [0, 0, 0.5], [0, 0.5, 0, 0.5]],
@@ -46,8 +65,8 @@ class LayoutCalculator:
         layout = horizontal_layouts if orientation.lower() == "horizontal" else vertical_layouts
 
         # Ensure num_players is within valid range
-        if num_players < 0 or num_players > 4:
-            raise ValueError("Number of players must be between 0 and 4")
+        if num_players < 0:
+            raise ValueError("Number of players must not be negative")
 
         # Return the coordinates and dimensions for the specified number of players
         x_coords = cast(List[float], layout["x"][num_players])
@@ -87,10 +106,116 @@ class LayoutCalculator:
         # Get proportional coordinates and dimensions
         x_coords, y_coords, widths, heights = LayoutCalculator.get_layout_coordinates(num_players, orientation)
 
-        # Convert to pixel values
-        x = int(x_coords[instance_in_group] * monitor_width)
-        y = int(y_coords[instance_in_group] * monitor_height)
-        width = int(widths[instance_in_group] * monitor_width)
-        height = int(heights[instance_in_group] * monitor_height)
+        # Convert to pixel values, deriving sizes from the far edges so neighbours never leave gaps
+        x = round(x_coords[instance_in_group] * monitor_width)
+        y = round(y_coords[instance_in_group] * monitor_height)
+        width = round((x_coords[instance_in_group] + widths[instance_in_group]) * monitor_width) - x
+        height = round((y_coords[instance_in_group] + heights[instance_in_group]) * monitor_height) - y
 
         return x, y, width, height
+
+    @staticmethod
+    def _get_grid_coordinates(
+        num_players: int, orientation: str
+    ) -> Tuple[List[float], List[float], List[float], List[float]]:
+        """
+        Arrange players in a grid as close to square as possible.
+
+        With the vertical orientation players fill rows from left to right, with the
+        horizontal one they fill columns from top to bottom. An incomplete last row
+        (or column) is stretched to use the whole screen.
+        """
+        # Lay the grid out row by row and transpose it for the horizontal orientation
+        per_line = math.ceil(math.sqrt(num_players))
+        lines = math.ceil(num_players / per_line)
+
+        x_coords: List[float] = []
+        y_coords: List[float] = []
+        widths: List[float] = []
+        heights: List[float] = []
+        for index in range(num_players):
+            line, position = divmod(index, per_line)
+            in_line = min(per_line, num_players - line * per_line)
+            along, across = position / in_line, line / lines
+            along_size, across_size = 1 / in_line, 1 / lines
+            if orientation.lower() == "horizontal":
+                x_coords.append(across)
+                y_coords.append(along)
+                widths.append(across_size)
+                heights.append(along_size)
+            else:
+                x_coords.append(along)
+                y_coords.append(across)
+                widths.append(along_size)
+                heights.append(across_size)
+        return x_coords, y_coords, widths, heights
+
+    @staticmethod
+    def compute_session_layout(
+        monitors: Sequence[Dict],
+        instance_nums: Sequence[int],
+        splitscreen: bool,
+        orientation: str = "horizontal",
+        players_per_screen: int = 4,
+        monitor_assignments: Optional[Dict[int, str]] = None,
+    ) -> Dict[int, InstanceGeometry]:
+        """
+        Place every instance of a session on the monitors in a single pass.
+
+        Instances with an explicit monitor assignment go to that monitor. The others
+        fill the monitors in order, one per monitor in fullscreen mode and up to
+        `players_per_screen` per monitor in splitscreen mode. Every monitor is then
+        split among its instances according to its own size.
+
+        Args:
+            monitors: Monitors with 'id', 'x', 'y', 'width', 'height' and optionally 'name'
+            instance_nums: The instances of the session, in launch order
+            splitscreen: Whether several instances may share a monitor
+            orientation: "horizontal" or "vertical"
+            players_per_screen: Maximum number of automatically placed instances per monitor
+            monitor_assignments: Optional monitor name or id for some instances
+
+        Returns:
+            The geometry of every instance that could be placed, keyed by instance number
+        """
+        ordered_monitors = sorted(monitors, key=lambda m: m["id"])
+        capacity = max(1, players_per_screen) if splitscreen else 1
+        assignments = monitor_assignments or {}
+
+        placed: Dict[int, List[int]] = {m["id"]: [] for m in ordered_monitors}
+        automatic = []
+        for instance_num in instance_nums:
+            monitor = LayoutCalculator._find_monitor(ordered_monitors, assignments.get(instance_num))
+            if monitor is not None:
+                placed[monitor["id"]].append(instance_num)
+            else:
+                automatic.append(instance_num)
+
+        for monitor in ordered_monitors:
+            while automatic and len(placed[monitor["id"]]) < capacity:
+                placed[monitor["id"]].append(automatic.pop(0))
+
+        layout: Dict[int, InstanceGeometry] = {}
+        for monitor in ordered_monitors:
+            group = sorted(placed[monitor["id"]], key=list(instance_nums).index)
+            for index, instance_num in enumerate(group):
+                x, y, width, height = LayoutCalculator.calculate_position(
+                    monitor["width"], monitor["height"], len(group), index, orientation
+                )
+                layout[instance_num] = InstanceGeometry(
+                    instance_num, monitor["id"], monitor["x"] + x, monitor["y"] + y, width, height
+                )
+        return layout
+
+    @staticmethod
+    def _find_monitor(monitors: Sequence[Dict], monitor_ref: Optional[str]) -> Optional[Dict]:
+        """Find a monitor by connector name or id."""
+        if not monitor_ref:
+            return None
+        for monitor in monitors:
+            if monitor.get("name") and monitor["name"] == monitor_ref:
+                return monitor
+        for monitor in monitors:
+            if str(monitor["id"]) == str(monitor_ref):
+                return monitor
+        return None
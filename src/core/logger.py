@@ -2,12 +2,67 @@
 Logging module for the Twinverse application.
 
 This module provides a custom logger that writes to both stderr and a log file
-in the specified directory.
+in the specified directory from a background thread.
 """
 
+import atexit
+import json
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
+from typing import Any, Callable, Optional
+
+
+class _Lazy:
+    """Defers building a log argument until the record is formatted."""
+
+    __slots__ = ("_func", "_args")
+
+    def __init__(self, func: Callable[..., Any], *args: Any):
+        self._func = func
+        self._args = args
+
+    def __str__(self) -> str:
+        return str(self._func(*self._args))
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """Queue handler that leaves formatting to the listener thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Enqueue the record as is; `QueueHandler` would format it in the calling thread."""
+        return record
+
+
+class _TextFormatter(logging.Formatter):
+    """Formats records as text, appending their structured fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Format a record."""
+        message = super().format(record)
+        fields = getattr(record, "fields", None)
+        if fields:
+            message += " [" + " ".join(f"{key}={value}" for key, value in fields.items()) + "]"
+        return message
+
+
+class _JsonFormatter(logging.Formatter):
+    """Formats records as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Format a record."""
+        entry = {
+            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", None) or {})
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
 
 
 class Logger:
@@ -15,15 +70,22 @@ class Logger:
     A custom logger for Twinverse providing console and file output.
 
     This class configures a logger that writes to both stderr and a log file
-    in the specified directory. It's designed to be efficient by avoiding
-    handler duplication and using an LRU cache for log level checks.
+    in the specified directory. Records are put on a queue and written by a
+    listener thread, so the GTK main loop and worker threads never wait for
+    the terminal or the disk. Messages accept %-style arguments, formatted
+    only when the record is written, and keyword arguments, kept as
+    structured fields (e.g. `instance`, `phase`, `duration_ms`):
+
+        logger.info("Instance %d spawned", 1, instance=1, phase="spawn", duration_ms=12.5)
 
     Attributes:
         log_dir (Path): The directory where log files are stored.
         logger (logging.Logger): The underlying standard Python logger instance.
     """
 
-    def __init__(self, name: str, log_dir: Path, reset: bool = False, level: int = logging.INFO):
+    def __init__(
+        self, name: str, log_dir: Path, reset: bool = False, level: int = logging.INFO, json_output: bool = False
+    ):
         """
         Initialize the logger and set up its handlers.
 
@@ -37,40 +99,64 @@ class Logger:
             reset (bool): If True, the log file will be cleared on startup.
             level (int): The logging level (e.g., logging.DEBUG, logging.INFO).
                          Defaults to logging.INFO.
+            json_output (bool): If True, the log file gets one JSON object per
+                record instead of text.
         """
         self.log_dir = log_dir
         self.log_dir.mkdir(parents=True, exist_ok=True)
         self.logger = logging.getLogger(name)
         self.logger.setLevel(level)
+        self._queue: Optional[queue.Queue] = None
+        self._listener: Optional[QueueListener] = None
         self._handlers_setup = False
-        self._setup_handlers(reset)
+        self._setup_handlers(reset, json_output)
+
+    @staticmethod
+    def lazy(func: Callable[..., Any], *args: Any) -> _Lazy:
+        """
+        Wrap an expensive log argument so it is only computed when written.
+
+        Args:
+            func: Called with `args` when the record is formatted.
+
+        Returns:
+            An object to pass as a %-style argument.
+        """
+        return _Lazy(func, *args)
 
-    def _setup_handlers(self, reset: bool):
+    def _setup_handlers(self, reset: bool, json_output: bool = False):
         """
-        Configure and add stream and file handlers to the logger.
+        Configure the queue handler and the listener writing the records.
 
-        This method ensures that handlers are only configured once. It sets up
-        a console handler (stderr) and a file handler, both with a consistent
-        format.
+        This method ensures that handlers are only configured once. The
+        listener owns a console handler (stderr) and a file handler, both
+        with a consistent format.
         """
-        if self.logger.hasHandlers() or self._handlers_setup:
+        if self.logger.handlers or self._handlers_setup:
             return
 
-        formatter = logging.Formatter("%(asctime)s - %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
+        formatter = _TextFormatter("%(asctime)s - %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
 
         # Console handler to stderr
         console_handler = logging.StreamHandler(sys.stderr)
         console_handler.setFormatter(formatter)
-        console_handler.setLevel(logging.DEBUG)  # Changed from INFO to DEBUG
-        self.logger.addHandler(console_handler)
+        console_handler.setLevel(logging.DEBUG)
 
         # File handler
         log_file = self.log_dir / f"{self.logger.name}.log"
         file_mode = "w" if reset else "a"
         file_handler = logging.FileHandler(log_file, mode=file_mode, encoding="utf-8")
-        file_handler.setFormatter(formatter)
-        file_handler.setLevel(logging.DEBUG)  # Changed from INFO to DEBUG
-        self.logger.addHandler(file_handler)
+        file_handler.setFormatter(_JsonFormatter() if json_output else formatter)
+        file_handler.setLevel(logging.DEBUG)
+
+        self._queue = queue.Queue()
+        self._listener = QueueListener(self._queue, console_handler, file_handler, respect_handler_level=True)
+        self._listener.start()
+        self._queue_handler = _DeferredQueueHandler(self._queue)
+        self.logger.addHandler(self._queue_handler)
+        # Handlers of ancestor loggers would run in the calling thread
+        self.logger.propagate = False
+        atexit.register(self.close)
 
         self._handlers_setup = True
 
@@ -86,63 +172,86 @@ class Logger:
         """
         return self.logger.isEnabledFor(level)
 
-    def info(self, message: str):
+    def info(self, message: str, *args: Any, **fields: Any):
         """
         Log an informational message.
 
         Args:
-            message (str): The message to log.
+            message (str): The message to log, with optional %-style placeholders.
+            *args: The placeholder values, formatted when the record is written.
+            **fields: Structured fields attached to the record.
         """
         if self._should_log(logging.INFO):
-            self.logger.info(message)
+            self.logger.info(message, *args, extra={"fields": fields}, stacklevel=2)
 
-    def error(self, message: str):
+    def error(self, message: str, *args: Any, **fields: Any):
         """
         Log an error message.
 
         Args:
-            message (str): The message to log.
+            message (str): The message to log, with optional %-style placeholders.
+            *args: The placeholder values, formatted when the record is written.
+            **fields: Structured fields attached to the record.
         """
         if self._should_log(logging.ERROR):
-            self.logger.error(message)
+            self.logger.error(message, *args, extra={"fields": fields}, stacklevel=2)
 
-    def warning(self, message: str):
+    def warning(self, message: str, *args: Any, **fields: Any):
         """
         Log a warning message.
 
         Args:
-            message (str): The message to log.
+            message (str): The message to log, with optional %-style placeholders.
+            *args: The placeholder values, formatted when the record is written.
+            **fields: Structured fields attached to the record.
         """
         if self._should_log(logging.WARNING):
-            self.logger.warning(message)
+            self.logger.warning(message, *args, extra={"fields": fields}, stacklevel=2)
 
-    def debug(self, message: str):
+    def debug(self, message: str, *args: Any, **fields: Any):
         """
         Log a debug message.
 
         Args:
-            message (str): The message to log.
+            message (str): The message to log, with optional %-style placeholders.
+            *args: The placeholder values, formatted when the record is written.
+            **fields: Structured fields attached to the record.
         """
         if self._should_log(logging.DEBUG):
-            self.logger.debug(message)
+            self.logger.debug(message, *args, extra={"fields": fields}, stacklevel=2)
 
-    def exception(self, message: str):
+    def exception(self, message: str, *args: Any, **fields: Any):
         """
         Log an exception with traceback.
 
         Args:
             message (str): The message to log along with the exception.
+            *args: The placeholder values, formatted when the record is written.
+            **fields: Structured fields attached to the record.
         """
         if self._should_log(logging.ERROR):
-            self.logger.exception(message)
+            self.logger.exception(message, *args, extra={"fields": fields}, stacklevel=2)
 
     def flush(self):
         """
-        Flush all handlers attached to the logger.
+        Wait until every queued record was written and flush the handlers.
 
         This is useful to ensure that all buffered log records have been
         written to their destination.
         """
-        for handler in self.logger.handlers:
+        if self._listener is not None:
+            self._queue.join()
+        handlers = self._listener.handlers if self._listener else self.logger.handlers
+        for handler in handlers:
             if hasattr(handler, "flush"):
                 handler.flush()
+
+    def close(self):
+        """Write the queued records and stop the listener thread."""
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            listener.stop()
+            # Records logged from now on are written directly
+            self.logger.removeHandler(self._queue_handler)
+            for handler in listener.handlers:
+                self.logger.addHandler(handler)
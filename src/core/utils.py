@@ -40,6 +40,38 @@ class Utils:
         except Exception:
             return "Unknown"
 
+    @staticmethod
+    def write_atomic(path: Path, content: str) -> None:
+        """
+        Replace a file with new content so readers never see a partial file.
+
+        The content is written to a temporary file next to the target, flushed
+        to disk and renamed over the target, so a crash leaves either the old or
+        the new file.
+
+        Args:
+            path (Path): The file to write.
+            content (str): The new content, written as UTF-8.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+        # Persist the rename itself
+        dir_fd = os.open(path.parent, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
     @staticmethod
     def is_wayland() -> bool:
         """Check if the application is running on Wayland."""
@@ -30,7 +30,13 @@ class TwinverseApplication(Adw.Application):
         self.base_path = Utils.get_base_path()
         import logging
 
-        self.logger = Logger("Twinverse-App", Config.LOG_DIR, reset=True, level=logging.DEBUG)
+        self.logger = Logger(
+            "Twinverse-App",
+            Config.LOG_DIR,
+            reset=True,
+            level=logging.DEBUG,
+            json_output=os.environ.get("TWINVERSE_LOG_FORMAT") == "json",
+        )
 
         print("Loading resources...")
         self._load_resources()
@@ -54,6 +60,7 @@ class TwinverseApplication(Adw.Application):
     def on_startup(self, app):
         """Handle the application startup event."""
         print("Application startup called")
+        self.connect("shutdown", lambda *args: self.logger.close())
 
     def _load_resources(self):
         """Load application resources."""
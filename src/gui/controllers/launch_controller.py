@@ -8,19 +8,33 @@ import threading
 import time
 from typing import Callable, Optional
 
-from src.core import Logger
+from src.core import Config, InstanceHealthError, Logger
 from src.models import Profile
-from src.services import InstanceService, KdeManager
+from src.services import InstanceService, KdeManager, ReadinessProbe, SteamVerifier
 
 
 class LaunchController:
     """Manages the lifecycle of launching instances."""
 
-    def __init__(self, instance_service: InstanceService, kde_manager: KdeManager, logger: Logger):
+    # Upper bound on how long a starting instance holds its launch slot.
+    READY_TIMEOUT = 5.0
+    READY_POLL_INTERVAL = 0.1
+
+    # Files listed per instance in a failed health check
+    HEALTH_FILES_SHOWN = 3
+
+    def __init__(
+        self,
+        instance_service: InstanceService,
+        kde_manager: KdeManager,
+        logger: Logger,
+        steam_verifier: Optional[SteamVerifier] = None,
+    ):
         """Initialize the launch controller."""
         self._instance_service = instance_service
         self._kde_manager = kde_manager
         self._logger = logger
+        self._steam_verifier = steam_verifier
         self._launch_thread: Optional[threading.Thread] = None
         self._cancel_event = threading.Event()
         self._is_running = False
@@ -120,31 +134,18 @@ class LaunchController:
         self._logger.info(f"Launch worker started for players: {selected_players}")
 
         try:
+            if profile.deep_health_check and self._steam_verifier:
+                self._check_health(selected_players)
+
             # Setup KDE if enabled
             if profile.enable_kwin_script:
                 self._logger.info("Starting KDE script setup...")
                 self._kde_manager.start_kwin_script(profile)
 
-            self._kde_manager.save_panel_states()
-            self._kde_manager.set_panels_dodge_windows()
+            self._kde_manager.save_and_dodge_panels()
             self._logger.info("KDE panel states saved and updated.")
 
-            # Launch each instance
-            for instance_num in selected_players:
-                if self._cancel_event.is_set():
-                    self._logger.info("Launch sequence cancelled by user.")
-                    break
-
-                self._logger.info(f"Worker launching instance {instance_num}...")
-                self._instance_service.launch_instance(profile, instance_num)
-                self._logger.info(f"Instance {instance_num} launch initiated successfully.")
-
-                if on_progress:
-                    on_progress(instance_num)
-
-                # Sleep between launches to allow each instance to initialize properly
-                self._logger.info("Waiting 5 seconds before launching next instance...")
-                time.sleep(5)
+            self._run_launch_schedule(profile, selected_players, on_progress)
 
             if not self._cancel_event.is_set():
                 self._logger.info("All instances launched successfully. Updating running state.")
@@ -157,10 +158,111 @@ class LaunchController:
         except Exception as e:
             self._logger.error(f"Launch error: {e}")
             self._logger.logger.exception("Exception details:")  # Use underlying logger for exception details
+            # Instances spawned before the failure would be orphaned; stop them and undo the session setup
+            self._instance_service.terminate_all()
             self._kde_manager.restore_panel_states()
             if on_error:
                 on_error(e)
 
+    def _check_health(self, selected_players: list[int]):
+        """
+        Run the deep health check on the selected instances.
+
+        Raises:
+            InstanceHealthError: If an instance has a broken Steam installation.
+        """
+        homes = {instance_num: Config.get_steam_home_path(instance_num) for instance_num in selected_players}
+        started_at = time.monotonic()
+        reports = self._steam_verifier.check_health(list(homes.values()))
+        self._logger.info(f"Health check of {len(homes)} instance(s) took {time.monotonic() - started_at:.2f}s.")
+
+        problems = []
+        for instance_num, home in homes.items():
+            report = reports[home]
+            if report.healthy:
+                continue
+            files = report.missing + report.empty + report.mismatched
+            shown = ", ".join(files[: self.HEALTH_FILES_SHOWN]) + (
+                ", ..." if len(files) > self.HEALTH_FILES_SHOWN else ""
+            )
+            problems.append(
+                f"Instance {instance_num + 1}: {len(report.missing)} missing, {len(report.empty)} empty and "
+                f"{len(report.mismatched)} mismatched file(s) ({shown})"
+            )
+        if problems:
+            raise InstanceHealthError("\n".join(problems))
+
+    def _run_launch_schedule(
+        self,
+        profile: Profile,
+        selected_players: list[int],
+        on_progress: Optional[Callable[[int], None]],
+    ):
+        """
+        Prepare the selected instances, then spawn them as launch slots free up.
+
+        Launch plans for every instance are built concurrently before the first
+        spawn. Instances are then spawned in order, and each spawn only waits
+        until fewer than `profile.max_parallel_launches` instances are still
+        starting up.
+
+        Raises:
+            TwinverseError: If an instance failed to spawn or exited while starting.
+                The instances spawned so far are left running for the caller to stop.
+        """
+        plans = self._instance_service.prepare_launch_plans(profile, selected_players)
+        max_starting = max(1, profile.max_parallel_launches)
+        starting: dict[int, float] = {}
+
+        for instance_num in selected_players:
+            if not self._wait_for_launch_slot(starting, max_starting):
+                break
+
+            self._logger.info(f"Worker launching instance {instance_num}...")
+            self._instance_service.spawn_instance(plans[instance_num])
+            starting[instance_num] = time.monotonic()
+            self._logger.info(f"Instance {instance_num} launch initiated successfully.")
+
+            if on_progress:
+                on_progress(instance_num)
+
+        # Let the last instances finish starting before reporting completion
+        self._wait_for_launch_slot(starting, 1)
+
+        if self._cancel_event.is_set():
+            self._logger.info("Launch sequence cancelled by user.")
+
+    def _wait_for_launch_slot(self, starting: dict[int, float], limit: int) -> bool:
+        """
+        Block until fewer than `limit` instances are still starting up.
+
+        Instances leave `starting` once the readiness probe reports them ready or
+        once they have held their slot for `READY_TIMEOUT` seconds.
+
+        Returns:
+            False if the launch was cancelled while waiting, True otherwise.
+        """
+        while len(starting) >= limit:
+            for instance_num, started_at in list(starting.items()):
+                readiness = self._instance_service.check_ready(instance_num)
+                if readiness.ready:
+                    self._logger.info(
+                        f"Instance {instance_num} ready ({ReadinessProbe.format_stages(readiness.stages)})."
+                    )
+                    del starting[instance_num]
+                elif time.monotonic() - started_at >= self.READY_TIMEOUT:
+                    self._logger.warning(
+                        f"Instance {instance_num} not ready after {self.READY_TIMEOUT:.0f}s, continuing anyway."
+                    )
+                    del starting[instance_num]
+
+            if len(starting) < limit:
+                break
+            if self._cancel_event.wait(self.READY_POLL_INTERVAL):
+                return False
+
+        return not self._cancel_event.is_set()
+
     def _stop_worker(self, on_complete: Optional[Callable[[], None]]):
         """Worker thread for stopping instances."""
         self._logger.info("Stop worker started.")
@@ -184,12 +286,14 @@ class LaunchController:
         try:
             self._logger.info(f"Starting single instance worker for instance {instance_num}")
             self._instance_service.launch_instance(profile, instance_num, use_gamescope_override=use_gamescope_override)
+            self._instance_service.wait_ready(instance_num, self.READY_TIMEOUT)
             self._logger.info(f"Successfully launched instance {instance_num}")
             if on_complete:
                 on_complete()
         except Exception as e:
             self._logger.error(f"Single instance launch error for instance {instance_num}: {e}")
             self._logger.logger.exception("Exception details:")  # Use underlying logger for exception details
+            self._instance_service.release_inputs([instance_num])
             if on_error:
                 on_error(e)
 
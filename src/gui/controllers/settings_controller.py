@@ -8,7 +8,7 @@ from typing import Callable
 
 from src.core import Logger
 from src.models import PlayerInstanceConfig, Profile, SplitscreenConfig
-from src.services import DeviceManager
+from src.services import DeviceManager, ProfileWriter
 
 
 class SettingsController:
@@ -19,6 +19,7 @@ class SettingsController:
         self._device_manager = device_manager
         self._logger = logger
         self._profile = Profile.load()
+        self._profile_writer = ProfileWriter(logger)
         self._on_change_callbacks: list[Callable[[], None]] = []
 
     def get_profile(self) -> Profile:
@@ -26,11 +27,14 @@ class SettingsController:
         return self._profile
 
     def save_profile(self):
-        """Save the current profile."""
-        self._profile.save()
-        self._logger.info("Profile saved.")
+        """Save the current profile once the changes settle down, without blocking."""
+        self._profile_writer.schedule(self._profile)
         self._notify_change()
 
+    def flush_profile(self):
+        """Write any pending profile change and stop saving in the background."""
+        self._profile_writer.close()
+
     def update_from_ui_data(self, ui_data: dict):
         """
         Update profile from UI data.
@@ -49,6 +53,9 @@ class SettingsController:
         else:
             self._profile.splitscreen = None
 
+        if ui_data.get("players_per_screen"):
+            self._profile.players_per_screen = ui_data["players_per_screen"]
+
         # Update player configs, preserving old configs when possible
         new_player_configs = ui_data["player_configs"]
 
@@ -92,10 +99,11 @@ class SettingsController:
         Returns:
             Dictionary with device information
         """
+        input_devices = self._device_manager.get_input_devices()
         return {
-            "joystick": self._device_manager.get_input_devices().get("joystick", []),
-            "mouse": self._device_manager.get_input_devices().get("mouse", []),
-            "keyboard": self._device_manager.get_input_devices().get("keyboard", []),
+            "joystick": input_devices.get("joystick", []),
+            "mouse": input_devices.get("mouse", []),
+            "keyboard": input_devices.get("keyboard", []),
             "audio": self._device_manager.get_audio_devices(),
             "displays": self._device_manager.get_screen_info(),
         }
@@ -103,8 +111,9 @@ class SettingsController:
     def refresh_devices(self):
         """Refresh device information."""
         self._logger.info("Refreshing device information...")
-        # Force refresh by recreating device manager
-        self._device_manager = DeviceManager()
+        self._device_manager.input_registry.refresh()
+        self._device_manager.audio_backend.refresh()
+        self._device_manager.monitor_topology.update()
 
     def register_change_callback(self, callback: Callable[[], None]):
         """
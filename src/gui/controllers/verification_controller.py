@@ -4,53 +4,109 @@ Verification controller module.
 This module manages Steam instance verification.
 """
 
-from typing import Callable, Optional
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Optional
+
+from gi.repository import GLib
 
 from src.core import Config, Logger
 from src.services import SteamVerifier
 
 
 class VerificationController:
-    """Manages Steam instance verification."""
+    """
+    Manages Steam instance verification.
+
+    Verifications run on a background executor so slow or network storage
+    never blocks the UI. The results of a request are delivered together on
+    the main loop, and instance homes are watched so changes made while
+    Twinverse is open (e.g. Steam being installed) are verified again.
+    """
+
+    MAX_WORKERS = 4
+    RECHECK_DELAY_MS = 500
 
     def __init__(self, steam_verifier: SteamVerifier, logger: Logger):
         """Initialize the verification controller."""
         self._steam_verifier = steam_verifier
         self._logger = logger
         self._verification_statuses: dict[int, bool] = {}
-
-    def verify_instance(self, instance_num: int) -> bool:
+        self._executor = ThreadPoolExecutor(max_workers=self.MAX_WORKERS, thread_name_prefix="steam-verify")
+        # Instance number -> number of the latest request, so late results of older requests are dropped
+        self._requests: dict[int, int] = {}
+        self._request_count = 0
+        self._subscribers: list[Callable[[dict[int, bool]], None]] = []
+        self._changed: set[int] = set()
+        self._recheck_source: Optional[int] = None
+
+    def verify_instance(self, instance_num: int, on_complete: Optional[Callable[[dict[int, bool]], None]] = None):
         """
-        Verify a specific instance.
+        Verify a specific instance in the background.
 
         Args:
             instance_num: The instance number to verify
-
-        Returns:
-            True if verified, False otherwise
+            on_complete: Callback called on the main loop with the new statuses
         """
-        instance_path = Config.get_steam_home_path(instance_num)
-        is_verified = self._steam_verifier.verify(instance_path)
-        self._verification_statuses[instance_num] = is_verified
-        self._logger.info(f"Instance {instance_num} verification: {is_verified}")
-        return is_verified
+        self.verify_instances([instance_num], on_complete)
 
     def verify_all_instances(
         self,
         num_instances: int,
-        on_each_complete: Optional[Callable[[int, bool], None]] = None,
+        on_complete: Optional[Callable[[dict[int, bool]], None]] = None,
     ):
         """
-        Verify all instances.
+        Verify all instances in the background.
 
         Args:
             num_instances: Number of instances to verify
-            on_each_complete: Callback for each instance (called with instance_num, is_verified)
+            on_complete: Callback called on the main loop with the new statuses
+        """
+        self.verify_instances(range(num_instances), on_complete)
+
+    def verify_instances(
+        self,
+        instance_nums: Iterable[int],
+        on_complete: Optional[Callable[[dict[int, bool]], None]] = None,
+    ):
+        """
+        Verify some instances in the background, delivering their results at once.
+
+        Must be called from the main thread. Subscribers and `on_complete` are
+        called on the main loop with the statuses of the instances whose result
+        is still current.
+
+        Args:
+            instance_nums: The instance numbers to verify
+            on_complete: Callback called with the new statuses
         """
-        for i in range(num_instances):
-            is_verified = self.verify_instance(i)
-            if on_each_complete:
-                on_each_complete(i, is_verified)
+        self._request_count += 1
+        futures: Dict[int, Future] = {}
+        for instance_num in instance_nums:
+            instance_path = Config.get_steam_home_path(instance_num)
+            self._steam_verifier.watch(instance_path, lambda _path, n=instance_num: self._on_home_changed(n))
+            self._requests[instance_num] = self._request_count
+            futures[instance_num] = self._executor.submit(self._steam_verifier.verify, instance_path)
+        if not futures:
+            return
+
+        request = self._request_count
+        remaining = [len(futures)]
+        lock = threading.Lock()
+
+        def on_done(_future):
+            with lock:
+                remaining[0] -= 1
+                if remaining[0]:
+                    return
+            GLib.idle_add(self._deliver, request, futures, on_complete)
+
+        for future in futures.values():
+            future.add_done_callback(on_done)
+
+    def subscribe(self, callback: Callable[[dict[int, bool]], None]):
+        """Register a callback called on the main loop with every batch of new statuses."""
+        self._subscribers.append(callback)
 
     def get_verification_status(self, instance_num: int) -> bool:
         """
@@ -71,3 +127,46 @@ class VerificationController:
     def clear_cache(self):
         """Clear the verification cache."""
         self._verification_statuses.clear()
+
+    def shutdown(self):
+        """Stop watching instance homes and drop pending verifications."""
+        if self._recheck_source is not None:
+            GLib.source_remove(self._recheck_source)
+            self._recheck_source = None
+        self._steam_verifier.unwatch_all()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _deliver(self, request: int, futures: Dict[int, Future], on_complete):
+        """Apply the results of a request on the main loop."""
+        statuses = {}
+        for instance_num, future in futures.items():
+            if self._requests.get(instance_num) != request or future.cancelled():
+                continue
+            try:
+                statuses[instance_num] = future.result()
+            except Exception as e:
+                self._logger.error(f"Instance {instance_num} verification failed: {e}")
+                statuses[instance_num] = False
+
+        if statuses:
+            self._verification_statuses.update(statuses)
+            self._logger.debug(f"Verification results: {statuses}")
+            for callback in list(self._subscribers):
+                callback(statuses)
+            if on_complete:
+                on_complete(statuses)
+        return GLib.SOURCE_REMOVE
+
+    def _on_home_changed(self, instance_num: int):
+        """Verify an instance again once the changes to its home settle down."""
+        self._changed.add(instance_num)
+        if self._recheck_source is None:
+            self._recheck_source = GLib.timeout_add(self.RECHECK_DELAY_MS, self._recheck_changed)
+
+    def _recheck_changed(self):
+        """Verify the instances whose homes changed."""
+        self._recheck_source = None
+        changed, self._changed = self._changed, set()
+        self._logger.debug(f"Steam installation changed for instances {sorted(changed)}, verifying again.")
+        self.verify_instances(sorted(changed))
+        return GLib.SOURCE_REMOVE
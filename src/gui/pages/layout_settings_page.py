@@ -17,6 +17,11 @@ gi.require_version("Adw", "1")
 class LayoutSettingsPage(Adw.PreferencesPage):
     """Layout settings page - handles UI presentation only."""
 
+    MAX_INSTANCES = 8
+    MAX_PLAYERS_PER_SCREEN = 9
+
+    _players_per_screen = 4  # Will be set from the profile
+
     __gsignals__ = {
         "settings-changed": (GObject.SignalFlags.RUN_FIRST, None, ()),
         "verification-completed": (GObject.SignalFlags.RUN_FIRST, None, ()),
@@ -47,12 +52,12 @@ class LayoutSettingsPage(Adw.PreferencesPage):
         if screen_mode == "fullscreen":
             icon_name = "fullscreen-square-symbolic"
         elif screen_mode == "splitscreen":
-            # Consider groups of up to 4 instances per monitor
-            first_group_size = min(num_instances, 4)
+            # Consider the instances sharing the first monitor
+            first_group_size = min(num_instances, self._players_per_screen)
 
             if first_group_size == 1:
                 icon_name = "fullscreen-square-symbolic"
-            elif first_group_size == 4:
+            elif first_group_size >= 4:
                 icon_name = "four-square-symbolic"
             else:
                 orientation = self.orientation_row.get_selected_item().get_string().lower()
@@ -116,6 +121,18 @@ class LayoutSettingsPage(Adw.PreferencesPage):
         self.orientation_row.connect("notify::selected-item", self._on_setting_changed)
         gamescope_expander.add_row(self.orientation_row)
 
+        self.players_per_screen_row = Adw.SpinRow(
+            title="Players per Screen",
+            subtitle="Instances sharing each monitor",
+        )
+        self.players_per_screen_row.add_css_class("players-per-screen-row")
+        players_per_screen_adjustment = Gtk.Adjustment(
+            value=4, lower=1, upper=self.MAX_PLAYERS_PER_SCREEN, step_increment=1
+        )
+        self.players_per_screen_row.set_adjustment(players_per_screen_adjustment)
+        players_per_screen_adjustment.connect("value-changed", self._on_players_per_screen_changed)
+        gamescope_expander.add_row(self.players_per_screen_row)
+
         # Players group
         self.players_group = Adw.PreferencesGroup(title="Instance Configurations")
         self.players_group.add_css_class("players-group")
@@ -135,6 +152,9 @@ class LayoutSettingsPage(Adw.PreferencesPage):
             self._update_screen_settings_icon()
 
         # Load general settings
+        self._players_per_screen = profile.players_per_screen
+        self.players_per_screen_row.set_value(profile.players_per_screen)
+
         adj = self.num_players_row.get_adjustment()
         adj.set_value(profile.num_players)
 
@@ -143,6 +163,7 @@ class LayoutSettingsPage(Adw.PreferencesPage):
         self.screen_mode_row.set_selected(1 if is_splitscreen else 0)
         self._update_num_players_limits(is_splitscreen)
         self.orientation_row.set_visible(is_splitscreen)
+        self.players_per_screen_row.set_visible(is_splitscreen)
         self.gamescope_settings_group.set_visible(profile.use_gamescope)
 
         if is_splitscreen and profile.splitscreen:
@@ -231,6 +252,7 @@ class LayoutSettingsPage(Adw.PreferencesPage):
             "num_players": int(self.num_players_row.get_value()),
             "mode": self.screen_mode_row.get_selected_item().get_string().lower(),
             "orientation": None,
+            "players_per_screen": int(self.players_per_screen_row.get_value()),
             "player_configs": [],
             "selected_players": [],
         }
@@ -271,14 +293,32 @@ class LayoutSettingsPage(Adw.PreferencesPage):
         selected_mode = combo_row.get_selected_item().get_string().lower()
         is_splitscreen = selected_mode == "splitscreen"
         self.orientation_row.set_visible(is_splitscreen)
+        self.players_per_screen_row.set_visible(is_splitscreen)
 
         # Record the user's selection
         self._last_user_selected_mode = selected_mode
 
         # Update the number of players limits based on screen mode
         self._update_num_players_limits(is_splitscreen)
+        self._clamp_num_players()
+
+        if not self._is_loading:
+            self.emit("settings-changed")
+            self._update_screen_settings_icon()
 
-        # Adjust the value if it exceeds the new upper limit
+    def _on_players_per_screen_changed(self, adjustment):
+        """Handle players per screen changed."""
+        self._players_per_screen = int(adjustment.get_value())
+        if self._is_loading:
+            return
+
+        self._update_num_players_limits(is_splitscreen=True)
+        self._clamp_num_players()
+        self.emit("settings-changed")
+        self._update_screen_settings_icon()
+
+    def _clamp_num_players(self):
+        """Adjust the number of players if it exceeds the current upper limit."""
         adjustment = self.num_players_row.get_adjustment()
         current_value = adjustment.get_value()
         new_upper_limit = adjustment.get_upper()
@@ -286,10 +326,6 @@ class LayoutSettingsPage(Adw.PreferencesPage):
         if current_value > new_upper_limit:
             adjustment.set_value(new_upper_limit)
 
-        if not self._is_loading:
-            self.emit("settings-changed")
-            self._update_screen_settings_icon()
-
     def update_devices_info(self, devices_info: dict):
         """Update devices info in all player rows."""
         for player_row in self.player_rows:
@@ -298,11 +334,12 @@ class LayoutSettingsPage(Adw.PreferencesPage):
     def _update_num_players_limits(self, is_splitscreen: bool):
         """Update the limits for number of players based on screen mode."""
         if is_splitscreen:
-            # In splitscreen mode: up to 8 instances total, max 4 per monitor
-            max_players = min(8, self._num_monitors * 4)
+            # In splitscreen mode: up to 8 instances total (or a full screen, if denser), limited per monitor
+            max_instances = max(self.MAX_INSTANCES, self._players_per_screen)
+            max_players = min(max_instances, self._num_monitors * self._players_per_screen)
         else:
             # In fullscreen mode: up to 8 instances total, max 1 per monitor
-            max_players = min(8, self._num_monitors)
+            max_players = min(self.MAX_INSTANCES, self._num_monitors)
 
         # Update the adjustment limits
         adjustment = self.num_players_row.get_adjustment()
@@ -324,6 +361,7 @@ class LayoutSettingsPage(Adw.PreferencesPage):
         """Set the sensitivity of the screen settings controls."""
         self.screen_mode_row.set_sensitive(sensitive)
         self.orientation_row.set_sensitive(sensitive)
+        self.players_per_screen_row.set_sensitive(sensitive)
 
     def set_checkboxes_sensitive(self, sensitive: bool):
         """Set the sensitivity of the instance checkboxes."""
@@ -4,7 +4,9 @@ Main presenter module.
 This module mediates between the view (window) and controllers.
 """
 
-from gi.repository import Adw, GLib, Gtk
+import threading
+
+from gi.repository import Adw, Gdk, GLib, Gtk
 
 from src.core import Logger, Utils
 from src.gui.controllers import (
@@ -14,7 +16,16 @@ from src.gui.controllers import (
 )
 from src.gui.utils import ErrorHandler
 from src.gui.windows import MainWindow, PreferencesWindow
-from src.services import DeviceManager, InstanceService, KdeManager, SteamVerifier
+from src.services import (
+    AudioBackend,
+    DeviceManager,
+    InputDeviceRegistry,
+    InstanceService,
+    KdeManager,
+    MonitorTopology,
+    SteamVerifier,
+)
+from src.services.process_supervisor import InstanceExit
 
 
 class MainPresenter:
@@ -26,35 +37,48 @@ class MainPresenter:
         self._logger = logger
 
         # Initialize services
-        self._kde_manager = KdeManager(self._logger)
-        self._instance_service = InstanceService(logger=self._logger, kde_manager=self._kde_manager)
+        self._input_registry = InputDeviceRegistry(self._logger)
+        self._audio_backend = AudioBackend(self._logger)
+        self._monitor_topology = MonitorTopology(self._logger)
+        self._device_manager = DeviceManager(self._input_registry, self._audio_backend, self._monitor_topology)
+        self._kde_manager = KdeManager(self._logger, self._device_manager)
+        self._kde_manager.recover_panel_states()
+        self._instance_service = InstanceService(
+            logger=self._logger, kde_manager=self._kde_manager, device_manager=self._device_manager
+        )
         self._steam_verifier = SteamVerifier(self._logger)
-        self._device_manager = DeviceManager()
+        self._watch_monitors()
 
         # Initialize controllers
-        self._launch_controller = LaunchController(self._instance_service, self._kde_manager, self._logger)
+        self._launch_controller = LaunchController(
+            self._instance_service, self._kde_manager, self._logger, steam_verifier=self._steam_verifier
+        )
         self._verification_controller = VerificationController(self._steam_verifier, self._logger)
         self._settings_controller = SettingsController(self._device_manager, self._logger)
+        self._verification_controller.subscribe(self._on_verification_results)
 
         # Create window
         self.window = MainWindow(application, self)
 
         # Initialize bulk operation state
         self._bulk_operation_in_progress = False
+        self._instance_service.supervisor.subscribe(self._on_instance_exited)
 
         # Load initial data
         self._load_initial_data()
 
+        # Keep device lists current when devices are plugged in or removed
+        self._input_registry.subscribe(self._on_devices_changed)
+        self._input_registry.start_monitoring()
+        self._audio_backend.subscribe(self._on_devices_changed)
+        self._audio_backend.start_monitoring()
+        self._monitor_topology.subscribe(self._on_devices_changed)
+
     def _load_initial_data(self):
         """Load initial data into the UI."""
         profile = self._settings_controller.get_profile()
         devices_info = self._settings_controller.get_devices_info()
 
-        # Run initial verifications
-        self._verification_controller.verify_all_instances(
-            profile.num_players, on_each_complete=lambda i, verified: None  # Silent initial verification
-        )
-
         verification_statuses = self._verification_controller.get_all_statuses()
 
         # Load into UI
@@ -64,6 +88,9 @@ class MainPresenter:
         # Update button state
         self._update_launch_button_state()
 
+        # Run initial verifications; the rows are updated when the results arrive
+        self._verification_controller.verify_all_instances(profile.num_players)
+
     def on_launch_clicked(self):
         """Handle launch button clicked."""
         if self._launch_controller.is_running():
@@ -101,6 +128,7 @@ class MainPresenter:
         # Now save the current settings with updated UI data
         self._settings_controller.update_from_ui_data(ui_data)
         self._settings_controller.save_profile()
+        self._instance_service.reroute_inputs(self._settings_controller.get_profile())
 
         # Reload UI again to ensure everything is consistent (especially if other settings changed)
         # BUT only reload if the number of players changed to avoid mode switching issues
@@ -157,7 +185,8 @@ class MainPresenter:
             # Setup KDE if enabled for this instance (same as main Play button)
             if profile.enable_kwin_script:
                 self._logger.info("Starting KDE script setup...")
-                self._kde_manager.start_kwin_script(profile)
+                # D-Bus calls to KWin must not block the main thread; the script places windows that already exist
+                threading.Thread(target=self._kde_manager.start_kwin_script, args=(profile,), daemon=True).start()
 
             # Launch only this specific instance with gamescope and ENABLE_GAMESCOPE_WSI disabled
             try:
@@ -171,6 +200,7 @@ class MainPresenter:
             except Exception as e:
                 self._logger.error(f"Failed to launch instance {instance_num}: {e}")
                 self._logger.exception("Exception details:")
+                self._instance_service.release_inputs([instance_num])
                 error_msg = ErrorHandler.format_error(e)
                 GLib.idle_add(self.window.show_error, error_msg)
                 # Reset the button state to previous state
@@ -209,6 +239,11 @@ class MainPresenter:
     def on_close_requested(self):
         """Handle window close request."""
         self.window.set_sensitive(False)
+        self._input_registry.stop_monitoring()
+        self._audio_backend.stop_monitoring()
+        self._kde_manager.dbus.log_stats()
+        self._verification_controller.shutdown()
+        self._settings_controller.flush_profile()
 
         # Stop all instances before closing
         self._launch_controller.stop_instances(on_complete=lambda: GLib.idle_add(self._app.quit))
@@ -222,6 +257,44 @@ class MainPresenter:
         layout_page = self.window.get_layout_page()
         layout_page.update_devices_info(devices_info)
 
+    def _watch_monitors(self):
+        """Keep the monitor topology in sync with the display configuration."""
+        display = Gdk.Display.get_default()
+        if display is None:
+            return
+        self._gdk_monitors = display.get_monitors()
+        self._watched_gdk_monitors = set()
+        self._gdk_monitors.connect("items-changed", lambda *args: self._on_monitors_changed())
+        self._on_monitors_changed()
+
+    def _on_monitors_changed(self):
+        """Handle monitors added, removed or reconfigured."""
+        output_details = []
+        for i in range(self._gdk_monitors.get_n_items()):
+            monitor = self._gdk_monitors.get_item(i)
+            if monitor not in self._watched_gdk_monitors:
+                monitor.connect("notify::geometry", lambda *args: self._on_monitors_changed())
+                self._watched_gdk_monitors.add(monitor)
+            geometry = monitor.get_geometry()
+            output_details.append(
+                {
+                    "connector": monitor.get_connector(),
+                    "x": geometry.x,
+                    "y": geometry.y,
+                    "refresh_rate": monitor.get_refresh_rate() / 1000 or None,
+                }
+            )
+        self._monitor_topology.update(output_details)
+
+    def _on_devices_changed(self, _devices):
+        """Handle devices plugged in or removed, called from the device monitor threads."""
+        GLib.idle_add(self._update_devices_info)
+
+    def _update_devices_info(self):
+        """Push the current device lists to the UI."""
+        devices_info = self._settings_controller.get_devices_info()
+        self.window.get_layout_page().update_devices_info(devices_info)
+
     def _on_launch_requested(self):
         """Handle launch request."""
         self._logger.info("Launch requested by user.")
@@ -329,6 +402,31 @@ class MainPresenter:
         GLib.idle_add(self._verify_instance, instance_num)
         GLib.idle_add(self._update_number_of_instances_sensitivity)
 
+    def _on_instance_exited(self, event: InstanceExit):
+        """
+        Handle an instance that exited on its own, called on the main loop.
+
+        Instances stopped from Twinverse are no longer supervised, so they are
+        not reported here.
+        """
+        self._logger.warning(
+            f"Instance {event.instance_num} exited on its own with code {event.returncode} after {event.runtime:.1f}s"
+        )
+        layout_page = self.window.get_layout_page()
+        if 0 <= event.instance_num < len(layout_page.player_rows):
+            player_row = layout_page.player_rows[event.instance_num]
+            player_row.set_running_state(False)
+            player_row.set_exit_status(event.returncode)
+        self._update_number_of_instances_sensitivity()
+
+        # Once every instance of a session exited on its own, clean up as if it was stopped
+        if (
+            self._launch_controller.is_running()
+            and not self._bulk_operation_in_progress
+            and not any(player_row._is_running for player_row in layout_page.player_rows)
+        ):
+            self._on_stop_requested()
+
     def _on_single_instance_error(self, instance_num: int, error: Exception):
         """Handle single instance error."""
         self._logger.error(f"Error in instance {instance_num}: {error}")
@@ -374,20 +472,21 @@ class MainPresenter:
         self._settings_controller.save_profile()
 
     def _run_all_verifications(self):
-        """Run verifications for all instances."""
+        """Run verifications for all instances in the background."""
         profile = self._settings_controller.get_profile()
-        layout_page = self.window.get_layout_page()
-
-        self._verification_controller.verify_all_instances(
-            profile.num_players,
-            on_each_complete=lambda i, verified: layout_page.update_verification_status(i, verified),
-        )
+        self._verification_controller.verify_all_instances(profile.num_players)
 
     def _verify_instance(self, instance_num: int):
-        """Verify a specific instance."""
-        is_verified = self._verification_controller.verify_instance(instance_num)
+        """Verify a specific instance in the background."""
+        self._verification_controller.verify_instance(instance_num)
+
+    def _on_verification_results(self, statuses: dict[int, bool]):
+        """Show a batch of verification results, called on the main loop."""
         layout_page = self.window.get_layout_page()
-        layout_page.update_verification_status(instance_num, is_verified)
+        for instance_num, is_verified in statuses.items():
+            layout_page.update_verification_status(instance_num, is_verified)
+        if not self._bulk_operation_in_progress and not self._launch_controller.is_running():
+            self._update_launch_button_state()
 
     def _update_launch_button_state(self):
         """Update launch button enabled state."""
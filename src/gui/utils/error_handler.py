@@ -6,7 +6,12 @@ This module provides centralized error formatting and handling.
 
 from typing import Callable
 
-from src.core.exceptions import DependencyError, TwinverseError, VirtualDeviceError
+from src.core.exceptions import (
+    DependencyError,
+    InstanceHealthError,
+    TwinverseError,
+    VirtualDeviceError,
+)
 
 
 class ErrorHandler:
@@ -15,6 +20,7 @@ class ErrorHandler:
     _ERROR_FORMATTERS: dict[type, Callable[[Exception], str]] = {
         DependencyError: lambda e: f"Missing dependency: {e}",
         VirtualDeviceError: lambda e: f"Virtual device error: {e}",
+        InstanceHealthError: lambda e: f"Broken Steam installation: {e}",
         TwinverseError: lambda e: f"Twinverse error: {e}",
     }
 
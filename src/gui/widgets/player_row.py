@@ -5,6 +5,7 @@ This module provides a custom widget for player configuration.
 """
 
 import os
+from typing import Optional
 
 import gi
 from gi.repository import Adw, GObject, Gtk
@@ -65,6 +66,13 @@ class PlayerRow(Adw.ExpanderRow):
         self.audio_row.connect("notify::selected-item", lambda *args: self.emit("settings-changed"))
         self.add_row(self.audio_row)
 
+        # Monitor
+        monitor_model = Gtk.StringList.new(["Automatic"] + [d["name"] for d in self._monitor_options()])
+        self.monitor_row = Adw.ComboRow(title="Monitor", model=monitor_model)
+        self.monitor_row.get_style_context().add_class("monitor-row")
+        self.monitor_row.connect("notify::selected-item", lambda *args: self.emit("settings-changed"))
+        self.add_row(self.monitor_row)
+
         # Refresh rate
         refresh_rates = ["60", "75", "90", "120", "144", "165", "180", "240"]
         refresh_rate_model = Gtk.StringList.new(refresh_rates)
@@ -113,6 +121,18 @@ class PlayerRow(Adw.ExpanderRow):
 
         self.add_row(self.joystick_row)
 
+        keyboards = self._devices_info.get("keyboard", [])
+        self.keyboard_row = Adw.ComboRow(
+            title="Keyboard", model=Gtk.StringList.new(["None"] + [d["name"] for d in keyboards])
+        )
+        self.keyboard_row.connect("notify::selected-item", lambda *args: self.emit("settings-changed"))
+        self.add_row(self.keyboard_row)
+
+        mice = self._devices_info.get("mouse", [])
+        self.mouse_row = Adw.ComboRow(title="Mouse", model=Gtk.StringList.new(["None"] + [d["name"] for d in mice]))
+        self.mouse_row.connect("notify::selected-item", lambda *args: self.emit("settings-changed"))
+        self.add_row(self.mouse_row)
+
     def _create_env_section(self):
         """Create environment variables section."""
         env_title_row = Adw.ActionRow(title="Environment Variables")
@@ -164,7 +184,10 @@ class PlayerRow(Adw.ExpanderRow):
 
         # Get current selections
         current_joystick = self._get_combo_device_id(self.joystick_row, devices_info.get("joystick", []))
+        current_keyboard = self._get_combo_device_id(self.keyboard_row, devices_info.get("keyboard", []))
+        current_mouse = self._get_combo_device_id(self.mouse_row, devices_info.get("mouse", []))
         current_audio = self._get_combo_device_id(self.audio_row, devices_info.get("audio", []))
+        current_monitor = self._get_combo_device_id(self.monitor_row, self._monitor_options())
 
         # Update joystick model
         joysticks = devices_info.get("joystick", [])
@@ -172,12 +195,25 @@ class PlayerRow(Adw.ExpanderRow):
         self.joystick_row.set_model(joystick_model)
         self._set_combo_selection(self.joystick_row, joysticks, current_joystick)
 
+        # Update keyboard and mouse models
+        keyboards = devices_info.get("keyboard", [])
+        self.keyboard_row.set_model(Gtk.StringList.new(["None"] + [d["name"] for d in keyboards]))
+        self._set_combo_selection(self.keyboard_row, keyboards, current_keyboard)
+        mice = devices_info.get("mouse", [])
+        self.mouse_row.set_model(Gtk.StringList.new(["None"] + [d["name"] for d in mice]))
+        self._set_combo_selection(self.mouse_row, mice, current_mouse)
+
         # Update audio model
         audio_devices = devices_info.get("audio", [])
         audio_model = Gtk.StringList.new(["None"] + [d["name"] for d in audio_devices])
         self.audio_row.set_model(audio_model)
         self._set_combo_selection(self.audio_row, audio_devices, current_audio)
 
+        # Update monitor model
+        monitors = self._monitor_options()
+        self.monitor_row.set_model(Gtk.StringList.new(["Automatic"] + [d["name"] for d in monitors]))
+        self._set_monitor_selection(monitors, current_monitor)
+
     def load_config(self, config: PlayerInstanceConfig):
         """Load configuration into the UI."""
         self._is_loading = True
@@ -188,9 +224,16 @@ class PlayerRow(Adw.ExpanderRow):
         # Load joystick
         self._set_combo_selection(self.joystick_row, self._devices_info.get("joystick", []), config.physical_device_id)
 
+        # Load keyboard and mouse
+        self._set_combo_selection(self.keyboard_row, self._devices_info.get("keyboard", []), config.keyboard_device_id)
+        self._set_combo_selection(self.mouse_row, self._devices_info.get("mouse", []), config.mouse_device_id)
+
         # Load audio
         self._set_combo_selection(self.audio_row, self._devices_info.get("audio", []), config.audio_device_id)
 
+        # Load monitor
+        self._set_monitor_selection(self._monitor_options(), config.monitor_id)
+
         # Load refresh rate
         refresh_rates = ["60", "75", "90", "120", "144", "165", "180", "240"]
         refresh_rate_str = str(config.refresh_rate)
@@ -209,8 +252,11 @@ class PlayerRow(Adw.ExpanderRow):
         """Get configuration from the UI."""
         return PlayerInstanceConfig(
             PHYSICAL_DEVICE_ID=self._get_combo_device_id(self.joystick_row, self._devices_info.get("joystick", [])),
+            KEYBOARD_DEVICE_ID=self._get_combo_device_id(self.keyboard_row, self._devices_info.get("keyboard", [])),
+            MOUSE_DEVICE_ID=self._get_combo_device_id(self.mouse_row, self._devices_info.get("mouse", [])),
             GRAB_INPUT_DEVICES=self.grab_input_switch.get_active(),
             AUDIO_DEVICE_ID=self._get_combo_device_id(self.audio_row, self._devices_info.get("audio", [])),
+            MONITOR_ID=self._get_combo_device_id(self.monitor_row, self._monitor_options()),
             ENV=self._collect_env_vars(),
             REFRESH_RATE=self._get_refresh_rate(),
         )
@@ -222,8 +268,14 @@ class PlayerRow(Adw.ExpanderRow):
     def set_running_state(self, is_running: bool):
         """Set the running state."""
         self._is_running = is_running
+        if is_running:
+            self.set_subtitle("")
         self._update_button_state()
 
+    def set_exit_status(self, returncode: Optional[int]):
+        """Show that the instance exited on its own, with a non-zero code if it failed."""
+        self.set_subtitle("Exited" if not returncode else f"Exited with code {returncode}")
+
     def set_verification_status(self, is_verified: bool):
         """Set the verification status and update UI."""
         self._is_verified = is_verified
@@ -277,6 +329,22 @@ class PlayerRow(Adw.ExpanderRow):
 
         combo_row.set_selected(0)
 
+    def _monitor_options(self) -> list[dict]:
+        """Return the monitors that can be assigned, identified by connector name when known."""
+        options = []
+        for display in self._devices_info.get("displays", []):
+            monitor_id = display.get("name") or str(display["id"])
+            options.append({"id": monitor_id, "name": f"{monitor_id} ({display['width']}x{display['height']})"})
+        return options
+
+    def _set_monitor_selection(self, monitors: list[dict], monitor_id):
+        """Set monitor combo row selection based on the monitor ID."""
+        for i, monitor in enumerate(monitors):
+            if monitor["id"] == monitor_id:
+                self.monitor_row.set_selected(i + 1)
+                return
+        self.monitor_row.set_selected(0)
+
     def _get_combo_device_id(self, combo_row, device_list):
         """Get device ID from combo row selection."""
         selected_idx = combo_row.get_selected()
@@ -66,6 +66,15 @@ class PreferencesWindow(Adw.PreferencesWindow):
         self.gamescope_wsi_row.get_style_context().add_class("custom-switch")
         self._advanced_prefs_group.add(self.gamescope_wsi_row)
 
+        # Deep health check toggle row
+        self.health_check_row = Adw.SwitchRow()
+        self.health_check_row.set_title("Check Installations Before Launch")
+        self.health_check_row.set_subtitle("Compare the Steam client files of the instances before launching them")
+        self.health_check_row.set_active(self._profile.deep_health_check)
+        self.health_check_row.connect("notify::active", self._on_health_check_toggled)
+        self.health_check_row.get_style_context().add_class("custom-switch")
+        self._advanced_prefs_group.add(self.health_check_row)
+
         self._advanced_prefs_page.add(self._advanced_prefs_group)
 
         # Add reset button to the advanced options page in a separate group
@@ -235,15 +244,9 @@ class PreferencesWindow(Adw.PreferencesWindow):
             # Refresh the player list to reflect changes
             self._populate_player_list()
 
-            # Notify that settings have changed
+            # Notify that settings have changed; the settings controller saves the profile
             self._on_settings_changed("player_configs", self._profile.player_configs)
 
-            # Force saving the profile to persist the changes
-            try:
-                self._profile.save()
-            except Exception as e:
-                print(f"Error saving profile: {e}")
-
     def _remove_home_directory(self, home_path):
         """Remove the home directory for a specific player."""
         import shutil
@@ -312,3 +315,9 @@ class PreferencesWindow(Adw.PreferencesWindow):
         state = switch_row.get_active()
         self._profile.enable_gamescope_wsi = state
         self._on_settings_changed("enable_gamescope_wsi", state)
+
+    def _on_health_check_toggled(self, switch_row, pspec):
+        """Handle deep health check toggle."""
+        state = switch_row.get_active()
+        self._profile.deep_health_check = state
+        self._on_settings_changed("deep_health_check", state)
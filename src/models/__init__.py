@@ -1,6 +1,24 @@
 """Data models for Twinverse."""
 
-from .instance import SteamInstance
+from .instance import (
+    FileDigest,
+    InstanceHealth,
+    InstanceReadiness,
+    LaunchPlan,
+    SteamInstance,
+)
+from .library import AppManifest, SteamLibrary
 from .profile import PlayerInstanceConfig, Profile, SplitscreenConfig
 
-__all__ = ["SteamInstance", "PlayerInstanceConfig", "SplitscreenConfig", "Profile"]
+__all__ = [
+    "SteamInstance",
+    "InstanceReadiness",
+    "InstanceHealth",
+    "FileDigest",
+    "LaunchPlan",
+    "AppManifest",
+    "SteamLibrary",
+    "PlayerInstanceConfig",
+    "SplitscreenConfig",
+    "Profile",
+]
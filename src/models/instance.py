@@ -1,13 +1,14 @@
 """
 Module defining the Steam instance model for the Twinverse application.
 
-This module contains the data model for representing a single, running
-instance of Steam.
+This module contains the data models for representing a single, running
+instance of Steam, the plan used to launch it, how far along its startup is
+and the health of its Steam installation.
 """
 
-from typing import Optional
+from typing import Dict, List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class SteamInstance(BaseModel):
@@ -21,3 +22,77 @@ class SteamInstance(BaseModel):
 
     instance_num: int
     pid: Optional[int] = None
+
+
+class InstanceReadiness(BaseModel):
+    """
+    Startup progress of a launched Steam instance.
+
+    Attributes:
+        instance_num (int): The instance this report belongs to.
+        ready (bool): True once every stage expected for the instance was reached.
+        stages (Dict[str, float]): Seconds from spawn until each reached stage.
+    """
+
+    instance_num: int
+    ready: bool = False
+    stages: Dict[str, float] = Field(default_factory=dict)
+
+
+class LaunchPlan(BaseModel):
+    """
+    Everything needed to spawn a single Steam instance.
+
+    Attributes:
+        instance_num (int): The instance this plan launches.
+        key (str): Hash of the inputs the plan was built from.
+        command (List[str]): The full command line to execute.
+        env (Dict[str, str]): Extra environment variables for the instance.
+    """
+
+    instance_num: int
+    key: str
+    command: List[str]
+    env: Dict[str, str] = Field(default_factory=dict)
+
+
+class FileDigest(BaseModel):
+    """
+    Hash of a file, valid as long as its size and modification time are unchanged.
+
+    Attributes:
+        size (int): Size of the file in bytes.
+        mtime_ns (int): Modification time of the file.
+        sha256 (str): Hex SHA-256 digest of the file content.
+    """
+
+    size: int
+    mtime_ns: int
+    sha256: str
+
+
+class InstanceHealth(BaseModel):
+    """
+    Result of a deep health check of an instance's Steam installation.
+
+    Attributes:
+        instance_path (str): The instance home that was checked.
+        client_version (Optional[str]): The installed Steam client version, if known.
+        missing (List[str]): Expected files that do not exist.
+        empty (List[str]): Expected files that are empty.
+        mismatched (List[str]): Files whose content differs from the other
+            instances on the same client version.
+        hashed (int): Number of files that had to be hashed again.
+    """
+
+    instance_path: str
+    client_version: Optional[str] = None
+    missing: List[str] = Field(default_factory=list)
+    empty: List[str] = Field(default_factory=list)
+    mismatched: List[str] = Field(default_factory=list)
+    hashed: int = 0
+
+    @property
+    def healthy(self) -> bool:
+        """Return True if no problem was found."""
+        return not (self.missing or self.empty or self.mismatched)
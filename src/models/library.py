@@ -0,0 +1,63 @@
+"""
+Module defining the host Steam library models for the Twinverse application.
+
+This module contains the data models describing what the host Steam
+installation shares with the instances: app manifests, installed game
+folders, compatibility tools and additional library folders.
+"""
+
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class AppManifest(BaseModel):
+    """
+    Metadata of a single `appmanifest_<appid>.acf` file.
+
+    Attributes:
+        app_id (str): The Steam app ID.
+        name (str): The name of the app as written in the manifest.
+        install_dir (str): The folder of the app inside `steamapps/common`.
+        size (int): Size of the manifest file in bytes.
+        mtime_ns (int): Modification time of the manifest file.
+    """
+
+    app_id: str
+    name: str = ""
+    install_dir: str = ""
+    size: int = 0
+    mtime_ns: int = 0
+
+    @property
+    def file_name(self) -> str:
+        """Return the file name of the manifest."""
+        return f"appmanifest_{self.app_id}.acf"
+
+
+class SteamLibrary(BaseModel):
+    """
+    Snapshot of the host Steam library.
+
+    Attributes:
+        host_path (str): The host Steam directory the snapshot was taken from.
+        manifests (Dict[str, AppManifest]): The app manifests, keyed by app ID.
+        games (List[str]): The folders in `steamapps/common`.
+        compat_tools (List[str]): The folders in `compatibilitytools.d`.
+        library_folders (List[str]): Additional library folders from `libraryfolders.vdf`.
+        dir_mtimes (Dict[str, Optional[int]]): Modification times of the scanned paths.
+    """
+
+    host_path: str
+    manifests: Dict[str, AppManifest] = Field(default_factory=dict)
+    games: List[str] = Field(default_factory=list)
+    compat_tools: List[str] = Field(default_factory=list)
+    library_folders: List[str] = Field(default_factory=list)
+    dir_mtimes: Dict[str, Optional[int]] = Field(default_factory=dict)
+
+    def install_dir(self, app_id: str) -> Optional[str]:
+        """Return the install folder of an app, if it is installed on the host."""
+        manifest = self.manifests.get(app_id)
+        if manifest and manifest.install_dir in self.games:
+            return manifest.install_dir
+        return None
@@ -20,6 +20,8 @@ class PlayerInstanceConfig(BaseModel):
     model_config = ConfigDict(populate_by_name=True)
 
     physical_device_id: Optional[str] = Field(default=None, alias="PHYSICAL_DEVICE_ID")
+    keyboard_device_id: Optional[str] = Field(default=None, alias="KEYBOARD_DEVICE_ID")
+    mouse_device_id: Optional[str] = Field(default=None, alias="MOUSE_DEVICE_ID")
     grab_input_devices: bool = Field(default=False, alias="GRAB_INPUT_DEVICES")
     audio_device_id: Optional[str] = Field(default=None, alias="AUDIO_DEVICE_ID")
     monitor_id: Optional[str] = Field(default=None, alias="MONITOR_ID")
@@ -61,38 +63,54 @@ class Profile(BaseModel):
     use_steamdeck_tag: bool = Field(default=False, alias="USE_STEAMDECK_TAG")
     use_gamescope: bool = Field(default=True, alias="USE_GAMESCOPE")
     enable_gamescope_wsi: bool = Field(default=Utils.is_wayland(), alias="ENABLE_GAMESCOPE_WSI")
+    players_per_screen: int = Field(default=4, ge=1, le=9, alias="PLAYERS_PER_SCREEN")
+    max_parallel_launches: int = Field(default=1, ge=1, alias="MAX_PARALLEL_LAUNCHES")
+    deep_health_check: bool = Field(default=False, alias="DEEP_HEALTH_CHECK")
+    library_mount_mode: str = Field(default="auto", alias="LIBRARY_MOUNT_MODE")
+    library_app_ids: List[str] = Field(default_factory=list, alias="LIBRARY_APP_IDS")
+
+    @field_validator("library_mount_mode")
+    def validate_library_mount_mode(cls, v):
+        """Validate that the library mount mode is a known one."""
+        if v not in ["auto", "shared", "allowlist", "per_folder"]:
+            raise ValueError("Library mount mode must be 'auto', 'shared', 'allowlist' or 'per_folder'.")
+        return v
 
     @classmethod
     def load(cls) -> "Profile":
-        """Load the profile from the default JSON file."""
+        """
+        Load the profile from the default JSON file.
+
+        The file is parsed and validated in a single pass by pydantic-core,
+        without building an intermediate dictionary.
+        """
         profile_path = Config.get_profile_path()
-        if not profile_path.exists():
+        try:
+            content = profile_path.read_bytes()
+        except FileNotFoundError:
             # If no profile exists, create a default one and save it
             default_profile = cls()
             default_profile.save()
             return default_profile
-
-        try:
-            with open(profile_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-        except (IOError, json.JSONDecodeError) as e:
+        except OSError as e:
             raise ValueError(f"Error reading profile file {profile_path}: {e}")
 
         try:
-            profile = cls(**data)
+            return cls.model_validate_json(content)
         except ValidationError as e:
+            if any(error["type"] == "json_invalid" for error in e.errors()):
+                raise ValueError(f"Error reading profile file {profile_path}: {e}")
             # Consider logging this instead of printing
             print(f"Pydantic Validation Error for {profile_path}: {e.errors()}")
             raise ValueError(f"Profile data validation failed: {e}")
-        return profile
 
     def save(self):
         """Save the profile to the default JSON file."""
-        profile_path = Config.get_profile_path()
-        profile_path.parent.mkdir(parents=True, exist_ok=True)
-        data_to_save = self.model_dump(by_alias=True, exclude_none=True)
-        json_data = json.dumps(data_to_save, indent=4)
-        profile_path.write_text(json_data, encoding="utf-8")
+        Utils.write_atomic(Config.get_profile_path(), self.to_json())
+
+    def to_json(self) -> str:
+        """Serialize the profile the way it is stored on disk."""
+        return json.dumps(self.model_dump(by_alias=True, exclude_none=True), indent=4)
 
     @property
     def is_splitscreen_mode(self) -> bool:
@@ -105,6 +123,16 @@ class Profile(BaseModel):
             return len(self.selected_players)
         return len(self.player_configs) if self.player_configs else 0
 
+    def session_instances(self) -> List[int]:
+        """Return the instances taking part in the session, in launch order."""
+        if self.selected_players:
+            return sorted(self.selected_players)
+        return list(range(len(self.player_configs)))
+
+    def monitor_assignments(self) -> Dict[int, str]:
+        """Return the monitor explicitly assigned to each instance, if any."""
+        return {i: config.monitor_id for i, config in enumerate(self.player_configs) if config.monitor_id}
+
     def get_env_for_instance(self, instance_idx: int) -> Dict[str, str]:
         """Return the merged environment variables for a given instance index (0-based).
 
@@ -1,17 +1,41 @@
 """Services for Twinverse application logic."""
 
+from .audio_backend import AudioBackend
 from .cmd_builder import CommandBuilder
+from .dbus_client import DBusClient
 from .device_manager import DeviceManager
+from .input_registry import InputDeviceRegistry
+from .input_router import InputRouter
 from .instance import InstanceService
+from .instance_logs import InstanceLogs
 from .kde_manager import KdeManager
+from .manifest_sync import ManifestSync
+from .monitor_topology import MonitorTopology
+from .mount_planner import MountPlanner
+from .process_supervisor import ProcessSupervisor
+from .profile_writer import ProfileWriter
+from .readiness_probe import ReadinessProbe
+from .steam_library import SteamLibraryIndex
 from .steam_verifier import SteamVerifier
 from .virtual_device import VirtualDeviceService
 
 __all__ = [
+    "AudioBackend",
     "CommandBuilder",
+    "DBusClient",
     "DeviceManager",
+    "InputDeviceRegistry",
+    "InputRouter",
+    "InstanceLogs",
     "InstanceService",
     "KdeManager",
+    "ManifestSync",
+    "MonitorTopology",
+    "MountPlanner",
+    "ProcessSupervisor",
+    "ProfileWriter",
+    "ReadinessProbe",
+    "SteamLibraryIndex",
     "SteamVerifier",
     "VirtualDeviceService",
 ]
@@ -0,0 +1,223 @@
+"""
+Audio backend module for the Twinverse application.
+
+This module discovers the audio output devices (sinks) of the PulseAudio or
+PipeWire server and keeps the list current by following the server's
+change events.
+"""
+
+import json
+import os
+import select
+import subprocess
+import threading
+from typing import Callable, Optional
+
+from src.core import Logger
+
+
+class AudioBackend:
+    """
+    Cached list of the audio sinks, kept current through `pactl subscribe`.
+
+    Sinks are read from the JSON output of `pactl` (available since
+    PulseAudio 16 and in `pipewire-pulse`), falling back to parsing the text
+    output on older servers. The list is refreshed whenever the server
+    reports that a sink was added or removed, and subscribers are notified
+    of the change.
+    """
+
+    DEBOUNCE_SECONDS = 0.2
+    RESTART_DELAY_SECONDS = 2.0
+
+    def __init__(self, logger: Logger):
+        """Initialize the audio backend."""
+        self._logger = logger
+        self._sinks: Optional[list[dict[str, str]]] = None
+        self._json_supported = True
+        self._subscribers: list[Callable[[list[dict[str, str]]], None]] = []
+        self._lock = threading.Lock()
+        self._monitor_thread: Optional[threading.Thread] = None
+        self._monitor_process: Optional[subprocess.Popen] = None
+        self._stop_event = threading.Event()
+
+    def get_sinks(self) -> list[dict[str, str]]:
+        """
+        Return the available audio sinks.
+
+        Returns:
+            A list of dictionaries containing the 'id' (sink name) and 'name'
+            (readable description) of every sink, sorted by name.
+        """
+        with self._lock:
+            if self._sinks is None:
+                self._sinks = self._list_sinks()
+            return self._sinks
+
+    def refresh(self) -> list[dict[str, str]]:
+        """Read the sinks again and notify subscribers if anything changed."""
+        sinks = self._list_sinks()
+        with self._lock:
+            changed = sinks != self._sinks
+            self._sinks = sinks
+            subscribers = list(self._subscribers)
+
+        if changed:
+            self._logger.info(f"Audio sinks changed: {len(sinks)} sink(s) available.")
+            for callback in subscribers:
+                try:
+                    callback(sinks)
+                except Exception as e:
+                    self._logger.error(f"Error in audio sink subscriber: {e}")
+        return sinks
+
+    def subscribe(self, callback: Callable[[list[dict[str, str]]], None]) -> None:
+        """
+        Register a callback for sink changes.
+
+        The callback receives the new sink list and is called from the
+        monitor thread.
+        """
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[list[dict[str, str]]], None]) -> None:
+        """Remove a previously registered callback."""
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def start_monitoring(self) -> None:
+        """Start following the sound server's change events in a background thread."""
+        if self._monitor_thread and self._monitor_thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._monitor_thread = threading.Thread(target=self._monitor_loop, name="audio-events", daemon=True)
+        self._monitor_thread.start()
+
+    def stop_monitoring(self) -> None:
+        """Stop following change events."""
+        self._stop_event.set()
+        process = self._monitor_process
+        if process and process.poll() is None:
+            process.terminate()
+        if self._monitor_thread:
+            self._monitor_thread.join(timeout=1)
+            self._monitor_thread = None
+
+    def _monitor_loop(self) -> None:
+        """Run `pactl subscribe`, restarting it if the sound server goes away."""
+        while not self._stop_event.is_set():
+            try:
+                self._monitor_process = subprocess.Popen(
+                    ["pactl", "subscribe"],
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    env=self._pactl_env(),
+                    bufsize=0,
+                )
+            except OSError as e:
+                self._logger.warning(f"Audio sink monitoring unavailable: {e}")
+                return
+
+            try:
+                self._read_events(self._monitor_process)
+            except Exception as e:
+                self._logger.error(f"Error while reading audio events: {e}")
+            finally:
+                if self._monitor_process.poll() is None:
+                    self._monitor_process.terminate()
+                self._monitor_process.wait()
+
+            if not self._stop_event.is_set():
+                self._logger.warning("Audio event stream ended, reconnecting...")
+                # The server may have restarted, so its sinks may be different now
+                self.refresh()
+                self._stop_event.wait(self.RESTART_DELAY_SECONDS)
+
+    def _read_events(self, process: subprocess.Popen) -> None:
+        """Refresh the sinks whenever the server reports a new or removed sink."""
+        fd = process.stdout.fileno()
+        pending = b""
+        while not self._stop_event.is_set():
+            if not select.select([fd], [], [], 0.5)[0]:
+                continue
+            chunk = os.read(fd, 4096)
+            if not chunk:
+                return
+
+            # Wait for the burst of events a device change causes to settle down
+            while select.select([fd], [], [], self.DEBOUNCE_SECONDS)[0]:
+                more = os.read(fd, 4096)
+                if not more:
+                    break
+                chunk += more
+
+            *lines, pending = (pending + chunk).split(b"\n")
+            if any(self._is_sink_event(line.decode(errors="replace")) for line in lines):
+                self.refresh()
+
+    @staticmethod
+    def _is_sink_event(line: str) -> bool:
+        """Check whether a `pactl subscribe` line reports a sink being added or removed."""
+        # e.g. "Event 'new' on sink #55"
+        return " on sink #" in line and (line.startswith("Event 'new'") or line.startswith("Event 'remove'"))
+
+    def _list_sinks(self) -> list[dict[str, str]]:
+        """Query the sound server for its sinks."""
+        if self._json_supported:
+            try:
+                result = self._run_pactl(["pactl", "-f", "json", "list", "sinks"])
+                sinks = [
+                    {"id": sink["name"], "name": sink.get("description") or sink["name"]}
+                    for sink in json.loads(result)
+                    if sink.get("name")
+                ]
+                return sorted(sinks, key=lambda x: x["name"])
+            except (subprocess.CalledProcessError, ValueError, TypeError, KeyError):
+                pass
+            except OSError as e:
+                self._logger.error(f"Could not list audio sinks: {e}")
+                return []
+
+        try:
+            sinks = self._parse_text_sinks(self._run_pactl(["pactl", "list", "sinks"]))
+        except (subprocess.CalledProcessError, OSError) as e:
+            self._logger.error(f"Could not list audio sinks: {e}")
+            return []
+
+        if self._json_supported:
+            # The server answers but pactl has no JSON output, so stop trying it
+            self._logger.info("pactl has no JSON output, falling back to text parsing.")
+            self._json_supported = False
+        return sinks
+
+    @staticmethod
+    def _pactl_env() -> dict[str, str]:
+        """Return the environment for pactl, forcing untranslated output."""
+        return {**os.environ, "LANG": "C", "LC_ALL": "C"}
+
+    def _run_pactl(self, command: list[str]) -> str:
+        """Run a pactl command and return its output."""
+        return subprocess.run(command, capture_output=True, text=True, check=True, env=self._pactl_env()).stdout
+
+    def _parse_text_sinks(self, pactl_output: str) -> list[dict[str, str]]:
+        """Parse the text output of `pactl list sinks`."""
+        audio_sinks = []
+        desc, name = None, None
+
+        for line in pactl_output.splitlines():
+            line = line.strip()
+            if line.startswith("Sink #"):
+                if name:
+                    audio_sinks.append({"id": name, "name": desc or name})
+                desc, name = None, None
+            elif line.startswith("Description:"):
+                desc = line.split(":", 1)[1].strip()
+            elif line.startswith("Name:"):
+                name = line.split(":", 1)[1].strip()
+
+        if name:
+            audio_sinks.append({"id": name, "name": desc or name})
+
+        return sorted(audio_sinks, key=lambda x: x["name"])
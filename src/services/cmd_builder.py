@@ -11,6 +11,7 @@ from typing import Dict, List, Optional
 from src.core import Logger
 from src.models import Profile
 from src.services.device_manager import DeviceManager
+from src.services.mount_planner import MountPlanner
 
 
 class CommandBuilder:
@@ -25,6 +26,7 @@ class CommandBuilder:
         instance_num: int,
         home_path: Path,
         virtual_joystick_path: Optional[str],
+        mount_planner: Optional[MountPlanner] = None,
     ):
         """Initialize the CommandBuilder with necessary parameters."""
         self.logger = logger
@@ -34,6 +36,7 @@ class CommandBuilder:
         self.instance_num = instance_num
         self.home_path = home_path
         self.virtual_joystick_path = virtual_joystick_path
+        self.mount_planner = mount_planner or MountPlanner(logger)
 
     def build_command(self) -> List[str]:
         """
@@ -133,7 +136,6 @@ class CommandBuilder:
         Steam directories over the real ones to achieve isolation.
         """
         orig_home = Path.home()
-        orig_local = orig_home / ".local"
 
         # fmt: off
         cmd = [
@@ -183,26 +185,8 @@ class CommandBuilder:
         cmd.extend(["--bind", str(self.home_path), str(orig_home)])
 
         # fmt: on
-        # Mount host's common games and compatibility tools into the sandboxed Steam directory
-        host_steam_path = orig_local / "share/Steam"
-        sandbox_steam_path = orig_local / "share/Steam"  # Same path, but it's now a mount point
-
-        # Share games
-        sandbox_common = Path(sandbox_steam_path) / "steamapps/common"
-        host_common = Path(host_steam_path) / "steamapps/common"
-        if host_common.exists():
-            for folder in host_common.iterdir():
-                if folder.is_dir():
-                    cmd.extend(["--bind", str(folder), str(sandbox_common / folder.name)])
-
-        # Share compatibilitytools
-        host_compat = Path(host_steam_path) / "compatibilitytools.d"
-        sandbox_compat = Path(sandbox_steam_path) / "compatibilitytools.d"
-        if host_compat.exists():
-            ignore = {"LegacyRuntime"}
-            for folder in host_compat.iterdir():
-                if folder.is_dir() and folder.name not in ignore:
-                    cmd.extend(["--bind", str(folder), str(sandbox_compat / folder.name)])
+        # Mount host's common games, compatibility tools and extra libraries into the sandboxed Steam directory
+        cmd.extend(self.mount_planner.build_mount_args(self.profile, self.home_path, orig_home))
         # --- End Home Directory Isolation ---
 
         # Ensure custom ENV variables reach Steam inside the sandbox
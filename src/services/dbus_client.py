@@ -0,0 +1,268 @@
+"""
+D-Bus client module for the Twinverse application.
+
+This module gives the desktop integration services a single way to talk to
+the session bus: proxies are cached, every call has a timeout and the
+latency of every method is tracked.
+"""
+
+import concurrent.futures
+import threading
+import time
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+from gi.repository import Gio, GLib
+
+from src.core import DBusCallError, Logger
+
+
+class DBusCallStats(NamedTuple):
+    """Latency statistics of a D-Bus method."""
+
+    calls: int = 0
+    failures: int = 0
+    timeouts: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    @property
+    def average_ms(self) -> float:
+        """Return the average latency of the method."""
+        return self.total_ms / self.calls if self.calls else 0.0
+
+
+class DBusClient:
+    """
+    Session bus client shared by the desktop integration services.
+
+    Proxies are created once per (bus name, object path, interface) and
+    reused. `call` is asynchronous and resolves its future from the main
+    loop, so it is safe to use from the GTK main thread. `call_sync` blocks
+    the calling thread until the answer arrives or the timeout expires and is
+    meant for worker threads. Either way a slow or hung service cannot block
+    a caller for longer than the timeout.
+    """
+
+    DEFAULT_TIMEOUT_MS = 3000
+    SLOW_CALL_MS = 250
+    PROXY_FLAGS = (
+        Gio.DBusProxyFlags.DO_NOT_LOAD_PROPERTIES
+        | Gio.DBusProxyFlags.DO_NOT_CONNECT_SIGNALS
+        | Gio.DBusProxyFlags.DO_NOT_AUTO_START
+    )
+
+    def __init__(self, logger: Logger, connection: Optional[Gio.DBusConnection] = None):
+        """Initialize the D-Bus client, connecting to the session bus if no connection is given."""
+        self._logger = logger
+        self.connection = connection
+        self._proxies: Dict[Tuple[str, str, str], Gio.DBusProxy] = {}
+        self._stats: Dict[str, DBusCallStats] = {}
+        self._lock = threading.Lock()
+
+        if self.connection is None:
+            try:
+                self.connection = Gio.bus_get_sync(Gio.BusType.SESSION, None)
+            except GLib.Error as e:
+                self._logger.error(f"Failed to connect to session D-Bus: {e.message}")
+
+    @property
+    def unique_name(self) -> Optional[str]:
+        """Return the unique name of the connection on the bus."""
+        return self.connection.get_unique_name() if self.connection else None
+
+    def call(
+        self,
+        bus_name: str,
+        object_path: str,
+        interface: str,
+        method: str,
+        parameters: Optional[GLib.Variant] = None,
+        timeout_ms: Optional[int] = None,
+    ) -> concurrent.futures.Future:
+        """
+        Call a D-Bus method asynchronously.
+
+        Args:
+            bus_name: The service to call.
+            object_path: The object to call the method on.
+            interface: The interface of the method.
+            method: The method name.
+            parameters: The arguments as a tuple variant, or None.
+            timeout_ms: How long to wait for the answer; defaults to DEFAULT_TIMEOUT_MS.
+
+        Returns:
+            A future resolved with the unpacked result, or failed with DBusCallError.
+            It is resolved from the main loop.
+        """
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        key = f"{interface}.{method}"
+        try:
+            proxy = self._proxy(bus_name, object_path, interface)
+        except DBusCallError as e:
+            future.set_exception(e)
+            return future
+
+        start = time.monotonic()
+
+        def on_done(source: Gio.DBusProxy, result: Gio.AsyncResult) -> None:
+            try:
+                value = source.call_finish(result)
+            except GLib.Error as e:
+                future.set_exception(self._failed(key, start, e))
+                return
+            self._record(key, start)
+            future.set_result(self._unpack(value))
+
+        proxy.call(
+            method, parameters, Gio.DBusCallFlags.NO_AUTO_START, timeout_ms or self.DEFAULT_TIMEOUT_MS, None, on_done
+        )
+        return future
+
+    def call_sync(
+        self,
+        bus_name: str,
+        object_path: str,
+        interface: str,
+        method: str,
+        parameters: Optional[GLib.Variant] = None,
+        timeout_ms: Optional[int] = None,
+    ) -> Any:
+        """
+        Call a D-Bus method and wait for the answer.
+
+        Takes the same arguments as `call`. Must not be used from the main
+        thread, which would stop responding until the call completes.
+
+        Returns:
+            The unpacked result: None for methods without output, the value for
+            methods with a single output and a tuple otherwise.
+
+        Raises:
+            DBusCallError: If the call failed or timed out.
+        """
+        key = f"{interface}.{method}"
+        if threading.current_thread() is threading.main_thread():
+            self._logger.warning(f"Blocking D-Bus call to {key} made from the main thread.")
+
+        proxy = self._proxy(bus_name, object_path, interface)
+        start = time.monotonic()
+        try:
+            value = proxy.call_sync(
+                method, parameters, Gio.DBusCallFlags.NO_AUTO_START, timeout_ms or self.DEFAULT_TIMEOUT_MS, None
+            )
+        except GLib.Error as e:
+            raise self._failed(key, start, e) from None
+        self._record(key, start)
+        return self._unpack(value)
+
+    def register_object(self, object_path: str, introspection_xml: str, methods: Dict[str, Callable[..., Any]]) -> int:
+        """
+        Export an object on the session bus.
+
+        Method calls are dispatched from the main loop.
+
+        Args:
+            object_path: Where to export the object.
+            introspection_xml: The D-Bus introspection data of its interface.
+            methods: The Python callable implementing every method, by method name.
+
+        Returns:
+            The registration id, to pass to `unregister_object`.
+
+        Raises:
+            DBusCallError: If there is no connection or the object could not be exported.
+        """
+        if not self.connection:
+            raise DBusCallError("Not connected to the session bus.")
+        interface_info = Gio.DBusNodeInfo.new_for_xml(introspection_xml).interfaces[0]
+
+        def on_method_call(connection, sender, path, interface, method, parameters, invocation):
+            try:
+                value = methods[method](*parameters.unpack())
+            except Exception as e:
+                self._logger.error(f"Error handling D-Bus call to {interface}.{method}: {e}")
+                invocation.return_dbus_error("org.freedesktop.DBus.Error.Failed", str(e))
+                return
+            out_args = interface_info.lookup_method(method).out_args
+            if not out_args:
+                invocation.return_value(None)
+            else:
+                signature = "".join(arg.signature for arg in out_args)
+                invocation.return_value(GLib.Variant(f"({signature})", value if len(out_args) > 1 else (value,)))
+
+        try:
+            return self.connection.register_object(object_path, interface_info, on_method_call, None, None)
+        except GLib.Error as e:
+            raise DBusCallError(f"Could not export {object_path}: {e.message}") from None
+
+    def unregister_object(self, registration_id: int) -> None:
+        """Stop exporting an object registered with `register_object`."""
+        if self.connection:
+            self.connection.unregister_object(registration_id)
+
+    def get_stats(self) -> Dict[str, DBusCallStats]:
+        """Return the latency statistics of every method called so far, by 'interface.method'."""
+        with self._lock:
+            return dict(self._stats)
+
+    def log_stats(self) -> None:
+        """Log a summary of the latency statistics."""
+        for key, stats in sorted(self.get_stats().items()):
+            self._logger.info(
+                f"D-Bus {key}: {stats.calls} call(s), avg {stats.average_ms:.1f} ms, max {stats.max_ms:.1f} ms, "
+                f"{stats.failures} failure(s), {stats.timeouts} timeout(s)"
+            )
+
+    def _proxy(self, bus_name: str, object_path: str, interface: str) -> Gio.DBusProxy:
+        """Return the cached proxy for an object, creating it on first use."""
+        if not self.connection:
+            raise DBusCallError("Not connected to the session bus.")
+
+        key = (bus_name, object_path, interface)
+        with self._lock:
+            proxy = self._proxies.get(key)
+        if proxy is not None:
+            return proxy
+
+        try:
+            # Only asks the bus daemon for the owner of the name, never the service itself
+            proxy = Gio.DBusProxy.new_sync(
+                self.connection, self.PROXY_FLAGS, None, bus_name, object_path, interface, None
+            )
+        except GLib.Error as e:
+            raise DBusCallError(f"Could not create a proxy for {bus_name}{object_path}: {e.message}") from None
+        with self._lock:
+            return self._proxies.setdefault(key, proxy)
+
+    def _record(self, key: str, start: float, failed: bool = False, timed_out: bool = False) -> None:
+        """Record the latency of a call."""
+        elapsed_ms = (time.monotonic() - start) * 1000
+        with self._lock:
+            stats = self._stats.get(key, DBusCallStats())
+            self._stats[key] = DBusCallStats(
+                calls=stats.calls + 1,
+                failures=stats.failures + failed,
+                timeouts=stats.timeouts + timed_out,
+                total_ms=stats.total_ms + elapsed_ms,
+                max_ms=max(stats.max_ms, elapsed_ms),
+            )
+        if elapsed_ms > self.SLOW_CALL_MS:
+            self._logger.warning(f"Slow D-Bus call to {key}: {elapsed_ms:.0f} ms")
+
+    def _failed(self, key: str, start: float, error: GLib.Error) -> DBusCallError:
+        """Record a failed call and return the error to raise."""
+        timed_out = error.matches(Gio.io_error_quark(), Gio.IOErrorEnum.TIMED_OUT)
+        self._record(key, start, failed=True, timed_out=timed_out)
+        if timed_out:
+            return DBusCallError(f"D-Bus call to {key} timed out")
+        return DBusCallError(f"D-Bus call to {key} failed: {error.message}")
+
+    @staticmethod
+    def _unpack(value: Optional[GLib.Variant]) -> Any:
+        """Unpack the result tuple of a method call."""
+        if value is None:
+            return None
+        result = value.unpack()
+        if len(result) == 0:
+            return None
+        return result[0] if len(result) == 1 else result
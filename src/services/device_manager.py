@@ -6,15 +6,16 @@ such as input devices, audio devices, and display outputs.
 """
 
 import logging
-import re
-import subprocess
-from typing import Dict, List, Optional, Tuple, Union
+import threading
+from typing import Dict, List, Optional, Tuple
 
-from screeninfo import get_monitors
-
-from src.core import LayoutCalculator
+from src.core import InstanceGeometry, LayoutCalculator
 from src.models import Profile
 
+from .audio_backend import AudioBackend
+from .input_registry import InputDeviceRegistry
+from .monitor_topology import MonitorInfo, MonitorTopology
+
 
 class DeviceManager:
     """
@@ -22,61 +23,29 @@ class DeviceManager:
 
     This class provides methods to detect and list available input devices
     (keyboards, mice, joysticks), audio output devices (sinks), and display
-    outputs (monitors) by interfacing with system command-line tools like
-    `ls`, `pactl`, and `xrandr`.
+    outputs (monitors) by interfacing with sysfs and system command-line
+    tools like `pactl`.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        input_registry: Optional[InputDeviceRegistry] = None,
+        audio_backend: Optional[AudioBackend] = None,
+        monitor_topology: Optional[MonitorTopology] = None,
+    ):
         """Initialize the DeviceManager."""
-        pass
-
-    def _run_command(self, command: List[str]) -> str:
-        """
-        Execute a shell command and return its standard output.
-
-        Args:
-            command (List[str]): The command to execute as a list of arguments.
-
-        Returns:
-            str: The stripped stdout from the command, or an empty string
-                 if an error occurs.
-        """
-        try:
-            result = subprocess.run(command, capture_output=True, text=True, check=True)
-            return result.stdout.strip()
-        except FileNotFoundError:
-            logging.error(f"Command not found: {command[0]}")
-            return ""
-        except subprocess.CalledProcessError as e:
-            logging.error(f"Command failed: '{command}' with error: {e.stderr.strip()}")
-            return ""
-
-    def _get_device_name_from_id(self, device_id_full: str) -> str:
-        """
-        Generate a human-readable name from a device's ID path.
-
-        It cleans up the raw device ID string by removing path prefixes and
-        technical suffixes, making it more suitable for display in a UI.
-
-        Args:
-            device_id_full (str): The full device path from `/dev/input/by-id/`.
-
-        Returns:
-            str: A cleaned, human-readable device name.
-        """
-        name_part = device_id_full.replace("/dev/input/by-id/", "")
-        name_part = re.sub(r"-event-(kbd|mouse|joystick)", "", name_part)
-        name_part = re.sub(r"-if\d+", "", name_part)
-        name_part = name_part.replace("usb-", "").replace("_", " ")
-        name_part = " ".join([word.capitalize() for word in name_part.split(" ")]).strip()
-        return name_part
+        self.input_registry = input_registry or InputDeviceRegistry(logging.getLogger(__name__))
+        self.audio_backend = audio_backend or AudioBackend(logging.getLogger(__name__))
+        self.monitor_topology = monitor_topology or MonitorTopology(logging.getLogger(__name__))
+        self._layout_cache: Optional[tuple] = None
+        self._layout_lock = threading.Lock()
 
     def get_input_devices(self) -> Dict[str, List[Dict[str, str]]]:
         """
-        Detect and categorize available input devices.
+        Return the available input devices, categorized by type.
 
-        Parse the output of `ls -l /dev/input/by-id/` to find keyboards,
-        mice, and joysticks.
+        The devices come from the input device registry, which reads them
+        from sysfs and keeps the list up to date on hotplug.
 
         Returns:
             Dict[str, List[Dict[str, str]]]: A dictionary where keys are
@@ -84,151 +53,80 @@ class DeviceManager:
             device dictionaries, with each dictionary containing the
             device's 'id' (path) and 'name' (human-readable).
         """
-        detected_devices: Dict[str, List[Dict[str, str]]] = {
-            "keyboard": [],
-            "mouse": [],
-            "joystick": [],
-        }
-
-        by_id_output = self._run_command(["ls", "-l", "/dev/input/by-id/"])
-
-        # A more specific regex to find symlinks to event devices.
-        device_pattern = re.compile(r"\s([^\s]+)\s+->\s+\.\./event\d+")
-
-        for line in by_id_output.splitlines():
-            try:
-                match = device_pattern.search(line)
-                if match:
-                    device_name_id_raw = match.group(1)
-                    full_path = f"/dev/input/by-id/{device_name_id_raw}"
-                    human_name = self._get_device_name_from_id(full_path)
-                    device = {"id": full_path, "name": human_name}
-
-                    if "event-joystick" in device_name_id_raw:
-                        detected_devices["joystick"].append(device)
-                    elif "event-mouse" in device_name_id_raw:
-                        detected_devices["mouse"].append(device)
-                    elif "event-kbd" in device_name_id_raw:
-                        detected_devices["keyboard"].append(device)
-            except (IndexError, AttributeError) as e:
-                logging.warning(f"Could not parse input device line: '{line}'. Error: {e}")
-                continue
-
-        for dev_type in detected_devices:
-            detected_devices[dev_type] = sorted(detected_devices[dev_type], key=lambda x: x["name"])
-        return detected_devices
+        return self.input_registry.get_devices()
 
     def get_audio_devices(self) -> List[Dict[str, str]]:
         """
-        Detect available audio output devices (sinks) using `pactl`.
+        Return the available audio output devices (sinks).
+
+        The sinks come from the audio backend, which caches them and follows
+        the sound server's change events.
 
         Returns:
             List[Dict[str, str]]: A list of dictionaries, where each
             dictionary represents an audio sink and contains its 'id'
             (PulseAudio name) and 'name' (readable description).
         """
-        audio_sinks = []
-
-        # Comando pactl com variável de ambiente para garantir saída em inglês
-        pactl_output = self._run_command(["sh", "-c", "LANG=C pactl list sinks"])
-
-        desc, name = None, None
-
-        for line in pactl_output.splitlines():
-            try:
-                if line.startswith("Sink #"):
-                    if name:
-                        audio_sinks.append({"id": name, "name": desc or name})
-                    desc, name = None, None
-                elif "Description:" in line:
-                    desc = line.split(":", 1)[1].strip()
-                elif "Name:" in line:
-                    name = line.split(":", 1)[1].strip()
-            except (IndexError, AttributeError) as e:
-                logging.warning(f"Could not parse audio device line: '{line}'. Error: {e}")
-                continue
-
-        if name:
-            audio_sinks.append({"id": name, "name": desc or name})
-
-        return sorted(audio_sinks, key=lambda x: x["name"])
-
-    def get_screen_info(self) -> List[Dict[str, Union[int, bool]]]:
-        """Get information about connected screens/monitors."""
-        monitors = []
-        for i, monitor in enumerate(get_monitors()):
-            monitors.append(
-                {
-                    "id": i,
-                    "x": monitor.x,
-                    "y": monitor.y,
-                    "width": monitor.width,
-                    "height": monitor.height,
-                }
-            )
-        return monitors
+        return self.audio_backend.get_sinks()
 
-    def get_instance_dimensions(self, profile: Profile, instance_num: int) -> Tuple[Optional[int], Optional[int]]:
+    def get_screen_info(self) -> List[MonitorInfo]:
+        """
+        Get information about connected screens/monitors.
+
+        The monitors come from the topology snapshot, so repeated queries do
+        not reach the display server until the monitor setup changes.
         """
-        Calculate instance dimensions, accounting for splitscreen.
+        return self.monitor_topology.snapshot()
 
-        For groups of up to 4 instances, the logic is repeated for each group.
+    def get_session_layout(
+        self, profile: Profile, instance_nums: Optional[List[int]] = None
+    ) -> Dict[int, InstanceGeometry]:
         """
+        Compute the geometry of every instance of a session in a single pass.
+
+        The result is reused until the profile's layout settings or the monitor
+        topology change, so per-instance queries made while launching a session
+        all see the same layout.
+
+        Args:
+            profile: The profile configuration.
+            instance_nums: The instances of the session; defaults to the profile's session.
+
+        Returns:
+            The geometry of every instance that could be placed, keyed by instance number.
+        """
+        if instance_nums is None:
+            instance_nums = profile.session_instances()
         monitors = self.get_screen_info()
+        orientation = profile.splitscreen.orientation if profile.splitscreen else "horizontal"
+        splitscreen = profile.is_splitscreen_mode and profile.splitscreen is not None
+        assignments = profile.monitor_assignments()
+
+        monitors_key = tuple((m["id"], m.get("name"), m["x"], m["y"], m["width"], m["height"]) for m in monitors)
+        key = (monitors_key, tuple(instance_nums), splitscreen, orientation, profile.players_per_screen, assignments)
+        with self._layout_lock:
+            if self._layout_cache and self._layout_cache[0] == key:
+                return self._layout_cache[1]
+
+        layout = LayoutCalculator.compute_session_layout(
+            monitors, instance_nums, splitscreen, orientation, profile.players_per_screen, assignments
+        )
+        with self._layout_lock:
+            self._layout_cache = (key, layout)
+        return layout
 
-        monitors_sorted = sorted(monitors, key=lambda x: x["id"])
-
-        monitor_to_use = None
-
-        if not profile.is_splitscreen_mode or not profile.splitscreen:
-            # Fullscreen mode
-            if instance_num < len(monitors_sorted):
-                monitor_to_use = monitors_sorted[instance_num]
-            else:
-                return None, None
-        else:
-            # Splitscreen mode
-            orientation = profile.splitscreen.orientation
-            num_players = profile.effective_num_players()
-
-            if num_players < 1:
-                if monitors_sorted:
-                    monitor_to_use = monitors_sorted[0]
-                else:
-                    return None, None
-            else:
-                group_index = instance_num // 4
-
-                if group_index < len(monitors_sorted):
-                    monitor_to_use = monitors_sorted[group_index]
-                else:
-                    return None, None
-
-                # Applies splitscreen logic within the group.
-                instance_in_group = instance_num % 4
-                num_players_in_group = min(4, num_players - group_index * 4)
-
-                if monitor_to_use and num_players_in_group > 0:
-                    # Special case: if there's only 1 player in the group, return full monitor size
-                    if num_players_in_group == 1:
-                        return monitor_to_use["width"], monitor_to_use["height"]
-
-                    if instance_in_group < num_players_in_group:
-                        # Use the new layout calculator
-                        x, y, width, height = LayoutCalculator.calculate_position(
-                            monitor_to_use["width"],
-                            monitor_to_use["height"],
-                            num_players_in_group,
-                            instance_in_group,
-                            orientation,
-                        )
-                        return width, height
-                    else:
-                        # If instance_in_group is greater than or equal to num_players_in_group,
-                        # return None, None as in the original logic
-                        return None, None
-
-        if monitor_to_use:
-            return monitor_to_use["width"], monitor_to_use["height"]
-
-        return None, None
+    def get_instance_dimensions(self, profile: Profile, instance_num: int) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Return the size of an instance, accounting for splitscreen.
+
+        The size comes from the session layout. An instance that is not part of
+        the profile's session is placed as if it had been added to it.
+        """
+        instance_nums = profile.session_instances()
+        if instance_num not in instance_nums:
+            instance_nums = sorted(instance_nums + [instance_num])
+
+        geometry = self.get_session_layout(profile, instance_nums).get(instance_num)
+        if geometry is None:
+            return None, None
+        return geometry.width, geometry.height
@@ -0,0 +1,278 @@
+"""
+Input device registry module for the Twinverse application.
+
+This module keeps an in-memory list of the input devices connected to the
+system, read directly from sysfs and kept up to date through inotify
+hotplug events.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import threading
+from pathlib import Path
+from typing import Callable, Optional
+
+from src.core import Logger
+
+
+class _Inotify:
+    """Minimal inotify wrapper used to watch `/dev/input` for hotplug events."""
+
+    IN_ATTRIB = 0x00000004
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    EVENT_HEADER = struct.Struct("iIII")
+
+    def __init__(self):
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = self._libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    def add_watch(self, path: Path, mask: int) -> None:
+        """Watch a directory for the given events."""
+        if self._libc.inotify_add_watch(self.fd, os.fsencode(path), mask) < 0:
+            raise OSError(ctypes.get_errno(), f"Could not watch {path}")
+
+    def read_names(self) -> list[str]:
+        """Drain the pending events and return the names of the affected entries."""
+        names = []
+        while True:
+            try:
+                data = os.read(self.fd, 4096)
+            except BlockingIOError:
+                return names
+            offset = 0
+            while offset < len(data):
+                _, _, _, length = self.EVENT_HEADER.unpack_from(data, offset)
+                offset += self.EVENT_HEADER.size
+                names.append(data[offset : offset + length].rstrip(b"\0").decode(errors="replace"))
+                offset += length
+
+    def close(self) -> None:
+        """Close the inotify file descriptor."""
+        os.close(self.fd)
+
+
+class InputDeviceRegistry:
+    """
+    Registry of the keyboards, mice and joysticks connected to the system.
+
+    Devices are enumerated from `/sys/class/input` and classified by the
+    event types and codes they report, so no external command is run. The
+    result is kept in memory and refreshed when a device node is added to or
+    removed from `/dev/input`. Interested parties can subscribe to changes.
+
+    Devices are identified by their `/dev/input/by-id` link when they have
+    one, so profiles keep matching the same device across reboots, falling
+    back to the `by-path` link and finally to the event node itself.
+    """
+
+    SYSFS_INPUT = Path("/sys/class/input")
+    DEV_INPUT = Path("/dev/input")
+    STABLE_LINK_DIRS = ("by-id", "by-path")
+    VIRTUAL_DEVICE_MARKER = "by Twinverse"
+    DEBOUNCE_SECONDS = 0.25
+
+    # Event types and codes from linux/input-event-codes.h
+    EV_KEY = 0x01
+    EV_REL = 0x02
+    EV_ABS = 0x03
+    REL_X = 0x00
+    REL_Y = 0x01
+    ABS_X = 0x00
+    BTN_LEFT = 0x110
+    BTN_JOYSTICK = 0x120
+    BTN_GAMEPAD = 0x130
+    KEYBOARD_KEYS = (16, 30, 44, 57)  # KEY_Q, KEY_A, KEY_Z, KEY_SPACE
+    BITMAP_WORD_BITS = ctypes.sizeof(ctypes.c_long) * 8
+
+    def __init__(self, logger: Logger):
+        """Initialize the input device registry."""
+        self._logger = logger
+        self._devices: Optional[dict[str, list[dict[str, str]]]] = None
+        self._subscribers: list[Callable[[dict[str, list[dict[str, str]]]], None]] = []
+        self._lock = threading.Lock()
+        self._monitor_thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+    def get_devices(self) -> dict[str, list[dict[str, str]]]:
+        """
+        Return the connected input devices.
+
+        Returns:
+            A dictionary with the "keyboard", "mouse" and "joystick" lists, each
+            holding the 'id' (path) and 'name' of every device, sorted by name.
+        """
+        with self._lock:
+            if self._devices is None:
+                self._devices = self._enumerate()
+            return self._devices
+
+    def refresh(self) -> dict[str, list[dict[str, str]]]:
+        """Enumerate the devices again and notify subscribers if anything changed."""
+        devices = self._enumerate()
+        with self._lock:
+            changed = devices != self._devices
+            self._devices = devices
+            subscribers = list(self._subscribers)
+
+        if changed:
+            self._logger.info(
+                "Input devices changed: " + ", ".join(f"{len(devices[dev_type])} {dev_type}(s)" for dev_type in devices)
+            )
+            for callback in subscribers:
+                try:
+                    callback(devices)
+                except Exception as e:
+                    self._logger.error(f"Error in input device subscriber: {e}")
+        return devices
+
+    def subscribe(self, callback: Callable[[dict[str, list[dict[str, str]]]], None]) -> None:
+        """
+        Register a callback for device changes.
+
+        The callback receives the new device lists and is called from the
+        monitor thread.
+        """
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[dict[str, list[dict[str, str]]]], None]) -> None:
+        """Remove a previously registered callback."""
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def start_monitoring(self) -> None:
+        """Start watching `/dev/input` for hotplug events in a background thread."""
+        if self._monitor_thread and self._monitor_thread.is_alive():
+            return
+
+        try:
+            inotify = _Inotify()
+        except OSError as e:
+            self._logger.warning(f"Input device hotplug monitoring unavailable: {e}")
+            return
+        try:
+            inotify.add_watch(self.DEV_INPUT, _Inotify.IN_CREATE | _Inotify.IN_DELETE | _Inotify.IN_ATTRIB)
+            for link_dir in self.STABLE_LINK_DIRS:
+                if (self.DEV_INPUT / link_dir).is_dir():
+                    inotify.add_watch(self.DEV_INPUT / link_dir, _Inotify.IN_CREATE | _Inotify.IN_DELETE)
+        except OSError as e:
+            inotify.close()
+            self._logger.warning(f"Input device hotplug monitoring unavailable: {e}")
+            return
+
+        self._stop_event.clear()
+        self._monitor_thread = threading.Thread(
+            target=self._monitor_loop, args=(inotify,), name="input-hotplug", daemon=True
+        )
+        self._monitor_thread.start()
+
+    def stop_monitoring(self) -> None:
+        """Stop watching for hotplug events."""
+        self._stop_event.set()
+        if self._monitor_thread:
+            self._monitor_thread.join(timeout=1)
+            self._monitor_thread = None
+
+    def _monitor_loop(self, inotify: _Inotify) -> None:
+        """Wait for hotplug events and refresh the registry once they settle down."""
+        try:
+            while not self._stop_event.is_set():
+                readable, _, _ = select.select([inotify.fd], [], [], 0.5)
+                if not readable:
+                    continue
+                names = inotify.read_names()
+                # udev creates the node, fixes its permissions and adds the links in quick succession
+                while select.select([inotify.fd], [], [], self.DEBOUNCE_SECONDS)[0]:
+                    names.extend(inotify.read_names())
+                if any(name.startswith("event") or "-event-" in name for name in names):
+                    self.refresh()
+        except Exception as e:
+            self._logger.error(f"Input device hotplug monitoring stopped: {e}")
+        finally:
+            inotify.close()
+
+    def _enumerate(self) -> dict[str, list[dict[str, str]]]:
+        """Read the input devices from sysfs and classify them."""
+        devices: dict[str, list[dict[str, str]]] = {"keyboard": [], "mouse": [], "joystick": []}
+        stable_links = self._stable_links()
+
+        try:
+            event_dirs = sorted(self.SYSFS_INPUT.glob("event*"))
+        except OSError as e:
+            self._logger.warning(f"Could not list input devices: {e}")
+            return devices
+
+        for event_dir in event_dirs:
+            device_dir = event_dir / "device"
+            name = self._read_sysfs(device_dir / "name") or event_dir.name
+            if self.VIRTUAL_DEVICE_MARKER in name:
+                continue
+
+            dev_type = self._classify(device_dir / "capabilities")
+            if dev_type:
+                device_id = stable_links.get(event_dir.name, str(self.DEV_INPUT / event_dir.name))
+                devices[dev_type].append({"id": device_id, "name": name})
+
+        for dev_type in devices:
+            devices[dev_type].sort(key=lambda x: x["name"])
+        return devices
+
+    def _classify(self, capabilities_dir: Path) -> Optional[str]:
+        """Classify a device as joystick, mouse or keyboard from its capabilities."""
+        ev = self._read_bitmap(capabilities_dir / "ev")
+        key = self._read_bitmap(capabilities_dir / "key")
+
+        def has(bitmap: int, code: int) -> bool:
+            return bool(bitmap >> code & 1)
+
+        if has(ev, self.EV_ABS) and has(self._read_bitmap(capabilities_dir / "abs"), self.ABS_X):
+            if has(key, self.BTN_GAMEPAD) or has(key, self.BTN_JOYSTICK):
+                return "joystick"
+        if has(ev, self.EV_REL) and has(key, self.BTN_LEFT):
+            rel = self._read_bitmap(capabilities_dir / "rel")
+            if has(rel, self.REL_X) and has(rel, self.REL_Y):
+                return "mouse"
+        if has(ev, self.EV_KEY) and all(has(key, code) for code in self.KEYBOARD_KEYS):
+            return "keyboard"
+        return None
+
+    def _stable_links(self) -> dict[str, str]:
+        """Map event node names to their most stable `/dev/input` link."""
+        links: dict[str, str] = {}
+        for link_dir in reversed(self.STABLE_LINK_DIRS):
+            try:
+                entries = list(os.scandir(self.DEV_INPUT / link_dir))
+            except OSError:
+                continue
+            for entry in sorted(entries, key=lambda entry: entry.name):
+                if not entry.is_symlink():
+                    continue
+                target = os.path.basename(os.readlink(entry.path))
+                if target.startswith("event"):
+                    # by-id is read last so it wins over by-path
+                    links[target] = entry.path
+        return links
+
+    @staticmethod
+    def _read_sysfs(path: Path) -> str:
+        """Read a sysfs attribute, returning an empty string if it is missing."""
+        try:
+            return path.read_text(encoding="utf-8", errors="replace").strip()
+        except OSError:
+            return ""
+
+    def _read_bitmap(self, path: Path) -> int:
+        """Read a sysfs capability bitmap (hex words, most significant first) as an integer."""
+        value = 0
+        for word in self._read_sysfs(path).split():
+            value = (value << self.BITMAP_WORD_BITS) | int(word, 16)
+        return value
@@ -0,0 +1,329 @@
+"""
+Input router module for the Twinverse application.
+
+This module forwards the events of physical keyboards and mice to virtual
+devices owned by a single instance, so keyboard and mouse players can be
+isolated the same way gamepads are.
+"""
+
+import collections
+import errno
+import os
+import select
+import threading
+import time
+from typing import Deque, Dict, List, Optional, Tuple
+
+from evdev import InputDevice, UInput
+from evdev import ecodes as e
+
+from src.core import Logger, VirtualDeviceError
+
+from .virtual_device import VirtualDeviceService
+
+
+class _Route:
+    """The devices routed to a single instance."""
+
+    def __init__(self, instance_num: int):
+        self.instance_num = instance_num
+        # Device kind ("keyboard" or "mouse") -> physical device id, virtual device and its event node
+        self.sources: Dict[str, str] = {}
+        self.targets: Dict[str, UInput] = {}
+        self.target_paths: Dict[str, str] = {}
+        # Physical devices are only grabbed once the instance runs
+        self.active = False
+
+
+class InputRouter:
+    """
+    Routes physical keyboards and mice to per-instance virtual devices.
+
+    Every routed instance gets a virtual keyboard and/or mouse whose event
+    node is bound into its sandbox. The selected physical devices are
+    grabbed, so the desktop stops seeing them, and their events are read
+    from a single epoll loop and written to the virtual devices. The
+    virtual devices have fixed capabilities, so a physical device can be
+    reassigned or replugged without the instance noticing.
+
+    The added latency of every forwarded event (from its kernel timestamp to
+    the moment it was written to the virtual device) is measured.
+    """
+
+    KINDS = ("keyboard", "mouse")
+    FORWARDED_TYPES = (e.EV_KEY, e.EV_REL)
+    LATENCY_SAMPLES = 1000
+    POLL_TIMEOUT_SECONDS = 1.0
+
+    def __init__(self, logger: Logger):
+        """Initialize the input router."""
+        self._logger = logger
+        self._routes: Dict[int, _Route] = {}
+        # Source fd -> (source device, target device, device kind, instance number)
+        self._sources: Dict[int, Tuple[InputDevice, UInput, str, int]] = {}
+        self._latencies: Deque[float] = collections.deque(maxlen=self.LATENCY_SAMPLES)
+        self._forwarded = 0
+        self._max_latency = 0.0
+        self._epoll: Optional[select.epoll] = None
+        self._wake_fds: Optional[Tuple[int, int]] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._lock = threading.RLock()
+
+    def route(
+        self, instance_num: int, keyboard_id: Optional[str], mouse_id: Optional[str], activate: bool = True
+    ) -> Dict[str, str]:
+        """
+        Route physical devices to an instance, replacing its previous sources.
+
+        The virtual devices of an instance are kept when its sources change, so
+        the instance keeps using the same event nodes. The physical devices of
+        a route that is not active yet are only grabbed once it is activated.
+
+        Args:
+            instance_num: The instance number.
+            keyboard_id: The physical keyboard to route, or None.
+            mouse_id: The physical mouse to route, or None.
+            activate: Whether to grab the physical devices now.
+
+        Returns:
+            The event node of the virtual device of every routed kind.
+
+        Raises:
+            VirtualDeviceError: If a virtual device could not be created.
+        """
+        wanted = {kind: device_id for kind, device_id in zip(self.KINDS, (keyboard_id, mouse_id)) if device_id}
+        with self._lock:
+            route = self._routes.setdefault(instance_num, _Route(instance_num))
+            route.active = route.active or activate
+            for kind in self.KINDS:
+                if route.sources.get(kind) == wanted.get(kind) and (kind not in wanted or kind in route.targets):
+                    continue
+                self._detach_source(instance_num, kind)
+                if kind not in wanted:
+                    route.sources.pop(kind, None)
+                    continue
+                if kind not in route.targets:
+                    route.targets[kind], route.target_paths[kind] = self._create_target(instance_num, kind)
+                route.sources[kind] = wanted[kind]
+                if route.active:
+                    self._attach_source(route, kind)
+            if route.sources and route.active:
+                self._ensure_loop()
+            return {kind: route.target_paths[kind] for kind in route.sources}
+
+    def activate(self, instance_num: int) -> None:
+        """Grab the physical devices routed to an instance, once it has been spawned."""
+        with self._lock:
+            route = self._routes.get(instance_num)
+            if not route or route.active:
+                return
+            route.active = True
+            for kind in route.sources:
+                self._attach_source(route, kind)
+            if route.sources:
+                self._ensure_loop()
+
+    def get_paths(self, instance_num: int) -> Dict[str, str]:
+        """Return the event nodes of the virtual devices routed to an instance."""
+        with self._lock:
+            route = self._routes.get(instance_num)
+            return {kind: route.target_paths[kind] for kind in route.sources} if route else {}
+
+    def unroute(self, instance_num: int) -> None:
+        """Release the physical devices of an instance and destroy its virtual devices."""
+        with self._lock:
+            route = self._routes.pop(instance_num, None)
+            if not route:
+                return
+            for kind in list(route.targets):
+                self._detach_source(instance_num, kind)
+                route.targets.pop(kind).close()
+            self._logger.info(f"Instance {instance_num}: Input routing stopped.")
+
+    def stop_all(self) -> None:
+        """Stop routing for every instance and stop the event loop."""
+        with self._lock:
+            for instance_num in list(self._routes):
+                self.unroute(instance_num)
+        self._stop_loop()
+        stats = self.get_latency_stats()
+        if stats["frames"]:
+            self._logger.info(
+                f"Input routing forwarded {stats['frames']} event frame(s), added latency avg {stats['average_ms']:.2f} ms, "
+                f"p99 {stats['p99_ms']:.2f} ms, max {stats['max_ms']:.2f} ms"
+            )
+
+    def on_devices_changed(self, _devices: Dict[str, List[Dict[str, str]]]) -> None:
+        """Reattach routed devices that were plugged back in; meant as an input registry subscriber."""
+        with self._lock:
+            for route in self._routes.values():
+                if not route.active:
+                    continue
+                for kind in route.sources:
+                    if not self._is_attached(route.instance_num, kind):
+                        self._attach_source(route, kind)
+
+    def get_latency_stats(self) -> Dict[str, float]:
+        """
+        Return the added latency of the forwarded events.
+
+        Returns:
+            A dictionary with the number of forwarded event 'frames' and the
+            'average_ms', 'p99_ms' and 'max_ms' latency over the most recent frames.
+        """
+        with self._lock:
+            samples = sorted(self._latencies)
+            forwarded, max_latency = self._forwarded, self._max_latency
+        if not samples:
+            return {"frames": forwarded, "average_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+        return {
+            "frames": forwarded,
+            "average_ms": sum(samples) / len(samples) * 1000,
+            "p99_ms": samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000,
+            "max_ms": max_latency * 1000,
+        }
+
+    def _create_target(self, instance_num: int, kind: str) -> Tuple[UInput, str]:
+        """Create the virtual device an instance receives the events of one kind on."""
+        if kind == "keyboard":
+            capabilities = {e.EV_KEY: list(range(e.KEY_ESC, e.KEY_MICMUTE + 1))}
+        else:
+            capabilities = {
+                e.EV_KEY: list(range(e.BTN_LEFT, e.BTN_TASK + 1)),
+                e.EV_REL: [e.REL_X, e.REL_Y, e.REL_HWHEEL, e.REL_WHEEL, e.REL_WHEEL_HI_RES, e.REL_HWHEEL_HI_RES],
+            }
+
+        ui = None
+        try:
+            ui = UInput(
+                capabilities,
+                name=f"Virtual {kind.capitalize()} {instance_num + 1} by Twinverse",
+                vendor=0x1234,
+                product=0x5679 if kind == "keyboard" else 0x567A,
+                phys=f"twinverse/instance{instance_num}/{kind}",
+            )
+            path = VirtualDeviceService.find_event_node(ui.fd)
+        except Exception as ex:
+            if ui:
+                ui.close()
+            raise VirtualDeviceError(f"Failed to create virtual {kind} for instance {instance_num}: {ex}") from ex
+
+        self._logger.info(f"Instance {instance_num}: Virtual {kind} created at {path}")
+        return ui, path
+
+    def _attach_source(self, route: _Route, kind: str) -> None:
+        """Open and grab the physical device of a route, if it is connected."""
+        device_id = route.sources[kind]
+        try:
+            source = InputDevice(device_id)
+        except OSError as ex:
+            self._logger.warning(f"Instance {route.instance_num}: {kind} '{device_id}' unavailable: {ex}")
+            return
+        try:
+            source.grab()
+        except OSError as ex:
+            source.close()
+            self._logger.warning(f"Instance {route.instance_num}: Could not grab {kind} '{device_id}': {ex}")
+            return
+
+        self._sources[source.fd] = (source, route.targets[kind], kind, route.instance_num)
+        if self._epoll:
+            self._epoll.register(source.fd, select.EPOLLIN)
+        self._logger.info(f"Instance {route.instance_num}: Routing {kind} '{source.name}' ({device_id}).")
+
+    def _detach_source(self, instance_num: int, kind: str) -> None:
+        """Stop reading a physical device and give it back to the desktop."""
+        for fd, (source, _, source_kind, source_instance) in list(self._sources.items()):
+            if source_instance == instance_num and source_kind == kind:
+                self._close_source(fd, source)
+
+    def _close_source(self, fd: int, source: InputDevice) -> None:
+        """Unregister and close a physical device."""
+        del self._sources[fd]
+        if self._epoll:
+            try:
+                self._epoll.unregister(fd)
+            except (OSError, ValueError):
+                pass
+        try:
+            source.ungrab()
+        except OSError:
+            pass
+        source.close()
+
+    def _is_attached(self, instance_num: int, kind: str) -> bool:
+        """Check whether a route currently reads from its physical device."""
+        return any(
+            source_instance == instance_num and source_kind == kind
+            for _, _, source_kind, source_instance in self._sources.values()
+        )
+
+    def _ensure_loop(self) -> None:
+        """Start the event loop if it is not running."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._epoll = select.epoll()
+        self._wake_fds = os.pipe()
+        self._epoll.register(self._wake_fds[0], select.EPOLLIN)
+        for fd in self._sources:
+            self._epoll.register(fd, select.EPOLLIN)
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._event_loop, args=(self._epoll, self._wake_fds[0]), name="input-router", daemon=True
+        )
+        self._thread.start()
+
+    def _stop_loop(self) -> None:
+        """Stop the event loop and wait for it to exit."""
+        if not self._thread:
+            return
+        self._stop_event.set()
+        os.write(self._wake_fds[1], b"\0")
+        self._thread.join(timeout=1)
+        self._thread = None
+        with self._lock:
+            self._epoll.close()
+            for fd in self._wake_fds:
+                os.close(fd)
+            self._epoll, self._wake_fds = None, None
+
+    def _event_loop(self, epoll: select.epoll, wake_fd: int) -> None:
+        """Forward the events of every routed device until stopped."""
+        while not self._stop_event.is_set():
+            try:
+                ready = epoll.poll(self.POLL_TIMEOUT_SECONDS)
+            except InterruptedError:
+                continue
+            for fd, _ in ready:
+                if fd != wake_fd:
+                    self._forward(fd)
+
+    def _forward(self, fd: int) -> None:
+        """Copy the pending events of a physical device to its virtual device."""
+        with self._lock:
+            entry = self._sources.get(fd)
+            if not entry:
+                return
+            source, target, kind, instance_num = entry
+            try:
+                for event in source.read():
+                    if event.type in self.FORWARDED_TYPES:
+                        target.write(event.type, event.code, event.value)
+                    elif event.type == e.EV_SYN and event.code == e.SYN_REPORT:
+                        target.syn()
+                        self._record_latency(time.time() - event.timestamp())
+            except BlockingIOError:
+                pass
+            except OSError as ex:
+                if ex.errno != errno.ENODEV:
+                    self._logger.error(f"Instance {instance_num}: Error reading {kind}: {ex}")
+                # The device was unplugged; it is reattached when it comes back
+                self._logger.warning(f"Instance {instance_num}: Routed {kind} disconnected.")
+                self._close_source(fd, source)
+
+    def _record_latency(self, latency: float) -> None:
+        """Record the added latency of a forwarded event frame."""
+        self._latencies.append(latency)
+        self._forwarded += 1
+        self._max_latency = max(self._max_latency, latency)
@@ -6,25 +6,48 @@ terminating, and configuring them with isolated environments.
 """
 
 import copy
+import hashlib
+import json
 import os
 import shlex
 import shutil
 import signal
 import subprocess
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 from src.core import Config, Logger, Utils
 from src.core.exceptions import DependencyError, TwinverseError, VirtualDeviceError
-from src.models import PlayerInstanceConfig, Profile
+from src.models import InstanceReadiness, LaunchPlan, PlayerInstanceConfig, Profile
 
+from .input_router import InputRouter
+from .instance_logs import InstanceLogs
 from .kde_manager import KdeManager
+from .manifest_sync import ManifestSync
+from .mount_planner import MountPlanner
+from .process_supervisor import ProcessSupervisor
+from .readiness_probe import ReadinessProbe
+from .steam_library import SteamLibraryIndex
+
+if TYPE_CHECKING:
+    from .device_manager import DeviceManager
 
 
 class InstanceService:
     """Service responsible for managing Steam instances."""
 
-    def __init__(self, logger: Logger, kde_manager: Optional[KdeManager] = None):
+    TERMINATE_TIMEOUT = 10.0
+    TERMINATE_POLL_INTERVAL = 0.05
+
+    def __init__(
+        self,
+        logger: Logger,
+        kde_manager: Optional[KdeManager] = None,
+        device_manager: Optional["DeviceManager"] = None,
+    ):
         """Initialize the instance service."""
         from .device_manager import DeviceManager
         from .virtual_device import VirtualDeviceService
@@ -32,13 +55,22 @@ class InstanceService:
         self.logger = logger
         self.virtual_device = VirtualDeviceService(logger)
         self.kde_manager = kde_manager
-        self.device_manager = DeviceManager()
-        self._virtual_joystick_path: Optional[str] = None
-        self._virtual_joystick_checked: bool = False
+        self.device_manager = device_manager or DeviceManager()
+        self.instance_logs = InstanceLogs(logger)
+        self.readiness = ReadinessProbe(logger, output_tail=self.instance_logs.tail)
+        self.supervisor = ProcessSupervisor(logger)
+        self.library_index = SteamLibraryIndex(logger)
+        self.mount_planner = MountPlanner(logger, self.library_index)
+        self.manifest_sync = ManifestSync(logger)
+        self.input_router = InputRouter(logger)
+        self.device_manager.input_registry.subscribe(self.input_router.on_devices_changed)
         self.pids: dict[int, int] = {}
         self.pgids: dict[int, int] = {}
         self.processes: dict[int, subprocess.Popen] = {}
         self.termination_in_progress = False
+        self._plan_cache: dict[int, LaunchPlan] = {}
+        self._lock = threading.Lock()
+        self._reroute_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="input-reroute")
 
     def _prepare_instance_launch(self, profile: Profile, instance_num: int) -> tuple[list[str], dict]:
         """Prepare and build the command for launching a single Steam instance."""
@@ -50,6 +82,9 @@ class InstanceService:
 
         device_info = self._validate_input_devices(profile, instance_num, instance_num)
         instance_env = self._prepare_environment(profile, device_info, instance_num)
+        virtual_joystick_path = None
+        if not device_info["joystick_path_str_for_instance"]:
+            virtual_joystick_path = self.virtual_device.get_joystick(instance_num)
 
         from .cmd_builder import CommandBuilder
 
@@ -60,20 +95,125 @@ class InstanceService:
             self.device_manager,
             instance_num,
             home_path,
-            self._virtual_joystick_path,
+            virtual_joystick_path,
+            self.mount_planner,
         )
         return cmd_builder.build_command(), instance_env
 
-    def _launch_single_instance(self, profile: Profile, instance_num: int) -> None:
-        """Launch a single steam instance."""
-        self.logger.info(f"Preparing instance {instance_num}...")
+    def prepare_launch_plans(
+        self,
+        profile: Profile,
+        instance_nums: list[int],
+        use_gamescope_override: Optional[bool] = None,
+    ) -> dict[int, LaunchPlan]:
+        """
+        Prepare launch plans for several instances at once.
+
+        Plans are built concurrently in a thread pool. A previously built plan is
+        reused without touching the filesystem when the profile, the host Steam
+        library and the devices it depends on are unchanged.
+
+        Args:
+            profile: The profile configuration.
+            instance_nums: The instance numbers to prepare.
+            use_gamescope_override: Override the profile's gamescope setting.
+
+        Returns:
+            The launch plan of each requested instance, keyed by instance number.
+        """
+        # Virtual joysticks are created in the background while the rest of the launch is prepared
+        self._reserve_virtual_joysticks(profile, instance_nums)
+
+        active_profile = profile
+        if use_gamescope_override is not None:
+            active_profile = copy.deepcopy(profile)
+            active_profile.use_gamescope = use_gamescope_override
+
+            # Also override ENABLE_GAMESCOPE_WSI when gamescope is disabled
+            if use_gamescope_override is False:
+                active_profile.enable_gamescope_wsi = False
+
+        host_state = self._host_library_state()
+        monitors = self.device_manager.get_screen_info()
+
+        plans: dict[int, LaunchPlan] = {}
+        pending: dict[int, str] = {}
+        for instance_num in instance_nums:
+            if self._needs_virtual_joystick(profile, instance_num):
+                try:
+                    self.virtual_device.get_joystick(instance_num)
+                except VirtualDeviceError as e:
+                    self.logger.error(f"Halting launch due to virtual joystick creation failure: {str(e)}")
+                    # Re-raise the exception to be caught by the UI layer
+                    raise
+            else:
+                # The instance got a physical controller; its virtual joystick is no longer needed
+                self.virtual_device.release(instance_num)
+            self._route_inputs(profile, instance_num, activate=False)
+            key = self._plan_key(active_profile, instance_num, host_state, monitors)
+            cached = self._plan_cache.get(instance_num)
+            if cached and cached.key == key:
+                self.logger.info(f"Instance {instance_num}: Reusing cached launch plan.")
+                plans[instance_num] = cached
+            else:
+                pending[instance_num] = key
+
+        if pending:
+            with ThreadPoolExecutor(max_workers=len(pending), thread_name_prefix="launch-plan") as executor:
+                futures = {
+                    instance_num: executor.submit(self._prepare_instance_launch, active_profile, instance_num)
+                    for instance_num in pending
+                }
+                for instance_num, future in futures.items():
+                    base_command, instance_env = future.result()
+                    plan = LaunchPlan(
+                        instance_num=instance_num, key=pending[instance_num], command=base_command, env=instance_env
+                    )
+                    self._plan_cache[instance_num] = plan
+                    plans[instance_num] = plan
+
+        return plans
 
-        base_command, instance_env = self._prepare_instance_launch(profile, instance_num)
+    def _plan_key(self, profile: Profile, instance_num: int, host_state: dict, monitors: list) -> str:
+        """Hash every input a launch plan is built from."""
+        player_config = (
+            profile.player_configs[instance_num]
+            if profile.player_configs and 0 <= instance_num < len(profile.player_configs)
+            else PlayerInstanceConfig()
+        )
+        device_id = player_config.physical_device_id
+        device_state = os.path.realpath(device_id) if device_id and os.path.exists(device_id) else None
+        home_ready = (Config.get_steam_home_path(instance_num) / ".local/share/Steam/steamapps").is_dir()
 
-        log_file = Config.LOG_DIR / f"steam_instance_{instance_num}.log"
-        self.logger.info(f"Launching instance {instance_num} (Log: {log_file})")
-        self.logger.debug(f"Instance {instance_num}: Environment: {dict(instance_env)}")
+        key_data = [
+            profile.model_dump(mode="json"),
+            instance_num,
+            host_state,
+            device_state,
+            self.virtual_device.get_path(instance_num),
+            self.input_router.get_paths(instance_num),
+            monitors,
+            home_ready,
+        ]
+        return hashlib.sha256(json.dumps(key_data, sort_keys=True, default=str).encode()).hexdigest()
+
+    def _host_library_state(self) -> dict:
+        """Return the modification times of the host Steam directories shared with instances."""
+        return self.library_index.snapshot().dir_mtimes
+
+    def spawn_instance(self, plan: LaunchPlan) -> None:
+        """Spawn a Steam instance from a prepared launch plan."""
+        instance_num = plan.instance_num
+        base_command = plan.command
+        instance_env = plan.env
+
+        log_file = self.instance_logs.log_path(instance_num)
+        self.logger.info(
+            "Launching instance %d (Log: %s)", instance_num, log_file, instance=instance_num, phase="spawn"
+        )
+        self.logger.debug("Instance %d: Environment: %s", instance_num, instance_env, instance=instance_num)
 
+        started_at = time.monotonic()
         try:
             if Utils.is_flatpak():
                 self.logger.info(f"Instance {instance_num}: Launching in Flatpak environment")
@@ -81,12 +221,30 @@ class InstanceService:
             else:
                 self.logger.info(f"Instance {instance_num}: Launching natively")
                 process, pgid = self._launch_natively(instance_num, base_command, instance_env)
-
-            self.pids[instance_num] = process.pid
-            self.pgids[instance_num] = pgid
-            self.processes[instance_num] = process
-
-            self.logger.info(f"Instance {instance_num}: Successfully launched with PID {process.pid}")
+            self.instance_logs.capture(instance_num, process)
+            self.supervisor.watch(instance_num, process)
+            self.input_router.activate(instance_num)
+
+            with self._lock:
+                self.pids[instance_num] = process.pid
+                self.pgids[instance_num] = pgid
+                self.processes[instance_num] = process
+
+            self.readiness.track(
+                instance_num,
+                process,
+                pgid,
+                Config.get_steam_home_path(instance_num),
+                expects_window=base_command[0] == "gamescope",
+            )
+            self.logger.info(
+                "Instance %d: Successfully launched with PID %d",
+                instance_num,
+                process.pid,
+                instance=instance_num,
+                phase="spawn",
+                duration_ms=round((time.monotonic() - started_at) * 1000, 1),
+            )
 
         except TwinverseError:
             self.logger.error(f"Instance {instance_num}: TwinverseError during launch")
@@ -96,6 +254,26 @@ class InstanceService:
             self.logger.exception(f"Instance {instance_num}: Exception details:")
             raise TwinverseError(f"Failed to launch instance {instance_num}: {str(e)}")
 
+    def check_ready(self, instance_num: int) -> InstanceReadiness:
+        """
+        Probe a launched instance once and report how far its startup got.
+
+        Raises:
+            TwinverseError: If the instance exited before becoming ready.
+        """
+        return self.readiness.check(instance_num)
+
+    def wait_ready(
+        self, instance_num: int, timeout: float, cancel_event: Optional[threading.Event] = None
+    ) -> InstanceReadiness:
+        """
+        Wait until a launched instance is ready or the timeout expires.
+
+        Raises:
+            TwinverseError: If the instance exited before becoming ready.
+        """
+        return self.readiness.wait_ready(instance_num, timeout, cancel_event)
+
     def _launch_in_flatpak(
         self, instance_num: int, base_command: list[str], instance_env: dict
     ) -> tuple[subprocess.Popen, int]:
@@ -105,7 +283,9 @@ class InstanceService:
         escaped_command = shlex.join(base_command)
         shell_command = f"{env_prefix}set -m; echo $$; exec {escaped_command}"
 
-        self.logger.info(f"Instance {instance_num}: Launching on host via shell: {shell_command}")
+        self.logger.info(
+            "Instance %d: Launching on host via shell: %s", instance_num, shell_command, instance=instance_num
+        )
 
         flatpak_env = os.environ.copy()
         flatpak_env.pop("PYTHONHOME", None)
@@ -116,7 +296,8 @@ class InstanceService:
                 ["bash", "-c", shell_command],
                 async_=True,
                 stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                bufsize=0,
                 env=flatpak_env,
                 cwd=Path.home(),
             )
@@ -130,20 +311,7 @@ class InstanceService:
             self.logger.error(f"Instance {instance_num}: Unexpected error when spawning host process: {e}")
             raise TwinverseError(f"Unexpected error when launching instance {instance_num}: {e}")
 
-        import time
-
-        time.sleep(0.1)
-
-        if process.poll() is not None:
-            stdout_data, stderr_data = process.communicate()
-            stdout_str = stdout_data.decode() if stdout_data else ""
-            stderr_str = stderr_data.decode() if stderr_data else ""
-            error_message = (
-                f"STDOUT: {stdout_str}\nSTDERR: {stderr_str}" if (stdout_str or stderr_str) else "Unknown error"
-            )
-            self.logger.error(f"Instance {instance_num}: Process failed to start:\n{error_message}")
-            raise DependencyError(f"Command failed to start: {base_command[0]} - {error_message}")
-
+        # Blocks until the shell reports its PID, or returns empty if it died first
         pgid_str = process.stdout.readline().decode().strip() if process.stdout else ""
         if pgid_str.isdigit():
             pgid = int(pgid_str)
@@ -155,15 +323,10 @@ class InstanceService:
         self.logger.error(f"Instance {instance_num}: Failed to capture host PGID. Read: '{pgid_str}'")
         process.terminate()
 
-        # Try to get error output if available
-        stdout_data, stderr_data = process.communicate(timeout=1) if process.stdout else (None, None)
-        stdout_str = stdout_data.decode() if stdout_data else ""
-        stderr_str = stderr_data.decode() if stderr_data else ""
-        error_message = (
-            f"STDOUT: {stdout_str}\nSTDERR: {stderr_str}"
-            if (stdout_str or stderr_str)
-            else "Failed to capture host PGID"
-        )
+        # Try to get error output if available; the pipe is not captured yet
+        output_data, _ = process.communicate(timeout=1) if process.stdout else (None, None)
+        output_str = output_data.decode(errors="replace").strip() if output_data else ""
+        error_message = f"Output: {output_str}" if output_str else "Failed to capture host PGID"
 
         raise TwinverseError(f"Failed to get host process group ID for instance {instance_num}: {error_message}")
 
@@ -176,10 +339,17 @@ class InstanceService:
         native_env.pop("PYTHONPATH", None)
         native_env.update(instance_env)
 
-        self.logger.info(f"Instance {instance_num}: Full command: {shlex.join(base_command)}")
+        self.logger.info(
+            "Instance %d: Full command: %s", instance_num, Logger.lazy(shlex.join, base_command), instance=instance_num
+        )
 
         # Log environment variables for debugging
-        self.logger.debug(f"Instance {instance_num}: Environment variables: {list(instance_env.keys())}")
+        self.logger.debug(
+            "Instance %d: Environment variables: %s",
+            instance_num,
+            Logger.lazy(list, instance_env),
+            instance=instance_num,
+        )
 
         # Check if required binaries exist before launching
         if not shutil.which(base_command[0]):
@@ -191,7 +361,8 @@ class InstanceService:
             process = subprocess.Popen(
                 base_command,
                 stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                bufsize=0,
                 env=native_env,
                 cwd=Path.home(),
                 preexec_fn=os.setpgrp,
@@ -206,20 +377,7 @@ class InstanceService:
             self.logger.error(f"Instance {instance_num}: OS error when launching: {e}")
             raise TwinverseError(f"OS error when launching instance {instance_num}: {e}")
 
-        import time
-
-        time.sleep(0.1)
-
-        if process.poll() is not None:
-            stdout_data, stderr_data = process.communicate()
-            stdout_str = stdout_data.decode() if stdout_data else ""
-            stderr_str = stderr_data.decode() if stderr_data else ""
-            error_message = (
-                f"STDOUT: {stdout_str}\nSTDERR: {stderr_str}" if (stdout_str or stderr_str) else "Unknown error"
-            )
-            self.logger.error(f"Instance {instance_num}: Process failed to start:\n{error_message}")
-            raise DependencyError(f"Command failed to start: {base_command[0]} - {error_message}")
-
+        # Startup failures are reported by the readiness probe once the process exits.
         pgid = process.pid
         self.logger.info(f"Instance {instance_num} started with PID: {process.pid} and PGID: {pgid}")
         return process, pgid
@@ -231,118 +389,197 @@ class InstanceService:
         use_gamescope_override: Optional[bool] = None,
     ) -> None:
         """Launch a single Steam instance."""
-        if not self._virtual_joystick_checked:
-            self._virtual_joystick_checked = True
-            needs_virtual_joystick = False
-            num_players = profile.effective_num_players()
-            if num_players > 0:
-                # Check player configs up to the number of players
-                for i in range(num_players):
-                    player_config = (
-                        profile.player_configs[i]
-                        if profile.player_configs and i < len(profile.player_configs)
-                        else PlayerInstanceConfig()
-                    )
-                    if not player_config.physical_device_id:
-                        needs_virtual_joystick = True
-                        break
+        plans = self.prepare_launch_plans(profile, [instance_num], use_gamescope_override)
+        self.spawn_instance(plans[instance_num])
+
+    def _reserve_virtual_joysticks(self, profile: Profile, instance_nums: list[int]) -> None:
+        """Start creating a virtual joystick for every instance without a physical one."""
+        needing = [
+            instance_num for instance_num in instance_nums if self._needs_virtual_joystick(profile, instance_num)
+        ]
+        if needing:
+            self.logger.info(f"Instances {needing} lack a physical joystick. Preparing virtual ones.")
+            self.virtual_device.reserve(needing)
+
+    def _route_inputs(self, profile: Profile, instance_num: int, activate: bool = True) -> None:
+        """
+        Route the keyboard and mouse selected for an instance to its virtual devices.
 
-            if needs_virtual_joystick:
-                self.logger.info("One or more instances lack a physical joystick. Creating a virtual one.")
-                try:
-                    self._virtual_joystick_path = self.virtual_device.create_virtual_joystick()
-                except VirtualDeviceError as e:
-                    self.logger.error(f"Halting launch due to virtual joystick creation failure: {str(e)}")
-                    # Re-raise the exception to be caught by the UI layer
-                    raise
+        While a launch is prepared the routes are not activated, so the physical
+        devices are only grabbed once the instance is spawned.
+        """
+        player_config = (
+            profile.player_configs[instance_num]
+            if profile.player_configs and 0 <= instance_num < len(profile.player_configs)
+            else PlayerInstanceConfig()
+        )
+        keyboard_id = (player_config.keyboard_device_id or "").strip() or None
+        mouse_id = (player_config.mouse_device_id or "").strip() or None
+        if not keyboard_id and not mouse_id and not self.input_router.get_paths(instance_num):
+            return
+        try:
+            self.input_router.route(instance_num, keyboard_id, mouse_id, activate=activate)
+        except VirtualDeviceError as e:
+            self.logger.error(f"Instance {instance_num}: Keyboard and mouse routing unavailable: {e}")
 
-        active_profile = profile
-        if use_gamescope_override is not None:
-            active_profile = copy.deepcopy(profile)
-            active_profile.use_gamescope = use_gamescope_override
+    def reroute_inputs(self, profile: Profile) -> Future:
+        """
+        Apply keyboard and mouse changes to the running instances in the background.
 
-            # Also override ENABLE_GAMESCOPE_WSI when gamescope is disabled
-            if use_gamescope_override is False:
-                active_profile.enable_gamescope_wsi = False
+        Creating virtual devices and grabbing physical ones can block, so it
+        runs on a single worker thread, which also applies successive changes
+        in order. Devices replace the previous ones on the same virtual
+        devices, so the instances do not need to be relaunched.
 
-        Config.LOG_DIR.mkdir(parents=True, exist_ok=True)
-        self._launch_single_instance(active_profile, instance_num)
+        Args:
+            profile: The profile with the new device selection.
+
+        Returns:
+            A future completed once the changes were applied.
+        """
+        return self._reroute_executor.submit(self._reroute_inputs, profile.model_copy(deep=True))
+
+    def _reroute_inputs(self, profile: Profile) -> None:
+        """Apply keyboard and mouse changes to the running instances."""
+        for instance_num in list(self.processes):
+            try:
+                if self.input_router.get_paths(instance_num):
+                    self._route_inputs(profile, instance_num)
+            except Exception as e:
+                self.logger.error(f"Instance {instance_num}: Could not apply keyboard and mouse changes: {e}")
+
+    def release_inputs(self, instance_nums: list[int]) -> None:
+        """Give back the keyboards and mice routed to the instances that are not running."""
+        for instance_num in instance_nums:
+            process = self.processes.get(instance_num)
+            if process is None or process.poll() is not None:
+                self.input_router.unroute(instance_num)
+
+    def _needs_virtual_joystick(self, profile: Profile, instance_num: int) -> bool:
+        """Check whether an instance has no usable physical joystick."""
+        player_config = (
+            profile.player_configs[instance_num]
+            if profile.player_configs and 0 <= instance_num < len(profile.player_configs)
+            else PlayerInstanceConfig()
+        )
+        device_id = player_config.physical_device_id
+        return not (device_id and device_id.strip() and Path(device_id).is_char_device())
 
     def terminate_instance(self, instance_num: int) -> None:
         """Terminates a single Steam instance gracefully."""
         if instance_num not in self.processes:
             self.logger.warning(f"Attempted to terminate non-existent instance {instance_num}")
             return
+        self._terminate_instances([instance_num])
 
-        process = self.processes[instance_num]
-        self.logger.info(f"Terminating instance {process.pid}...")
+    def _terminate_instances(self, instance_nums: list[int]) -> None:
+        """
+        Terminate several instances at once.
+
+        Every process group is sent SIGTERM up front, then all instances are
+        awaited against a single deadline, so stopping takes as long as the
+        slowest instance rather than the sum of all of them. Instances still
+        running at the deadline are killed.
 
-        if process.poll() is None:
-            # Get the appropriate process/group ID for termination.
-            # For Flatpak, this is the host PGID we captured.
-            # For native, it's the PGID we created.
+        Raises:
+            TwinverseError: If an instance could not be killed.
+        """
+        started_at = time.monotonic()
+        pending: dict[int, subprocess.Popen] = {}
+        stopped: dict[int, float] = {}
+        for instance_num in instance_nums:
+            process = self.processes[instance_num]
+            if process.poll() is not None:
+                stopped[instance_num] = 0.0
+                continue
+            self.logger.info(f"Terminating instance {instance_num} (PID {process.pid})...")
+            # A requested stop is not an exit to report, and the supervisor must not reap the process meanwhile
+            self.supervisor.unwatch(instance_num)
+            pending[instance_num] = process
+            # For Flatpak, this is the host PGID we captured. For native, it's the PGID we created.
             pgid = self.pgids.get(instance_num)
             if pgid:
-                if Utils.is_flatpak():
-                    self.logger.info(f"Sending SIGTERM to host process group {pgid} for instance {instance_num}")
-                    Utils.flatpak_spawn_host(["sh", "-c", f"kill -15 -{pgid}"])
-                else:
-                    try:
-                        self.logger.info(f"Sending SIGTERM to process group {pgid} for instance {instance_num}")
-                        os.killpg(pgid, signal.SIGTERM)
-                    except ProcessLookupError:
-                        self.logger.warning(f"Process group {pgid} not found for instance {instance_num}.")
+                self._signal_group(instance_num, pgid, signal.SIGTERM)
+            else:
+                self.logger.warning(f"No PGID found for instance {instance_num}, cannot send termination signal.")
 
+        deadline = started_at + self.TERMINATE_TIMEOUT
+        while pending:
+            for instance_num, process in list(pending.items()):
+                if process.poll() is not None:
+                    stopped[instance_num] = time.monotonic() - started_at
+                    del pending[instance_num]
+            if not pending or time.monotonic() >= deadline:
+                break
+            time.sleep(self.TERMINATE_POLL_INTERVAL)
+
+        errors = []
+        if pending:
+            self.logger.warning(
+                f"Instances {sorted(pending)} did not terminate after {self.TERMINATE_TIMEOUT}s. Sending SIGKILL."
+            )
+            for instance_num, process in pending.items():
+                pgid = self.pgids.get(instance_num)
                 try:
-                    process.wait(timeout=10)
-                    self.logger.info(f"Instance {instance_num} terminated gracefully.")
-                except subprocess.TimeoutExpired:
-                    self.logger.warning(f"Instance {instance_num} did not terminate after 10s. Sending SIGKILL.")
-                    if Utils.is_flatpak():
-                        try:
-                            Utils.flatpak_spawn_host(["sh", "-c", f"kill -9 -{pgid}"])
-                        except Exception as e:
-                            self.logger.warning(f"Failed to send SIGKILL to host PGID {pgid}: {e}")
-
-                        self.logger.info(f"Instance {instance_num} terminated with SIGKILL.")
-
-                        # This is necessary as a temporary measure for the problem described in:
-                        # https://github.com/ValveSoftware/gamescope/issues/1482
-                        Utils.flatpak_spawn_host(["sh", "-c", "pkill -9 -f winedevice"])
-
+                    if pgid:
+                        self._signal_group(instance_num, pgid, signal.SIGKILL)
                     else:
-                        try:
-                            os.killpg(pgid, signal.SIGKILL)
-                        except ProcessLookupError:
-                            self.logger.warning(
-                                f"Process group {pgid} not found when sending SIGKILL for instance {instance_num}."
-                            )
-                        except PermissionError as e:
-                            self.logger.error(f"Permission denied when sending SIGKILL to process group {pgid}: {e}")
-                            raise TwinverseError(f"Permission denied when terminating instance {instance_num}: {e}")
-
-                        self.logger.info(f"Instance {instance_num} terminated with SIGKILL.")
-
-                        # This is necessary as a temporary measure for the problem described in:
-                        # https://github.com/ValveSoftware/gamescope/issues/1482
-                        subprocess.run(
-                            ["pkill", "-9", "-f", "winedevice"],
-                            capture_output=True,
-                            text=True,
-                            check=False,
-                        )
+                        process.kill()
+                except TwinverseError as e:
+                    errors.append(e)
+
+            # This is necessary as a temporary measure for the problem described in:
+            # https://github.com/ValveSoftware/gamescope/issues/1482
+            if Utils.is_flatpak():
+                Utils.flatpak_spawn_host(["sh", "-c", "pkill -9 -f winedevice"])
             else:
-                self.logger.warning(f"No PGID found for instance {instance_num}, cannot send termination signal.")
+                subprocess.run(["pkill", "-9", "-f", "winedevice"], capture_output=True, text=True, check=False)
+
+            for instance_num, process in pending.items():
+                process.wait()
+                stopped[instance_num] = time.monotonic() - started_at
+                self.logger.info(f"Instance {instance_num} terminated with SIGKILL.")
 
-        if process.poll() is None:
-            process.wait()
+        for instance_num in instance_nums:
+            self.logger.info(
+                "Instance %d stopped after %.2fs%s",
+                instance_num,
+                stopped[instance_num],
+                " (killed)" if instance_num in pending else "",
+                instance=instance_num,
+                phase="terminate",
+                duration_ms=round(stopped[instance_num] * 1000, 1),
+            )
+            self.processes.pop(instance_num, None)
+            self.pids.pop(instance_num, None)
+            self.pgids.pop(instance_num, None)
+            self.readiness.forget(instance_num)
+            self.input_router.unroute(instance_num)
+
+        if errors:
+            raise errors[0]
+
+    def _signal_group(self, instance_num: int, pgid: int, sig: signal.Signals) -> None:
+        """
+        Send a signal to the process group of an instance.
 
-        if instance_num in self.processes:
-            del self.processes[instance_num]
-        if instance_num in self.pids:
-            del self.pids[instance_num]
-        if instance_num in self.pgids:
-            del self.pgids[instance_num]
+        Raises:
+            TwinverseError: If the permission to kill the group was denied.
+        """
+        self.logger.info(f"Sending {sig.name} to process group {pgid} for instance {instance_num}")
+        if Utils.is_flatpak():
+            try:
+                Utils.flatpak_spawn_host(["sh", "-c", f"kill -{int(sig)} -{pgid}"])
+            except Exception as e:
+                self.logger.warning(f"Failed to send {sig.name} to host PGID {pgid}: {e}")
+            return
+        try:
+            os.killpg(pgid, sig)
+        except ProcessLookupError:
+            self.logger.warning(f"Process group {pgid} not found for instance {instance_num}.")
+        except PermissionError as e:
+            self.logger.error(f"Permission denied when sending {sig.name} to process group {pgid}: {e}")
+            raise TwinverseError(f"Permission denied when terminating instance {instance_num}: {e}")
 
     def _prepare_home(self, home_path: Path) -> None:
         """
@@ -369,19 +606,22 @@ class InstanceService:
         # Copy .acf (app manifest) files from the host to the instance.
         # This makes Steam recognize games as "installed" so it can find them
         # in the shared steamapps/common directory.
-        host_steamapps = Path.home() / ".local/share/Steam/steamapps"
+        library = self.library_index.snapshot()
+        host_steamapps = Path(library.host_path) / "steamapps"
         dest_steamapps = sdbx_steam_local / "steamapps"
 
-        if host_steamapps.exists():
-            for acf_file in host_steamapps.glob("*.acf"):
-                dest_file = dest_steamapps / acf_file.name
-                if not dest_file.exists():
-                    try:
-                        shutil.copy(acf_file, dest_file)
-                    except PermissionError as e:
-                        self.logger.warning(f"Permission denied when copying {acf_file.name}: {e}")
-                    except OSError as e:
-                        self.logger.warning(f"OS error when copying {acf_file.name}: {e}")
+        if library.dir_mtimes.get(SteamLibraryIndex.STEAMAPPS) is not None:
+            # Let Steam know about additional library folders the first time it starts
+            host_library_folders = host_steamapps / "libraryfolders.vdf"
+            dest_library_folders = dest_steamapps / "libraryfolders.vdf"
+            if host_library_folders.exists() and not dest_library_folders.exists():
+                try:
+                    shutil.copy(host_library_folders, dest_library_folders)
+                except OSError as e:
+                    self.logger.warning(f"Could not copy {host_library_folders.name}: {e}")
+
+            # Only manifests that changed on the host since the last launch are copied
+            self.manifest_sync.sync(library, dest_steamapps)
         else:
             self.logger.warning(
                 f"Host Steam directory '{host_steamapps}' not found. Game manifests will not be copied to the instance."
@@ -428,8 +668,10 @@ class InstanceService:
             )
             return None
 
-        mouse_path = None
-        keyboard_path = None
+        # Keyboards and mice are routed through per-instance virtual devices, see _route_inputs
+        routed_paths = self.input_router.get_paths(instance_num)
+        mouse_path = routed_paths.get("mouse")
+        keyboard_path = routed_paths.get("keyboard")
         joystick_path = _validate_device(player_config.physical_device_id, "Joystick")
 
         audio_id = player_config.audio_device_id
@@ -452,12 +694,12 @@ class InstanceService:
             self.termination_in_progress = True
             self.logger.info("Starting termination of all instances...")
 
-            # Cleanup virtual joystick
-            if self._virtual_joystick_path:
-                self.virtual_device.destroy_virtual_joystick()
-                self._virtual_joystick_path = None
-                self.logger.info("Virtual joystick destroyed.")
-            self._virtual_joystick_checked = False
+            # Stop following the processes; their exits are expected from now on
+            self.supervisor.stop_all()
+
+            # Cleanup virtual joysticks and input routes
+            self.virtual_device.destroy_all()
+            self.input_router.stop_all()
 
             # Cleanup KDE-specific settings
             if self.kde_manager:
@@ -465,9 +707,10 @@ class InstanceService:
                 self.kde_manager.restore_panel_states()
                 self.logger.info("KDE-specific cleanup complete.")
 
-            for instance_num in list(self.processes.keys()):
-                self.terminate_instance(instance_num)
+            if self.processes:
+                self._terminate_instances(list(self.processes))
 
+            self.instance_logs.stop_all()
             self.logger.info("Instance termination complete.")
             self.pids.clear()
             self.processes.clear()
@@ -0,0 +1,232 @@
+"""
+Instance log module for the Twinverse application.
+
+This module captures the output of the running instances into rotated,
+per-instance log files without passing it through Python.
+"""
+
+import errno
+import fcntl
+import os
+import select
+import struct
+import subprocess
+import termios
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from src.core import Config, Logger
+
+
+class _Capture:
+    """The log file an instance's output pipe is moved into."""
+
+    def __init__(self, instance_num: int, pipe_fd: int, log_fd: int):
+        self.instance_num = instance_num
+        self.pipe_fd = pipe_fd
+        self.log_fd = log_fd
+        self.written = 0
+
+
+class InstanceLogs:
+    """
+    Per-instance log files fed straight from the instances' output pipes.
+
+    Instances write their stdout and stderr into a single pipe each. One pump
+    thread waits on all pipes and moves the data into `steam_instance_<n>.log`
+    with `os.splice`, so it is never copied into Python and an instance can
+    never stall on a full pipe. A log is rotated when it grows past
+    `MAX_BYTES`, and when the instance is launched again, keeping
+    `BACKUP_COUNT` older files. The end of the current log is available for
+    the UI through `tail`.
+    """
+
+    MAX_BYTES = 10 * 1024 * 1024
+    BACKUP_COUNT = 3
+    CHUNK_SIZE = 64 * 1024
+    TAIL_BYTES = 16 * 1024
+
+    def __init__(self, logger: Logger, log_dir: Optional[Path] = None):
+        """Initialize the instance logs."""
+        self._logger = logger
+        self._log_dir = log_dir or Config.LOG_DIR
+        self._captures: Dict[int, _Capture] = {}
+        self._splice = hasattr(os, "splice")
+        self._epoll: Optional[select.epoll] = None
+        self._wake_fds: Optional[Tuple[int, int]] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+
+    def log_path(self, instance_num: int) -> Path:
+        """Return the current log file of an instance."""
+        return self._log_dir / f"steam_instance_{instance_num}.log"
+
+    def capture(self, instance_num: int, process: subprocess.Popen) -> None:
+        """
+        Move the output of a freshly spawned instance into its log file.
+
+        The process must have been started with its stdout as a pipe and its
+        stderr redirected to stdout. The pipe is taken over: `process.stdout`
+        is closed and set to None.
+
+        Args:
+            instance_num: The instance number.
+            process: The spawned process.
+        """
+        pipe_fd = os.dup(process.stdout.fileno())
+        process.stdout.close()
+        process.stdout = None
+        os.set_blocking(pipe_fd, False)
+
+        with self._lock:
+            for previous in [c for c in self._captures.values() if c.instance_num == instance_num]:
+                self._close(previous)
+            try:
+                log_fd = self._open_log(instance_num)
+            except OSError as e:
+                os.close(pipe_fd)
+                self._logger.error(f"Instance {instance_num}: Could not open its log file: {e}")
+                return
+            self._captures[pipe_fd] = _Capture(instance_num, pipe_fd, log_fd)
+            self._ensure_pump()
+            self._epoll.register(pipe_fd, select.EPOLLIN)
+
+    def tail(self, instance_num: int, max_bytes: int = TAIL_BYTES) -> str:
+        """
+        Return the last lines an instance wrote, at most `max_bytes` of them.
+
+        Args:
+            instance_num: The instance number.
+            max_bytes: Upper bound on the amount of output returned.
+
+        Returns:
+            The end of the current log, starting at a line boundary.
+        """
+        try:
+            with open(self.log_path(instance_num), "rb") as f:
+                size = f.seek(0, os.SEEK_END)
+                f.seek(max(0, size - max_bytes))
+                data = f.read(max_bytes)
+        except OSError:
+            return ""
+        if len(data) < size and b"\n" in data:
+            data = data.split(b"\n", 1)[1]
+        return data.decode(errors="replace")
+
+    def stop_all(self) -> None:
+        """Move the remaining buffered output into the logs and stop the pump."""
+        thread = self._thread
+        if thread:
+            self._stop_event.set()
+            os.write(self._wake_fds[1], b"\0")
+            thread.join(timeout=1)
+            self._thread = None
+
+        with self._lock:
+            for capture in list(self._captures.values()):
+                self._pump(capture)
+                self._close(capture)
+            if self._epoll:
+                self._epoll.close()
+                for fd in self._wake_fds:
+                    os.close(fd)
+                self._epoll, self._wake_fds = None, None
+
+    def _ensure_pump(self) -> None:
+        """Start the pump thread if it is not running; the lock must be held."""
+        if self._thread and self._thread.is_alive():
+            return
+        if self._epoll is None:
+            self._epoll = select.epoll()
+            self._wake_fds = os.pipe()
+            self._epoll.register(self._wake_fds[0], select.EPOLLIN)
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._pump_loop, args=(self._epoll, self._wake_fds[0]), name="instance-logs", daemon=True
+        )
+        self._thread.start()
+
+    def _pump_loop(self, epoll: select.epoll, wake_fd: int) -> None:
+        """Move output into the logs as it arrives, until stopped."""
+        while not self._stop_event.is_set():
+            try:
+                ready = epoll.poll()
+            except InterruptedError:
+                continue
+            for fd, _ in ready:
+                if fd == wake_fd:
+                    continue
+                with self._lock:
+                    capture = self._captures.get(fd)
+                    if capture and not self._pump(capture):
+                        self._close(capture)
+
+    def _pump(self, capture: _Capture) -> bool:
+        """
+        Move the pending output of an instance into its log; the lock must be held.
+
+        Returns:
+            False once the instance closed its output.
+        """
+        while True:
+            # Only rotate when there is more output, so the current log is never left empty
+            if capture.written >= self.MAX_BYTES and self._pending_bytes(capture.pipe_fd):
+                capture.written = 0
+                try:
+                    log_fd = self._open_log(capture.instance_num)
+                except OSError as e:
+                    # Keep writing to the current log rather than stalling the instance on a full pipe
+                    self._logger.error(f"Instance {capture.instance_num}: Could not rotate its log: {e}")
+                else:
+                    os.close(capture.log_fd)
+                    capture.log_fd = log_fd
+            try:
+                if self._splice:
+                    moved = os.splice(capture.pipe_fd, capture.log_fd, self.CHUNK_SIZE)
+                else:
+                    moved = os.write(capture.log_fd, os.read(capture.pipe_fd, self.CHUNK_SIZE))
+            except BlockingIOError:
+                return True
+            except OSError as e:
+                if self._splice and e.errno == errno.EINVAL:
+                    # The log file system does not support splicing
+                    self._splice = False
+                    continue
+                self._logger.error(f"Instance {capture.instance_num}: Could not write its log: {e}")
+                return False
+            if moved == 0:
+                return False
+
+            capture.written += moved
+
+    def _close(self, capture: _Capture) -> None:
+        """Stop capturing the output of an instance; the lock must be held."""
+        if self._captures.pop(capture.pipe_fd, None) is None:
+            return
+        if self._epoll:
+            try:
+                self._epoll.unregister(capture.pipe_fd)
+            except (OSError, ValueError):
+                pass
+        os.close(capture.pipe_fd)
+        os.close(capture.log_fd)
+
+    @staticmethod
+    def _pending_bytes(pipe_fd: int) -> int:
+        """Return the amount of output waiting in a pipe."""
+        return struct.unpack("i", fcntl.ioctl(pipe_fd, termios.FIONREAD, b"\0" * 4))[0]
+
+    def _open_log(self, instance_num: int) -> int:
+        """Rotate the log of an instance and open a new, empty one."""
+        self._log_dir.mkdir(parents=True, exist_ok=True)
+        path = self.log_path(instance_num)
+        if path.exists() and path.stat().st_size > 0:
+            for index in range(self.BACKUP_COUNT - 1, 0, -1):
+                backup = path.with_name(f"{path.name}.{index}")
+                if backup.exists():
+                    backup.replace(path.with_name(f"{path.name}.{index + 1}"))
+            path.replace(path.with_name(f"{path.name}.1"))
+        # No O_APPEND: splice cannot write to files opened in append mode
+        return os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_CLOEXEC, 0o644)
@@ -5,173 +5,358 @@ This module provides functionality to manage KDE-specific features such as
 KWin scripts for window management and panel visibility control.
 """
 
+import concurrent.futures
+import hashlib
+import json
 import os
+import threading
 from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional
 
-import pydbus
+from gi.repository import GLib
 
-from src.core import Logger
+from src.core import DBusCallError, Logger, Utils
 from src.core.config import Config
 from src.models import Profile
 
+from .dbus_client import DBusClient
 
-class KdeManager:
-    """Manages KDE-specific features such as KWin scripts and panel visibility."""
+if TYPE_CHECKING:
+    from .device_manager import DeviceManager
 
-    def __init__(self, logger: Logger):
-        """Initialize the KDE manager with necessary components."""
-        self.logger = logger
-        self.original_panel_states: dict[int, str] = {}
-        self.kwin_script_id = None
-        self.session_bus = None
-        self._init_dbus()
 
-    def _init_dbus(self):
-        """Initialize D-Bus connection."""
-        try:
-            self.session_bus = pydbus.SessionBus()
-        except Exception as e:
-            self.logger.error(f"Failed to connect to session D-Bus: {e}")
-
-    def start_kwin_script(self, profile: Profile):
-        """Start the appropriate KWin script using D-Bus."""
-        if not self.is_kde_desktop() or not self.session_bus:
-            self.logger.warning("Not a KDE desktop or D-Bus unavailable, skipping KWin script.")
-            return
+class _LoadedScript(NamedTuple):
+    """A KWin script loaded by the KDE manager."""
 
-        # Determine script name based on profile
-        if not profile.is_splitscreen_mode or not profile.splitscreen:
-            self.logger.info("Fullscreen mode, loading KWin script.")
-            script_name = "kwin_gamescope.js"
-        else:
-            orientation = profile.splitscreen.orientation
-            script_name = "kwin_gamescope_vertical.js" if orientation == "vertical" else "kwin_gamescope_horizontal.js"
+    script_id: int
+    plugin_name: str
+    path: Path
 
-        script_path = Path(__file__).parent.parent.parent / "res" / "kwin" / script_name
 
-        if not script_path.exists():
-            self.logger.error(f"KWin script not found at {script_path}")
-            return
-
-        shared_temp_path = None
-        temp_script_path = None
-
-        try:
-            # Read script content
-            script_content = script_path.read_text()
+class _KWinLayoutService:
+    """D-Bus object the KWin script reads the session layout from."""
 
-            # Create a temporary file accessible to KWin (in XDG cache dir)
-            cache_dir = Config.CACHE_DIR
-            shared_temp_path = cache_dir / f"kwin_script_{os.getpid()}_{script_name}"
-            with open(shared_temp_path, "w") as f:
-                f.write(script_content)
+    INTROSPECTION = """
+    <node>
+      <interface name="io.github.mall0r.Twinverse.KWinLayout">
+        <method name="GetLayout">
+          <arg type="s" name="layout" direction="out"/>
+        </method>
+      </interface>
+    </node>
+    """
 
-            # Store the temp path for cleanup
-            self._kwin_script_temp_path = shared_temp_path
+    PATH = "/io/github/mall0r/Twinverse/KWinLayout"
+    INTERFACE = "io.github.mall0r.Twinverse.KWinLayout"
 
-            # Load and start script via D-Bus
-            kwin_scripting = self.session_bus.get("org.kde.KWin", "/Scripting")
-            self.logger.info(f"Loading KWin script from: {shared_temp_path}")
+    def __init__(self):
+        """Initialize an empty layout."""
+        self._generation = 0
+        self._keep_above = False
+        self._slots: List[Dict[str, int]] = []
+        self._lock = threading.Lock()
 
-            self.kwin_script_id = kwin_scripting.loadScript(str(shared_temp_path))
-            kwin_scripting.start()
+    def update(self, slots: List[Dict[str, int]], keep_above: bool) -> bool:
+        """Replace the layout, returning whether it changed."""
+        with self._lock:
+            if slots == self._slots and keep_above == self._keep_above:
+                return False
+            self._generation += 1
+            self._slots = slots
+            self._keep_above = keep_above
+            return True
 
-            self.logger.info(f"KWin script loaded and started with ID: {self.kwin_script_id}")
+    def get_layout(self) -> str:
+        """Return the layout as JSON."""
+        with self._lock:
+            return json.dumps({"generation": self._generation, "keepAbove": self._keep_above, "slots": self._slots})
 
-        except Exception as e:
-            self.logger.error(f"Failed to load KWin script: {e}")
 
-            # Cleanup only if files were created
-            if shared_temp_path and shared_temp_path.exists():
-                shared_temp_path.unlink()
-            if temp_script_path and temp_script_path.exists():
-                temp_script_path.unlink()
+class KdeManager:
+    """Manages KDE-specific features such as KWin scripts and panel visibility."""
 
-    def stop_kwin_script(self):
-        """Stop and unload the KWin script."""
-        if not self.kwin_script_id or not self.session_bus:
-            self.logger.info("No KWin script ID to stop or D-Bus unavailable.")
-            return
+    KWIN_SCRIPT_TEMPLATE = Path(__file__).parent.parent.parent / "res" / "kwin" / "kwin_gamescope.js"
+    KWIN_SCRIPTING = ("org.kde.KWin", "/Scripting", "org.kde.kwin.Scripting")
+    PLASMASHELL = ("org.kde.plasmashell", "/PlasmaShell", "org.kde.PlasmaShell")
+
+    # Prints the id and the visibility every panel had before it was set to dodge windows
+    DODGE_PANELS_SCRIPT = (
+        "print(JSON.stringify(panels().map(function (panel) {"
+        "  var state = {id: panel.id, hiding: panel.hiding};"
+        "  panel.hiding = 'dodgewindows';"
+        "  return state;"
+        "})));"
+    )
+
+    def __init__(
+        self,
+        logger: Logger,
+        device_manager: Optional["DeviceManager"] = None,
+        dbus_client: Optional[DBusClient] = None,
+    ):
+        """Initialize the KDE manager with necessary components."""
+        from .device_manager import DeviceManager
 
+        self.logger = logger
+        self.device_manager = device_manager or DeviceManager()
+        self.dbus = dbus_client or DBusClient(logger)
+        self.original_panel_states: dict[str, Optional[str]] = self._load_panel_states()
+        self._layout_service = _KWinLayoutService()
+        self._layout_registration: Optional[int] = None
+        self._loaded_scripts: Dict[str, _LoadedScript] = {}
+        self._script_lock = threading.Lock()
+
+    def _export_layout(self) -> bool:
+        """Export the KWin layout on the session bus, if it is not exported yet."""
+        if self._layout_registration is not None:
+            return True
+        if not self.dbus.connection:
+            return False
         try:
-            kwin_scripting = self.session_bus.get("org.kde.KWin", "/Scripting")
-            self.logger.info(f"Unloading KWin script with ID: {self.kwin_script_id}")
-            kwin_scripting.unloadScript(str(self.kwin_script_id))
-
-            # Cleanup the temporary file
-            if hasattr(self, "_kwin_script_temp_path") and self._kwin_script_temp_path:
-                if os.path.exists(self._kwin_script_temp_path):
-                    os.unlink(self._kwin_script_temp_path)
+            self._layout_registration = self.dbus.register_object(
+                _KWinLayoutService.PATH,
+                _KWinLayoutService.INTROSPECTION,
+                {"GetLayout": self._layout_service.get_layout},
+            )
+        except DBusCallError as e:
+            self.logger.error(f"Failed to export the KWin layout on D-Bus: {e}")
+            return False
+        return True
+
+    def _unexport_layout(self) -> None:
+        """Stop exporting the KWin layout on the session bus."""
+        if self._layout_registration is not None:
+            self.dbus.unregister_object(self._layout_registration)
+            self._layout_registration = None
+
+    def start_kwin_script(self, profile: Profile, instance_nums: Optional[List[int]] = None):
+        """
+        Publish the session layout to KWin, loading the placement script if it is not running yet.
+
+        The script reads the layout over D-Bus, so a script that is already loaded
+        is reused and only sees the new layout. Safe to call from any thread;
+        starting and stopping the script never overlap.
+
+        Args:
+            profile: The profile configuration.
+            instance_nums: The instances of the session; defaults to the profile's session.
+        """
+        with self._script_lock:
+            if not self.is_kde_desktop() or not self.dbus.connection or not self._export_layout():
+                self.logger.warning("Not a KDE desktop or D-Bus unavailable, skipping KWin script.")
+                return
+
+            splitscreen = profile.is_splitscreen_mode and profile.splitscreen is not None
+            if self._layout_service.update(self._session_slots(profile, instance_nums), splitscreen):
+                self.logger.info("KWin layout updated.")
+
+            script_content = self.build_kwin_script()
+            if script_content is None:
+                return
+            digest = hashlib.sha256(script_content.encode()).hexdigest()
+
+            try:
+                loaded = self._loaded_scripts.get(digest)
+                if loaded and self._call_kwin("isScriptLoaded", "s", loaded.plugin_name):
+                    self.logger.info(f"Reusing KWin script with ID: {loaded.script_id}")
+                    return
+                self._unload_scripts()
+            except DBusCallError as e:
+                self.logger.error(f"Failed to query KWin scripts: {e}")
+                return
+
+            plugin_name = f"twinverse_{digest[:16]}"
+            shared_temp_path = Config.CACHE_DIR / f"kwin_script_{os.getpid()}_{digest[:16]}.js"
+
+            try:
+                # Write the script where KWin can read it (in XDG cache dir)
+                with open(shared_temp_path, "w") as f:
+                    f.write(script_content)
+
+                self.logger.info(f"Loading KWin script from: {shared_temp_path}")
+                script_id = self._call_kwin("loadScript", "ss", str(shared_temp_path), plugin_name)
+                self._call_kwin("start")
+
+                self._loaded_scripts[digest] = _LoadedScript(script_id, plugin_name, shared_temp_path)
+                self.logger.info(f"KWin script loaded and started with ID: {script_id}")
+
+            except (OSError, DBusCallError) as e:
+                self.logger.error(f"Failed to load KWin script: {e}")
+                shared_temp_path.unlink(missing_ok=True)
+
+    def build_kwin_script(self) -> Optional[str]:
+        """
+        Build the KWin placement script.
+
+        The script only embeds where to read the layout from on D-Bus, so its
+        content stays the same for the lifetime of the application.
+
+        Returns:
+            The script source, or None if the template could not be read.
+        """
+        try:
+            template = self.KWIN_SCRIPT_TEMPLATE.read_text()
+        except OSError as e:
+            self.logger.error(f"KWin script not found at {self.KWIN_SCRIPT_TEMPLATE}: {e}")
+            return None
 
-            self.logger.info("KWin script unloaded successfully.")
-            self.kwin_script_id = None
+        replacements = {
+            "__TWINVERSE_DBUS_SERVICE__": self.dbus.unique_name,
+            "__TWINVERSE_DBUS_PATH__": _KWinLayoutService.PATH,
+            "__TWINVERSE_DBUS_INTERFACE__": _KWinLayoutService.INTERFACE,
+        }
+        for placeholder, value in replacements.items():
+            template = template.replace(placeholder, json.dumps(value))
+        return template
 
-        except Exception as e:
-            self.logger.error(f"Failed to stop KWin script: {e}")
+    def stop_kwin_script(self):
+        """Stop and unload the KWin script, and stop exporting the layout it reads."""
+        with self._script_lock:
+            if not self._loaded_scripts or not self.dbus.connection:
+                self.logger.info("No KWin script to stop or D-Bus unavailable.")
+            else:
+                try:
+                    self._unload_scripts()
+                    self.logger.info("KWin script unloaded successfully.")
+                except DBusCallError as e:
+                    self.logger.error(f"Failed to stop KWin script: {e}")
+            self._unexport_layout()
+
+    def _unload_scripts(self) -> None:
+        """Unload every KWin script loaded by this manager and remove their files."""
+        for digest, loaded in list(self._loaded_scripts.items()):
+            self.logger.info(f"Unloading KWin script with ID: {loaded.script_id}")
+            self._call_kwin("unloadScript", "s", loaded.plugin_name)
+            loaded.path.unlink(missing_ok=True)
+            del self._loaded_scripts[digest]
+
+    def _session_slots(self, profile: Profile, instance_nums: Optional[List[int]]) -> List[Dict[str, int]]:
+        """Return the geometry of every instance of the session, in instance order."""
+        layout = self.device_manager.get_session_layout(profile, instance_nums)
+        return [geometry._asdict() for geometry in sorted(layout.values(), key=lambda geometry: geometry.instance_num)]
 
     def is_kde_desktop(self):
         """Check if the current desktop environment is KDE."""
         return os.environ.get("XDG_CURRENT_DESKTOP") == "KDE"
 
+    def _call_kwin(self, method: str, signature: str = "", *args):
+        """Call a method of the KWin scripting interface, waiting for the answer."""
+        parameters = GLib.Variant(f"({signature})", args) if signature else None
+        return self.dbus.call_sync(*self.KWIN_SCRIPTING, method, parameters)
+
     def _run_plasmashell_script(self, script):
         """Run a Plasma Shell script using D-Bus."""
-        if not self.session_bus:
+        if not self.dbus.connection:
             return None
         try:
-            plasmashell = self.session_bus.get("org.kde.plasmashell", "/PlasmaShell")
-            result = plasmashell.evaluateScript(script)
-            return result
-        except Exception as e:
+            return self.dbus.call_sync(*self.PLASMASHELL, "evaluateScript", GLib.Variant("(s)", (script,)))
+        except DBusCallError as e:
             self.logger.error(f"Error executing plasmashell script: {e}")
             return None
 
-    def get_panel_count(self):
-        """Get the number of panels."""
-        script = "print(panels().length)"
-        count_str = self._run_plasmashell_script(script)
-        try:
-            return int(count_str) if count_str and count_str.isdigit() else 0
-        except ValueError:
-            return 0
-
-    def save_panel_states(self):
-        """Save the current visibility state of all panels."""
-        if not self.is_kde_desktop() or not self.session_bus:
+    def save_and_dodge_panels(self):
+        """Save the visibility state of all panels and set them to 'Dodge Windows' in a single call."""
+        if not self.is_kde_desktop() or not self.dbus.connection:
             return
 
-        panel_count = self.get_panel_count()
-        if panel_count == 0:
-            self.logger.info("No KDE panels found.")
-            return
+        panels = self._run_panel_script(self.DODGE_PANELS_SCRIPT)
+        # States saved by an earlier launch that was not restored yet are the original ones
+        if not self.original_panel_states:
+            self._store_panel_states(panels)
+        else:
+            # A new dict, so a recovery still waiting for plasmashell does not forget the states this launch needs
+            self.original_panel_states = dict(self.original_panel_states)
+        if panels is not None:
+            self.logger.info(f"Set {len(panels)} panel(s) to 'Dodge Windows'")
 
-        self.original_panel_states = {}
-        for i in range(panel_count):
-            script = f"print(panels()[{i}].hiding)"
-            state = self._run_plasmashell_script(script)
-            if state is not None:
-                self.original_panel_states[i] = state
-                self.logger.info(f"Saved panel {i} state: {state}")
-
-    def set_panels_dodge_windows(self):
-        """Set all panels to 'Dodge Windows' visibility."""
-        if not self.is_kde_desktop() or not self.session_bus:
+    def restore_panel_states(self):
+        """Restore the visibility state of all panels to their original state."""
+        if not self.is_kde_desktop() or not self.dbus.connection or not self.original_panel_states:
             return
 
-        panel_count = self.get_panel_count()
-        for i in range(panel_count):
-            script = f"panels()[{i}].hiding = 'dodgewindows'"
-            self._run_plasmashell_script(script)
-            self.logger.info(f"Set panel {i} to 'Dodge Windows'")
+        if self._run_panel_script(self._restore_panels_script()) is not None:
+            self._forget_panel_states()
 
-    def restore_panel_states(self):
-        """Restore the visibility state of all panels to their original state."""
-        if not self.is_kde_desktop() or not self.session_bus or not self.original_panel_states:
+    def recover_panel_states(self):
+        """
+        Restore panel states left behind by a previous run that did not exit cleanly.
+
+        Called from the main thread at startup, so the script runs asynchronously.
+        """
+        if not self.is_kde_desktop() or not self.dbus.connection or not self.original_panel_states:
             return
 
-        for i, state in self.original_panel_states.items():
-            # The 'null' state needs to be handled as a special case
-            script_state = f"'{state}'" if state != "null" else "null"
-            script = f"panels()[{i}].hiding = {script_state}"
-            self._run_plasmashell_script(script)
-            self.logger.info(f"Restored panel {i} to state: {state}")
+        self.logger.info("Found panel states from a previous session, restoring them.")
+        states = self.original_panel_states
+        future = self.dbus.call(
+            *self.PLASMASHELL, "evaluateScript", GLib.Variant("(s)", (self._restore_panels_script(),))
+        )
+        future.add_done_callback(lambda done: self._on_panels_recovered(done, states))
+
+    def _on_panels_recovered(self, future: concurrent.futures.Future, states: dict[str, Optional[str]]):
+        """Forget the recovered panel states once plasmashell applied them, unless a launch took them over."""
+        try:
+            future.result()
+        except DBusCallError as e:
+            self.logger.error(f"Error executing plasmashell script: {e}")
+            return
+        if self.original_panel_states is not states:
+            self.logger.info("Panel states were taken over by a launch, keeping them.")
+            return
+        self._forget_panel_states()
+
+    def _restore_panels_script(self) -> str:
+        """Return the script restoring the saved state of every panel, by panel id."""
+        return (
+            f"var states = {json.dumps(self.original_panel_states)};"
+            "panels().forEach(function (panel) {"
+            "  if (states.hasOwnProperty(panel.id)) { panel.hiding = states[panel.id]; }"
+            "});"
+            "print(JSON.stringify([]));"
+        )
+
+    def _forget_panel_states(self):
+        """Drop the saved panel states after they were restored."""
+        self.logger.info(f"Restored {len(self.original_panel_states)} panel(s): {self.original_panel_states}")
         self.original_panel_states = {}
+        self._panel_states_path().unlink(missing_ok=True)
+
+    def _store_panel_states(self, panels: Optional[list]):
+        """Remember the original panel states, in memory and on disk."""
+        if panels is None:
+            return
+        if not panels:
+            self.logger.info("No KDE panels found.")
+            return
+
+        self.original_panel_states = {str(panel["id"]): panel["hiding"] for panel in panels}
+        self.logger.info(f"Saved {len(panels)} panel state(s): {self.original_panel_states}")
+        try:
+            Utils.write_atomic(self._panel_states_path(), json.dumps(self.original_panel_states))
+        except OSError as e:
+            self.logger.warning(f"Could not persist panel states: {e}")
+
+    def _load_panel_states(self) -> dict[str, Optional[str]]:
+        """Load the panel states persisted by a previous run, if any."""
+        try:
+            states = json.loads(self._panel_states_path().read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        return states if isinstance(states, dict) else {}
+
+    @staticmethod
+    def _panel_states_path() -> Path:
+        """Return the file the original panel states are persisted in."""
+        return Config.CACHE_DIR / "panel_states.json"
+
+    def _run_panel_script(self, script: str) -> Optional[list]:
+        """Run a Plasma Shell script that prints a JSON list of panels."""
+        output = self._run_plasmashell_script(script)
+        if output is None:
+            return None
+        try:
+            panels = json.loads(output)
+        except ValueError:
+            self.logger.error(f"Unexpected output from plasmashell script: {output!r}")
+            return None
+        return panels if isinstance(panels, list) else None
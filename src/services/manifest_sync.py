@@ -0,0 +1,131 @@
+"""
+Manifest sync module for the Twinverse application.
+
+This module keeps the app manifests of an instance home in sync with the
+host Steam library, copying only what changed since the last sync.
+"""
+
+import fcntl
+import filecmp
+import json
+import os
+import shutil
+from pathlib import Path
+
+from src.core import Logger
+from src.models import SteamLibrary
+
+
+class ManifestSync:
+    """
+    Incrementally syncs host app manifests into an instance's `steamapps`.
+
+    The size and modification time of every host manifest copied into an
+    instance are recorded in a state file next to the copies. A manifest is
+    copied again only when the host version changed, and removed from the
+    instance once the game is uninstalled on the host. Manifests of games
+    installed from within the instance are never touched.
+
+    Copies are reflinked when the filesystem supports it. Hard links are not
+    used because Steam may rewrite a manifest in place, which would also
+    modify the host copy.
+    """
+
+    STATE_FILE = ".twinverse_manifests.json"
+    FICLONE = 0x40049409
+
+    def __init__(self, logger: Logger):
+        """Initialize the manifest sync."""
+        self._logger = logger
+
+    def sync(self, library: SteamLibrary, dest_steamapps: Path) -> None:
+        """
+        Sync the host app manifests into an instance's `steamapps` directory.
+
+        Args:
+            library: Snapshot of the host Steam library.
+            dest_steamapps: The `steamapps` directory of the instance.
+        """
+        host_steamapps = Path(library.host_path) / "steamapps"
+        state_path = dest_steamapps / self.STATE_FILE
+        previous = self._load_state(state_path)
+        state: dict[str, list[int]] = {}
+        copied = removed = 0
+
+        for app_id, manifest in library.manifests.items():
+            host_file = host_steamapps / manifest.file_name
+            dest_file = dest_steamapps / manifest.file_name
+            signature = [manifest.size, manifest.mtime_ns]
+
+            if dest_file.exists():
+                if previous.get(app_id) == signature:
+                    state[app_id] = signature
+                    continue
+                # Copies made before the state file existed are adopted when they still match the host.
+                if app_id not in previous and self._same_content(host_file, dest_file):
+                    state[app_id] = signature
+                    continue
+
+            try:
+                self._copy(host_file, dest_file)
+            except OSError as e:
+                self._logger.warning(f"Could not copy {manifest.file_name}: {e}")
+                continue
+            state[app_id] = signature
+            copied += 1
+
+        for app_id in previous.keys() - library.manifests.keys():
+            try:
+                (dest_steamapps / f"appmanifest_{app_id}.acf").unlink()
+                removed += 1
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                self._logger.warning(f"Could not remove the manifest of uninstalled app {app_id}: {e}")
+                state[app_id] = previous[app_id]
+
+        if state != previous:
+            self._save_state(state_path, state)
+        if copied or removed:
+            self._logger.info(f"Manifests synced into {dest_steamapps}: {copied} copied, {removed} removed.")
+
+    def _copy(self, source: Path, destination: Path) -> None:
+        """Copy a file atomically, reflinking it when the filesystem allows."""
+        tmp_path = destination.with_name(f".{destination.name}.tmp")
+        try:
+            with open(source, "rb") as src, open(tmp_path, "wb") as dst:
+                try:
+                    fcntl.ioctl(dst.fileno(), self.FICLONE, src.fileno())
+                except OSError:
+                    shutil.copyfileobj(src, dst)
+            shutil.copystat(source, tmp_path)
+            os.replace(tmp_path, destination)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    @staticmethod
+    def _same_content(first: Path, second: Path) -> bool:
+        """Compare the content of two files."""
+        try:
+            return filecmp.cmp(first, second, shallow=False)
+        except OSError:
+            return False
+
+    def _load_state(self, state_path: Path) -> dict[str, list[int]]:
+        """Load the manifests recorded by the previous sync."""
+        try:
+            with open(state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return state if isinstance(state, dict) else {}
+
+    def _save_state(self, state_path: Path, state: dict[str, list[int]]) -> None:
+        """Record the manifests copied by this sync."""
+        try:
+            tmp_path = state_path.with_name(f"{state_path.name}.tmp")
+            tmp_path.write_text(json.dumps(state), encoding="utf-8")
+            tmp_path.replace(state_path)
+        except OSError as e:
+            self._logger.warning(f"Could not save the manifest sync state: {e}")
@@ -0,0 +1,141 @@
+"""
+Monitor topology module for the Twinverse application.
+
+This module keeps a snapshot of the connected monitors so geometry queries
+made while launching instances are answered without asking the display
+server again.
+"""
+
+import threading
+from typing import Callable, Optional, Union
+
+from screeninfo import ScreenInfoError, get_monitors
+
+from src.core import Logger
+
+MonitorInfo = dict[str, Union[int, float, bool, str, None]]
+
+
+class MonitorTopology:
+    """
+    Snapshot of the connected monitors.
+
+    The monitors are queried once and the snapshot is reused until it is
+    invalidated, typically when the display server reports that monitors
+    were added, removed or reconfigured. Every monitor is described by its
+    'id', 'name', 'x', 'y', 'width', 'height', 'refresh_rate' (Hz, None if
+    unknown) and 'is_primary'.
+
+    The refresh rate is not exposed by `screeninfo`; it is taken from the
+    output details last passed to `update`, matched by connector name or
+    position.
+    """
+
+    def __init__(self, logger: Logger):
+        """Initialize the monitor topology."""
+        self._logger = logger
+        self._monitors: Optional[list[MonitorInfo]] = None
+        self._output_details: list[dict] = []
+        self._subscribers: list[Callable[[list[MonitorInfo]], None]] = []
+        self._lock = threading.Lock()
+
+    def snapshot(self) -> list[MonitorInfo]:
+        """
+        Return the connected monitors, querying the display server only if needed.
+
+        The returned list must not be modified.
+        """
+        with self._lock:
+            if self._monitors is None:
+                self._monitors = self._query()
+            return self._monitors
+
+    def invalidate(self) -> None:
+        """Drop the snapshot so the next query reads the monitors again."""
+        with self._lock:
+            self._monitors = None
+
+    def update(self, output_details: Optional[list[dict]] = None) -> list[MonitorInfo]:
+        """
+        Handle a display configuration change.
+
+        Args:
+            output_details: Optional details reported by the toolkit for each
+                output, as dictionaries with 'connector', 'x', 'y' and
+                'refresh_rate' keys.
+
+        Returns:
+            The new list of monitors.
+        """
+        monitors = self._query(output_details)
+        with self._lock:
+            if output_details is not None:
+                self._output_details = output_details
+            changed = monitors != self._monitors
+            self._monitors = monitors
+            subscribers = list(self._subscribers)
+
+        if changed:
+            self._logger.info(
+                "Monitor topology: "
+                + ", ".join(
+                    f"{m['name'] or m['id']} {m['width']}x{m['height']}+{m['x']}+{m['y']}"
+                    + (f"@{m['refresh_rate']:g}Hz" if m["refresh_rate"] else "")
+                    for m in monitors
+                )
+            )
+            for callback in subscribers:
+                try:
+                    callback(monitors)
+                except Exception as e:
+                    self._logger.error(f"Error in monitor topology subscriber: {e}")
+        return monitors
+
+    def subscribe(self, callback: Callable[[list[MonitorInfo]], None]) -> None:
+        """Register a callback for monitor changes."""
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[list[MonitorInfo]], None]) -> None:
+        """Remove a previously registered callback."""
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def _query(self, output_details: Optional[list[dict]] = None) -> list[MonitorInfo]:
+        """Read the monitors from the display server."""
+        if output_details is None:
+            output_details = self._output_details
+
+        try:
+            raw_monitors = get_monitors()
+        except ScreenInfoError as e:
+            self._logger.error(f"Could not enumerate monitors: {e}")
+            return []
+
+        monitors = []
+        for i, monitor in enumerate(raw_monitors):
+            monitors.append(
+                {
+                    "id": i,
+                    "name": monitor.name,
+                    "x": monitor.x,
+                    "y": monitor.y,
+                    "width": monitor.width,
+                    "height": monitor.height,
+                    "refresh_rate": self._refresh_rate_for(monitor.name, monitor.x, monitor.y, output_details),
+                    "is_primary": bool(monitor.is_primary),
+                }
+            )
+        return monitors
+
+    @staticmethod
+    def _refresh_rate_for(name: Optional[str], x: int, y: int, output_details: list[dict]) -> Optional[float]:
+        """Find the refresh rate of a monitor in the toolkit's output details."""
+        for details in output_details:
+            if name and details.get("connector") == name:
+                return details.get("refresh_rate")
+        for details in output_details:
+            if (details.get("x"), details.get("y")) == (x, y):
+                return details.get("refresh_rate")
+        return None
@@ -0,0 +1,157 @@
+"""
+Mount planner module for the Twinverse application.
+
+This module decides how the host Steam library is bind-mounted into the
+sandbox of each instance, keeping the number of bwrap arguments (and mount
+syscalls) small even for very large libraries.
+"""
+
+import threading
+from pathlib import Path
+from typing import List, Optional
+
+from src.core import Logger
+from src.models import Profile, SteamLibrary
+
+from .steam_library import SteamLibraryIndex
+
+
+class MountPlanner:
+    """
+    Plans the bind mounts that share the host Steam library with an instance.
+
+    Game folders in ``steamapps/common`` can be shared in three ways:
+
+    - ``shared``: the whole ``common`` directory is bound once.
+    - ``allowlist``: only the folders of the games listed in the profile are bound.
+    - ``per_folder``: every game folder is bound on its own.
+
+    In ``auto`` mode the planner uses the allowlist when one is configured,
+    a single shared bind for large libraries as long as the instance has no
+    games installed on its own, and per-folder binds otherwise.
+    """
+
+    MODES = ("auto", "shared", "allowlist", "per_folder")
+    SHARED_THRESHOLD = 200
+    IGNORED_COMPAT_TOOLS = frozenset({"LegacyRuntime"})
+
+    def __init__(self, logger: Logger, library_index: Optional[SteamLibraryIndex] = None):
+        """Initialize the mount planner."""
+        self._logger = logger
+        self.library_index = library_index or SteamLibraryIndex(logger)
+        self._dir_cache: dict[Path, tuple[int, list[str]]] = {}
+        self._lock = threading.Lock()
+
+    def build_mount_args(self, profile: Profile, instance_home: Path, sandbox_home: Path) -> List[str]:
+        """
+        Build the bwrap arguments that expose the host Steam library to an instance.
+
+        Args:
+            profile: The profile configuration.
+            instance_home: The isolated home directory of the instance on the host.
+            sandbox_home: The path the instance home is mounted at inside the sandbox.
+
+        Returns:
+            The list of bwrap arguments.
+        """
+        library = self.library_index.snapshot()
+        sandbox_steam_path = sandbox_home / ".local/share/Steam"
+        mode = self._resolve_mode(profile, instance_home, library)
+
+        args = self._game_mount_args(mode, profile, library, sandbox_steam_path)
+        args.extend(self._compat_tool_mount_args(library, sandbox_steam_path))
+        args.extend(self._library_folder_mount_args(library, sandbox_home))
+
+        self._logger.info(f"Library mounts for {instance_home.name}: mode '{mode}', {len(args) // 3} bind(s).")
+        return args
+
+    def _resolve_mode(self, profile: Profile, instance_home: Path, library: SteamLibrary) -> str:
+        """Return the mount mode to use for an instance given a library snapshot."""
+        mode = profile.library_mount_mode
+        if mode != "auto":
+            return mode
+
+        if profile.library_app_ids:
+            return "allowlist"
+
+        if len(library.games) > self.SHARED_THRESHOLD and not self._has_local_games(instance_home, library.games):
+            return "shared"
+        return "per_folder"
+
+    def _game_mount_args(
+        self, mode: str, profile: Profile, library: SteamLibrary, sandbox_steam_path: Path
+    ) -> List[str]:
+        """Build the bind arguments for the game folders in `steamapps/common`."""
+        host_common = Path(library.host_path) / "steamapps/common"
+        sandbox_common = sandbox_steam_path / "steamapps/common"
+        if library.dir_mtimes.get(SteamLibraryIndex.COMMON) is None:
+            return []
+
+        if mode == "shared":
+            return ["--bind", str(host_common), str(sandbox_common)]
+
+        if mode == "allowlist":
+            folders = []
+            for app_id in profile.library_app_ids:
+                install_dir = library.install_dir(app_id)
+                if install_dir:
+                    folders.append(install_dir)
+                else:
+                    self._logger.warning(f"App {app_id} is not installed on the host, it will not be shared.")
+        else:
+            folders = library.games
+
+        args = []
+        for folder in folders:
+            args.extend(["--bind", str(host_common / folder), str(sandbox_common / folder)])
+        return args
+
+    def _compat_tool_mount_args(self, library: SteamLibrary, sandbox_steam_path: Path) -> List[str]:
+        """Build the bind arguments for the host compatibility tools."""
+        host_compat = Path(library.host_path) / "compatibilitytools.d"
+        sandbox_compat = sandbox_steam_path / "compatibilitytools.d"
+        args = []
+        for folder in library.compat_tools:
+            if folder not in self.IGNORED_COMPAT_TOOLS:
+                args.extend(["--bind", str(host_compat / folder), str(sandbox_compat / folder)])
+        return args
+
+    def _library_folder_mount_args(self, library: SteamLibrary, sandbox_home: Path) -> List[str]:
+        """
+        Build the bind arguments for additional library folders.
+
+        Libraries outside the home directory are already visible through the
+        root bind, so only the ones hidden by the home bind need a mount.
+        """
+        args = []
+        for folder in library.library_folders:
+            if Path(folder).is_relative_to(sandbox_home):
+                args.extend(["--bind", folder, folder])
+        return args
+
+    def _has_local_games(self, instance_home: Path, host_games: List[str]) -> bool:
+        """Check whether the instance has games installed in its own `common` folder."""
+        instance_common = instance_home / ".local/share/Steam/steamapps/common"
+        # Folders named after host games are mount points left behind by earlier per-folder binds.
+        return bool(set(self._list_dirs(instance_common)) - set(host_games))
+
+    def _list_dirs(self, path: Path) -> List[str]:
+        """List the subdirectories of an instance directory, reusing the last scan while its mtime is unchanged."""
+        try:
+            mtime = path.stat().st_mtime_ns
+        except OSError:
+            return []
+
+        with self._lock:
+            cached = self._dir_cache.get(path)
+            if cached and cached[0] == mtime:
+                return cached[1]
+
+        try:
+            names = sorted(entry.name for entry in path.iterdir() if entry.is_dir())
+        except OSError:
+            return []
+
+        with self._lock:
+            self._dir_cache[path] = (mtime, names)
+        return names
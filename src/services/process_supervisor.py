@@ -0,0 +1,147 @@
+"""
+Process supervisor module for the Twinverse application.
+
+This module reports instances that exit, whether they were stopped or died
+on their own, as soon as it happens and without polling.
+"""
+
+import os
+import subprocess
+import threading
+import time
+from typing import Callable, NamedTuple, Optional
+
+from gi.repository import GLib
+
+from src.core import Logger
+
+
+class InstanceExit(NamedTuple):
+    """How and when an instance process exited."""
+
+    instance_num: int
+    pid: int
+    returncode: Optional[int]
+    runtime: float
+
+
+class _Watch(NamedTuple):
+    """The main loop source following a single instance process."""
+
+    process: subprocess.Popen
+    source_id: int
+    pidfd: Optional[int]
+    started_at: float
+
+
+class ProcessSupervisor:
+    """
+    Follows the processes of running instances from the GLib main loop.
+
+    Every watched process gets a pidfd, which becomes readable when the
+    process exits and is added to the main loop as an fd source. Where pidfds
+    are not available (Linux before 5.3), a GLib child watch is used instead,
+    which relies on SIGCHLD. Either way no thread polls the processes, and
+    subscribers are called on the main loop with an `InstanceExit` as soon
+    as an instance exits.
+    """
+
+    def __init__(self, logger: Logger):
+        """Initialize the process supervisor."""
+        self._logger = logger
+        self._watches: dict[int, _Watch] = {}
+        self._subscribers: list[Callable[[InstanceExit], None]] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback: Callable[[InstanceExit], None]) -> None:
+        """Register a callback called on the main loop whenever an instance exits."""
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def watch(self, instance_num: int, process: subprocess.Popen) -> None:
+        """
+        Start following the process of an instance, replacing its previous one.
+
+        Safe to call from any thread.
+
+        Args:
+            instance_num: The instance number.
+            process: The process spawned for the instance.
+        """
+        self.unwatch(instance_num)
+        started_at = time.monotonic()
+        try:
+            pidfd = os.pidfd_open(process.pid)
+        except (AttributeError, OSError) as e:
+            self._logger.debug(f"Instance {instance_num}: No pidfd ({e}), falling back to a child watch.")
+            pidfd = None
+
+        with self._lock:
+            if pidfd is not None:
+                source_id = GLib.unix_fd_add_full(
+                    GLib.PRIORITY_DEFAULT, pidfd, GLib.IOCondition.IN, self._on_pidfd_ready, instance_num
+                )
+            else:
+                source_id = GLib.child_watch_add(
+                    GLib.PRIORITY_DEFAULT, process.pid, self._on_child_exited, instance_num
+                )
+            self._watches[instance_num] = _Watch(process, source_id, pidfd, started_at)
+
+    def unwatch(self, instance_num: int) -> None:
+        """Stop following the process of an instance."""
+        with self._lock:
+            watch = self._watches.pop(instance_num, None)
+        if watch:
+            GLib.source_remove(watch.source_id)
+            self._close(watch)
+
+    def stop_all(self) -> None:
+        """Stop following every process."""
+        with self._lock:
+            instance_nums = list(self._watches)
+        for instance_num in instance_nums:
+            self.unwatch(instance_num)
+
+    def _on_pidfd_ready(self, _fd: int, _condition: GLib.IOCondition, instance_num: int) -> bool:
+        """Report an instance whose pidfd signalled that it exited."""
+        watch = self._pop(instance_num)
+        if watch:
+            # The process exited but is not reaped yet; poll reaps it and records its code
+            self._report(instance_num, watch, watch.process.poll())
+        return GLib.SOURCE_REMOVE
+
+    def _on_child_exited(self, pid: int, wait_status: int, instance_num: int) -> None:
+        """Report an instance whose process GLib reaped."""
+        watch = self._pop(instance_num)
+        if watch and watch.process.pid == pid:
+            # GLib already reaped the process, so Popen cannot learn its code anymore; hand it over
+            watch.process.returncode = os.waitstatus_to_exitcode(wait_status)
+            self._report(instance_num, watch, watch.process.returncode)
+
+    def _pop(self, instance_num: int) -> Optional[_Watch]:
+        """Forget the watch of an instance whose source fired."""
+        with self._lock:
+            watch = self._watches.pop(instance_num, None)
+        if watch:
+            self._close(watch)
+        return watch
+
+    def _report(self, instance_num: int, watch: _Watch, returncode: Optional[int]) -> None:
+        """Notify the subscribers that an instance exited."""
+        event = InstanceExit(instance_num, watch.process.pid, returncode, time.monotonic() - watch.started_at)
+        self._logger.info(
+            f"Instance {instance_num} (PID {event.pid}) exited with code {returncode} after {event.runtime:.1f}s"
+        )
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(event)
+            except Exception as e:
+                self._logger.error(f"Error in process exit subscriber: {e}")
+
+    @staticmethod
+    def _close(watch: _Watch) -> None:
+        """Close the pidfd of a watch, if it has one."""
+        if watch.pidfd is not None:
+            os.close(watch.pidfd)
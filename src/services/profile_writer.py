@@ -0,0 +1,118 @@
+"""
+Profile writer module for the Twinverse application.
+
+This module persists the profile in the background, so settings changes made
+in the UI never wait for the disk.
+"""
+
+import hashlib
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from src.core import Config, Logger, Utils
+from src.models import Profile
+
+
+class ProfileWriter:
+    """
+    Write-behind persistence of the profile.
+
+    Every save request serializes the profile immediately, so later changes
+    to the object do not leak into it, and a background thread writes the
+    latest content once no new request arrived for `DELAY_SECONDS`. Writes
+    are atomic, and skipped when the content is the same as the file's.
+    """
+
+    DELAY_SECONDS = 0.5
+
+    def __init__(self, logger: Logger, path: Optional[Path] = None):
+        """Initialize the profile writer."""
+        self._logger = logger
+        self._path = path or Config.get_profile_path()
+        self._written_hash = self._hash_file()
+        self._pending: Optional[str] = None
+        self._deadline = 0.0
+        self._condition = threading.Condition()
+        # Serializes writes, so an older content is never written after a newer one
+        self._write_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self._writes = 0
+        self._skipped = 0
+
+    def schedule(self, profile: Profile) -> None:
+        """
+        Request the profile to be saved once the changes settle down.
+
+        Args:
+            profile: The profile to save.
+        """
+        content = profile.to_json()
+        with self._condition:
+            self._pending = content
+            self._deadline = time.monotonic() + self.DELAY_SECONDS
+            closed = self._closed
+            if not closed:
+                if not self._thread or not self._thread.is_alive():
+                    self._thread = threading.Thread(target=self._write_loop, name="profile-writer", daemon=True)
+                    self._thread.start()
+                self._condition.notify()
+        if closed:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the pending content now, if any."""
+        self._write_pending()
+
+    def close(self) -> None:
+        """Write the pending content and stop the background thread."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        if self._thread:
+            self._thread.join(timeout=1)
+            self._thread = None
+        self._write_pending()
+        self._logger.debug(f"Profile writer: {self._writes} write(s), {self._skipped} unchanged save(s) skipped.")
+
+    def _write_loop(self) -> None:
+        """Write the pending content once no new request arrived for a while."""
+        while True:
+            with self._condition:
+                while not self._closed and (self._pending is None or self._deadline > time.monotonic()):
+                    self._condition.wait(None if self._pending is None else self._deadline - time.monotonic())
+                if self._closed:
+                    return
+            self._write_pending()
+
+    def _write_pending(self) -> None:
+        """Write the pending content unless the file already has it."""
+        with self._write_lock:
+            with self._condition:
+                content, self._pending = self._pending, None
+            if content is not None:
+                self._write(content)
+
+    def _write(self, content: str) -> None:
+        """Write the profile atomically, skipping unchanged content."""
+        content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        if content_hash == self._written_hash:
+            self._skipped += 1
+            return
+        try:
+            Utils.write_atomic(self._path, content)
+        except OSError as e:
+            self._logger.error(f"Could not save the profile: {e}")
+            return
+        self._written_hash = content_hash
+        self._writes += 1
+        self._logger.info("Profile saved.")
+
+    def _hash_file(self) -> Optional[str]:
+        """Return the hash of the profile currently on disk."""
+        try:
+            return hashlib.sha256(self._path.read_bytes()).hexdigest()
+        except OSError:
+            return None
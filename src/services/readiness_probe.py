@@ -0,0 +1,233 @@
+"""
+Readiness probe module for the Twinverse application.
+
+This module watches launched Steam instances for concrete signs that they
+finished starting, so launches can move on as soon as the machine allows
+instead of waiting for a fixed amount of time.
+"""
+
+import os
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+from src.core import Logger, Utils
+from src.core.exceptions import TwinverseError
+from src.models import InstanceReadiness
+
+
+class _TrackedInstance:
+    """Bookkeeping for a single instance being watched by the probe."""
+
+    def __init__(self, process: subprocess.Popen, pgid: int, home_path: Path, expects_window: bool):
+        self.process = process
+        self.pgid = pgid
+        self.home_path = home_path
+        self.expects_window = expects_window
+        self.spawned_at = time.monotonic()
+        self.spawned_wall = time.time()
+        self.stages: dict[str, float] = {}
+
+
+class ReadinessProbe:
+    """
+    Watches launched instances for concrete startup signals.
+
+    Each instance goes through the following stages:
+
+    - ``process_tree``: a Steam process is running in the instance's process group.
+    - ``steam_log``: the Steam client wrote to its log under the instance home.
+    - ``window``: gamescope started its Xwayland server (only with gamescope).
+
+    An instance is ready once it reached every stage expected for it.
+    """
+
+    STAGE_PROCESS_TREE = "process_tree"
+    STAGE_STEAM_LOG = "steam_log"
+    STAGE_WINDOW = "window"
+
+    STEAM_PROCESS_NAMES = frozenset({"steam", "steamwebhelper"})
+    WINDOW_PROCESS_NAMES = frozenset({"Xwayland"})
+    STEAM_LOG_FILES = ("bootstrap_log.txt", "console_log.txt")
+    POLL_INTERVAL = 0.05
+    PROC_DIR = Path("/proc")
+
+    def __init__(self, logger: Logger, output_tail: Optional[Callable[[int], str]] = None):
+        """
+        Initialize the readiness probe.
+
+        Args:
+            logger: The logger.
+            output_tail: Returns the last output of an instance, reported when it exits during startup.
+        """
+        self._logger = logger
+        self._output_tail = output_tail
+        self._tracked: dict[int, _TrackedInstance] = {}
+        self._lock = threading.Lock()
+
+    def track(
+        self,
+        instance_num: int,
+        process: subprocess.Popen,
+        pgid: int,
+        home_path: Path,
+        expects_window: bool,
+    ) -> None:
+        """
+        Start watching a freshly spawned instance.
+
+        Args:
+            instance_num: The instance number.
+            process: The process that was spawned for the instance.
+            pgid: The process group the instance runs in.
+            home_path: The isolated home of the instance.
+            expects_window: Whether the instance runs inside gamescope.
+        """
+        with self._lock:
+            self._tracked[instance_num] = _TrackedInstance(process, pgid, home_path, expects_window)
+
+    def forget(self, instance_num: int) -> None:
+        """Stop watching an instance."""
+        with self._lock:
+            self._tracked.pop(instance_num, None)
+
+    def check(self, instance_num: int) -> InstanceReadiness:
+        """
+        Probe an instance once and return its current readiness.
+
+        Raises:
+            TwinverseError: If the instance exited before becoming ready.
+        """
+        with self._lock:
+            tracked = self._tracked.get(instance_num)
+        if tracked is None:
+            return InstanceReadiness(instance_num=instance_num)
+
+        expected = self._expected_stages(tracked)
+        if not expected.issubset(tracked.stages):
+            returncode = tracked.process.poll()
+            if returncode is not None:
+                raise TwinverseError(
+                    f"Instance {instance_num} exited during startup with code {returncode}"
+                    f"{self._collect_output(instance_num)}"
+                )
+            self._update_stages(tracked)
+
+        return InstanceReadiness(
+            instance_num=instance_num,
+            ready=expected.issubset(tracked.stages),
+            stages=dict(tracked.stages),
+        )
+
+    def wait_ready(
+        self,
+        instance_num: int,
+        timeout: float,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> InstanceReadiness:
+        """
+        Wait until an instance is ready, the timeout expires or the wait is cancelled.
+
+        Args:
+            instance_num: The instance number.
+            timeout: Maximum number of seconds to wait.
+            cancel_event: Optional event that aborts the wait when set.
+
+        Returns:
+            The readiness of the instance when the wait ended.
+
+        Raises:
+            TwinverseError: If the instance exited before becoming ready.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            readiness = self.check(instance_num)
+            if readiness.ready:
+                self._logger.info(f"Instance {instance_num} ready: {self.format_stages(readiness.stages)}")
+                return readiness
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self._logger.warning(
+                    f"Instance {instance_num} not ready after {timeout:.1f}s "
+                    f"(reached: {self.format_stages(readiness.stages) or 'nothing'})"
+                )
+                return readiness
+
+            interval = min(self.POLL_INTERVAL, remaining)
+            if cancel_event is not None:
+                if cancel_event.wait(interval):
+                    return readiness
+            else:
+                time.sleep(interval)
+
+    def _expected_stages(self, tracked: _TrackedInstance) -> set[str]:
+        """Return the stages an instance has to reach to count as ready."""
+        stages = {self.STAGE_PROCESS_TREE, self.STAGE_STEAM_LOG}
+        if tracked.expects_window:
+            stages.add(self.STAGE_WINDOW)
+        return stages
+
+    def _update_stages(self, tracked: _TrackedInstance) -> None:
+        """Record the time at which newly observed stages were reached."""
+        elapsed = time.monotonic() - tracked.spawned_at
+
+        if self.STAGE_PROCESS_TREE not in tracked.stages or (
+            tracked.expects_window and self.STAGE_WINDOW not in tracked.stages
+        ):
+            names = self._process_group_names(tracked.pgid)
+            if self.STAGE_PROCESS_TREE not in tracked.stages and names & self.STEAM_PROCESS_NAMES:
+                tracked.stages[self.STAGE_PROCESS_TREE] = elapsed
+            if tracked.expects_window and self.STAGE_WINDOW not in tracked.stages and names & self.WINDOW_PROCESS_NAMES:
+                tracked.stages[self.STAGE_WINDOW] = elapsed
+
+        if self.STAGE_STEAM_LOG not in tracked.stages and self._steam_log_written(tracked):
+            tracked.stages[self.STAGE_STEAM_LOG] = elapsed
+
+    def _steam_log_written(self, tracked: _TrackedInstance) -> bool:
+        """Check whether Steam wrote one of its logs since the instance was spawned."""
+        logs_dir = tracked.home_path / ".local/share/Steam/logs"
+        for log_name in self.STEAM_LOG_FILES:
+            try:
+                if (logs_dir / log_name).stat().st_mtime >= tracked.spawned_wall:
+                    return True
+            except OSError:
+                continue
+        return False
+
+    def _process_group_names(self, pgid: int) -> set[str]:
+        """Return the command names of all processes in a process group."""
+        if Utils.is_flatpak():
+            # The host processes are not visible from inside the sandbox.
+            result = Utils.flatpak_spawn_host(
+                ["pgrep", "-l", "-g", str(pgid)], capture_output=True, text=True, check=False
+            )
+            return {line.split(None, 1)[1] for line in result.stdout.splitlines() if " " in line}
+
+        names = set()
+        for entry in os.scandir(self.PROC_DIR):
+            if not entry.name.isdigit():
+                continue
+            try:
+                with open(self.PROC_DIR / entry.name / "stat", "rb") as f:
+                    stat = f.read()
+            except OSError:
+                continue
+            # The command name may contain spaces, so split around its parentheses.
+            name_end = stat.rfind(b")")
+            fields = stat[name_end + 2 :].split()
+            if len(fields) > 2 and int(fields[2]) == pgid:
+                names.add(stat[stat.find(b"(") + 1 : name_end].decode(errors="replace"))
+        return names
+
+    def _collect_output(self, instance_num: int) -> str:
+        """Return the last output of an exited instance, if anything."""
+        output = self._output_tail(instance_num).strip() if self._output_tail else ""
+        return f"\nOutput: {output}" if output else ""
+
+    @staticmethod
+    def format_stages(stages: dict[str, float]) -> str:
+        """Format stage timestamps for logging."""
+        return ", ".join(f"{stage} +{elapsed:.2f}s" for stage, elapsed in sorted(stages.items(), key=lambda s: s[1]))
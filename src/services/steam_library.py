@@ -0,0 +1,174 @@
+"""
+Steam library index module for the Twinverse application.
+
+This module keeps an index of the host Steam library (app manifests, game
+folders, compatibility tools and library folders) so launching instances
+does not rescan the host directories for every single instance.
+"""
+
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from pydantic import ValidationError
+
+from src.core import Config, Logger
+from src.models import AppManifest, SteamLibrary
+
+
+class SteamLibraryIndex:
+    """
+    Cached index of the host Steam library.
+
+    The index is stored under the cache directory and revalidated on every
+    access using the modification times of the scanned directories, so only
+    the parts of the library that changed since the last scan are read again.
+    Steam writes its manifests atomically through a rename, which updates the
+    modification time of `steamapps`.
+    """
+
+    STEAMAPPS = "steamapps"
+    COMMON = "steamapps/common"
+    COMPAT_TOOLS = "compatibilitytools.d"
+    LIBRARY_FOLDERS = "steamapps/libraryfolders.vdf"
+    WATCHED_PATHS = (STEAMAPPS, COMMON, COMPAT_TOOLS, LIBRARY_FOLDERS)
+
+    def __init__(self, logger: Logger, host_steam_path: Optional[Path] = None, cache_path: Optional[Path] = None):
+        """Initialize the Steam library index."""
+        self._logger = logger
+        self.host_steam_path = host_steam_path or Path.home() / ".local/share/Steam"
+        self.cache_path = cache_path or Config.CACHE_DIR / "steam_library_index.json"
+        self._library: Optional[SteamLibrary] = None
+        self._lock = threading.Lock()
+
+    def snapshot(self) -> SteamLibrary:
+        """
+        Return an up-to-date snapshot of the host Steam library.
+
+        Only the paths whose modification time changed since the last scan are
+        rescanned. The returned snapshot must not be modified.
+
+        Returns:
+            The current state of the host Steam library.
+        """
+        with self._lock:
+            if self._library is None:
+                self._library = self._load_cache()
+
+            mtimes = {sub_path: self._mtime(self.host_steam_path / sub_path) for sub_path in self.WATCHED_PATHS}
+            if mtimes == self._library.dir_mtimes:
+                return self._library
+
+            library = self._library.model_copy()
+            changed = [
+                sub_path for sub_path in self.WATCHED_PATHS if mtimes[sub_path] != library.dir_mtimes.get(sub_path)
+            ]
+            if self.STEAMAPPS in changed:
+                library.manifests = self._scan_manifests(library.manifests)
+            if self.COMMON in changed:
+                library.games = self._list_dirs(self.host_steam_path / self.COMMON)
+            if self.COMPAT_TOOLS in changed:
+                library.compat_tools = self._list_dirs(self.host_steam_path / self.COMPAT_TOOLS)
+            if self.LIBRARY_FOLDERS in changed:
+                library.library_folders = self._read_library_folders()
+            library.dir_mtimes = mtimes
+
+            self._logger.info(
+                f"Steam library index updated ({', '.join(changed)}): {len(library.manifests)} manifest(s), "
+                f"{len(library.games)} game folder(s), {len(library.compat_tools)} compatibility tool(s)."
+            )
+            self._library = library
+            self._save_cache(library)
+            return library
+
+    def _scan_manifests(self, previous: Dict[str, AppManifest]) -> Dict[str, AppManifest]:
+        """Read the app manifests, reusing the entries of files that did not change."""
+        manifests = {}
+        try:
+            entries = list(os.scandir(self.host_steam_path / self.STEAMAPPS))
+        except OSError:
+            return manifests
+
+        for entry in entries:
+            match = re.fullmatch(r"appmanifest_(\w+)\.acf", entry.name)
+            if not match:
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+
+            app_id = match.group(1)
+            cached = previous.get(app_id)
+            if cached and cached.size == stat.st_size and cached.mtime_ns == stat.st_mtime_ns:
+                manifests[app_id] = cached
+                continue
+
+            try:
+                content = Path(entry.path).read_text(encoding="utf-8", errors="replace")
+            except OSError as e:
+                self._logger.warning(f"Could not read {entry.name}: {e}")
+                continue
+            name = re.search(r'"name"\s+"([^"]*)"', content)
+            install_dir = re.search(r'"installdir"\s+"([^"]*)"', content)
+            manifests[app_id] = AppManifest(
+                app_id=app_id,
+                name=name.group(1) if name else "",
+                install_dir=install_dir.group(1) if install_dir else "",
+                size=stat.st_size,
+                mtime_ns=stat.st_mtime_ns,
+            )
+        return manifests
+
+    def _read_library_folders(self) -> List[str]:
+        """Return the additional library folders listed in `libraryfolders.vdf`."""
+        try:
+            content = (self.host_steam_path / self.LIBRARY_FOLDERS).read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            return []
+
+        folders = []
+        for match in re.finditer(r'"path"\s+"((?:[^"\\]|\\.)*)"', content):
+            folder = Path(match.group(1).replace("\\\\", "\\"))
+            if folder.resolve() != self.host_steam_path.resolve() and folder.is_dir():
+                folders.append(str(folder))
+        return folders
+
+    def _load_cache(self) -> SteamLibrary:
+        """Load the index saved by a previous run, if it belongs to the same Steam directory."""
+        empty = SteamLibrary(host_path=str(self.host_steam_path))
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                library = SteamLibrary.model_validate(json.load(f))
+        except (OSError, ValueError, ValidationError):
+            return empty
+        return library if library.host_path == str(self.host_steam_path) else empty
+
+    def _save_cache(self, library: SteamLibrary) -> None:
+        """Persist the index so the next run starts from it."""
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix(".tmp")
+            tmp_path.write_text(library.model_dump_json(), encoding="utf-8")
+            tmp_path.replace(self.cache_path)
+        except OSError as e:
+            self._logger.warning(f"Could not save the Steam library index: {e}")
+
+    @staticmethod
+    def _list_dirs(path: Path) -> List[str]:
+        """List the subdirectories of a directory."""
+        try:
+            return sorted(entry.name for entry in os.scandir(path) if entry.is_dir())
+        except OSError:
+            return []
+
+    @staticmethod
+    def _mtime(path: Path) -> Optional[int]:
+        """Return the modification time of a path, or None if it does not exist."""
+        try:
+            return path.stat().st_mtime_ns
+        except OSError:
+            return None
@@ -1,23 +1,328 @@
 """
 Steam verifier module for the Twinverse application.
 
-This module provides functionality to verify Steam installations.
+This module provides functionality to verify Steam installations, either
+quickly through the presence of the Steam client or deeply by hashing the
+client runtime.
 """
 
+import hashlib
+import json
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from typing import Callable, Dict, Optional, Sequence, Set, Tuple
+
+from gi.repository import Gio
+from pydantic import ValidationError
+
+from src.core import Config
+from src.models import FileDigest, InstanceHealth
+
+# Inode, size and modification time of the Steam client library
+FileSignature = Tuple[int, int, int]
 
 
 class SteamVerifier:
-    """Verifies Steam installations for Twinverse instances."""
+    """
+    Verifies Steam installations for Twinverse instances.
+
+    Results are cached per instance home, keyed by the metadata of the Steam
+    client library, so an unchanged installation is not verified again.
+    Watched homes are followed through Gio file monitors (inotify); their
+    cached result is returned without touching the disk until the monitor
+    reports a change.
+
+    The deep health check (`check_health`) hashes every file of the client
+    runtime. Hashes are stored per instance under the cache directory and
+    reused while a file keeps its size and modification time.
+    """
 
-    def __init__(self, logger):
+    STEAM_DIR = Path(".local/share/Steam")
+    STEAM_CLIENT = STEAM_DIR / "steamclient64.dll"
+    # Files every working client has, relative to the Steam directory
+    REQUIRED_FILES = (
+        "steam.sh",
+        "steamclient64.dll",
+        "ubuntu12_32/steam",
+        "ubuntu12_32/steamclient.so",
+        "linux64/steamclient.so",
+    )
+    # Directories holding the client runtime, hashed recursively
+    RUNTIME_DIRS = ("ubuntu12_32", "ubuntu12_64", "linux32", "linux64")
+    CLIENT_MANIFEST = "package/steam_client_ubuntu12.manifest"
+    HASH_WORKERS = 4
+    HASH_CHUNK_SIZE = 1 << 20
+
+    def __init__(self, logger, cache_dir: Optional[Path] = None):
         """Initialize the Steam verifier with a logger."""
         self.logger = logger
+        self._cache_dir = cache_dir or Config.CACHE_DIR / "health"
+        self._digests: Dict[Path, Dict[str, FileDigest]] = {}
+        self._health_lock = threading.Lock()
+        self._results: Dict[Path, Tuple[Optional[FileSignature], bool]] = {}
+        # Watched homes whose cached result is known to be current
+        self._fresh: Set[Path] = set()
+        self._invalidations: Dict[Path, int] = {}
+        self._monitors: Dict[Path, Gio.FileMonitor] = {}
+        self._lock = threading.Lock()
 
     def verify(self, instance_path: Path) -> bool:
-        """Verify if Steam is properly installed at the given instance path."""
-        steam_path = instance_path / ".local/share/Steam/steamclient64.dll"
-        self.logger.info(f"Verifying Steam installation at: {steam_path}")
-        is_verified = steam_path.exists()
-        self.logger.info(f"Verification result: {'Passed' if is_verified else 'Failed'}")
+        """
+        Verify if Steam is properly installed at the given instance path.
+
+        Safe to call from any thread.
+        """
+        with self._lock:
+            if instance_path in self._fresh:
+                return self._results[instance_path][1]
+            invalidations = self._invalidations.get(instance_path, 0)
+
+        steam_path = instance_path / self.STEAM_CLIENT
+        signature = self._signature(steam_path)
+        with self._lock:
+            cached = self._results.get(instance_path)
+            if cached and cached[0] == signature:
+                is_verified = cached[1]
+            else:
+                is_verified = signature is not None
+                self._results[instance_path] = (signature, is_verified)
+                self.logger.debug(
+                    f"Verified Steam installation at {steam_path}: {'Passed' if is_verified else 'Failed'}"
+                )
+            # A change reported while verifying makes the result stale already
+            if instance_path in self._monitors and self._invalidations.get(instance_path, 0) == invalidations:
+                self._fresh.add(instance_path)
         return is_verified
+
+    def invalidate(self, instance_path: Path) -> None:
+        """Make the next verification of an instance home read the disk again."""
+        with self._lock:
+            self._fresh.discard(instance_path)
+            self._invalidations[instance_path] = self._invalidations.get(instance_path, 0) + 1
+
+    def watch(self, instance_path: Path, on_changed: Callable[[Path], None]) -> None:
+        """
+        Follow changes to the Steam installation of an instance home.
+
+        The monitor delivers its events on the main loop of the calling thread,
+        so this is meant to be called from the GTK main thread. The library may
+        not exist yet; it is picked up once Steam is installed.
+
+        Args:
+            instance_path: The instance home to watch.
+            on_changed: Called with the instance home when its installation changed.
+        """
+        if instance_path in self._monitors:
+            return
+
+        def on_event(_monitor, _file, _other_file, event_type):
+            if event_type == Gio.FileMonitorEvent.CHANGED:
+                # Content is still being written; CHANGES_DONE_HINT follows
+                return
+            self.invalidate(instance_path)
+            on_changed(instance_path)
+
+        try:
+            monitor = Gio.File.new_for_path(str(instance_path / self.STEAM_CLIENT)).monitor_file(
+                Gio.FileMonitorFlags.WATCH_MOVES, None
+            )
+        except Exception as e:
+            self.logger.warning(f"Could not watch {instance_path} for Steam installation changes: {e}")
+            return
+        monitor.connect("changed", on_event)
+        with self._lock:
+            self._monitors[instance_path] = monitor
+
+    def unwatch_all(self) -> None:
+        """Stop following every instance home."""
+        with self._lock:
+            monitors = list(self._monitors.values())
+            self._monitors.clear()
+            self._fresh.clear()
+        for monitor in monitors:
+            monitor.cancel()
+
+    def check_health(self, instance_paths: Sequence[Path]) -> Dict[Path, InstanceHealth]:
+        """
+        Validate the Steam installations of some instances against the expected files.
+
+        Every instance must have the `REQUIRED_FILES`, non-empty. The runtime
+        files of instances on the same client version are compared with each
+        other: a file that is missing or different in an instance while a
+        majority of at least two others agree on it is reported, which catches
+        half-updated and corrupted homes. Files of all instances are hashed in
+        parallel, and only the ones whose size or modification time changed
+        since the last check are read.
+
+        Args:
+            instance_paths: The instance homes to check.
+
+        Returns:
+            The health report of every instance home.
+        """
+        with self._health_lock:
+            digests, stale = {}, []
+            for path in instance_paths:
+                digests[path], changed = self._current_digests(path)
+                stale.extend((path, rel, stat) for rel, stat in changed.items())
+            hashed = dict.fromkeys(instance_paths, 0)
+
+            with ThreadPoolExecutor(max_workers=self.HASH_WORKERS, thread_name_prefix="steam-health") as executor:
+                futures = {
+                    executor.submit(self._hash_file, path / self.STEAM_DIR / rel): (path, rel, stat)
+                    for path, rel, stat in stale
+                }
+                for future in as_completed(futures):
+                    path, rel, (size, mtime_ns) = futures[future]
+                    try:
+                        digests[path][rel] = FileDigest(size=size, mtime_ns=mtime_ns, sha256=future.result())
+                    except OSError as e:
+                        self.logger.warning(f"Could not hash {path / self.STEAM_DIR / rel}: {e}")
+                    hashed[path] += 1
+
+            for path in instance_paths:
+                self._digests[path] = digests[path]
+                self._save_digests(path, digests[path])
+
+        reports = {}
+        versions = {path: self._client_version(path) for path in instance_paths}
+        for path in instance_paths:
+            files = digests[path]
+            peers = [digests[peer] for peer in instance_paths if peer != path and versions[peer] == versions[path]]
+            report = InstanceHealth(instance_path=str(path), client_version=versions[path], hashed=hashed[path])
+            report.missing = [rel for rel in self.REQUIRED_FILES if rel not in files]
+            report.empty = [rel for rel in self.REQUIRED_FILES if rel in files and files[rel].size == 0]
+            if versions[path] is not None:
+                for rel in sorted(set().union(*peers) if peers else ()):
+                    expected = self._majority_hash(peer.get(rel) for peer in peers)
+                    if expected is None or (rel in files and files[rel].sha256 == expected):
+                        continue
+                    (report.mismatched if rel in files else report.missing).append(rel)
+
+            summary = (
+                "OK"
+                if report.healthy
+                else f"{len(report.missing)} missing, {len(report.empty)} empty, "
+                f"{len(report.mismatched)} mismatched file(s)"
+            )
+            self.logger.info(f"Health check of {path}: {summary} ({report.hashed} of {len(files)} file(s) hashed)")
+            reports[path] = report
+        return reports
+
+    def _current_digests(self, instance_path: Path) -> Tuple[Dict[str, FileDigest], Dict[str, Tuple[int, int]]]:
+        """
+        Match the runtime files of an instance with its stored hashes.
+
+        Returns:
+            The still valid hashes, and the size and modification time of the
+            files to hash again, both keyed by relative path.
+        """
+        if instance_path not in self._digests:
+            self._digests[instance_path] = self._load_digests(instance_path)
+        stored = self._digests[instance_path]
+
+        current: Dict[str, FileDigest] = {}
+        stale: Dict[str, Tuple[int, int]] = {}
+        for rel, stat in self._list_runtime_files(instance_path / self.STEAM_DIR).items():
+            digest = stored.get(rel)
+            if digest and (digest.size, digest.mtime_ns) == stat:
+                current[rel] = digest
+            else:
+                stale[rel] = stat
+        return current, stale
+
+    def _list_runtime_files(self, steam_path: Path) -> Dict[str, Tuple[int, int]]:
+        """Return the size and modification time of every runtime file, keyed by relative path."""
+        files = {}
+        pending = [steam_path / runtime_dir for runtime_dir in self.RUNTIME_DIRS]
+        while pending:
+            try:
+                entries = list(os.scandir(pending.pop()))
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(Path(entry.path))
+                    elif entry.is_file(follow_symlinks=False):
+                        stat = entry.stat(follow_symlinks=False)
+                        files[os.path.relpath(entry.path, steam_path)] = (stat.st_size, stat.st_mtime_ns)
+                except OSError:
+                    continue
+
+        for rel in self.REQUIRED_FILES:
+            if rel not in files:
+                try:
+                    stat = (steam_path / rel).stat()
+                    files[rel] = (stat.st_size, stat.st_mtime_ns)
+                except OSError:
+                    pass
+        return files
+
+    def _hash_file(self, path: Path) -> str:
+        """Return the SHA-256 digest of a file."""
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            while chunk := f.read(self.HASH_CHUNK_SIZE):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _majority_hash(digests) -> Optional[str]:
+        """Return the hash most instances agree on, if at least two of them and a majority do."""
+        hashes = [digest.sha256 if digest else None for digest in digests]
+        if not hashes:
+            return None
+        best = max(set(hashes), key=hashes.count)
+        count = hashes.count(best)
+        return best if count >= 2 and count * 2 > len(hashes) else None
+
+    def _client_version(self, instance_path: Path) -> Optional[str]:
+        """Read the installed Steam client version of an instance."""
+        try:
+            content = (instance_path / self.STEAM_DIR / self.CLIENT_MANIFEST).read_text(
+                encoding="utf-8", errors="replace"
+            )
+        except OSError:
+            return None
+        match = re.search(r'"version"\s+"([^"]*)"', content)
+        return match.group(1) if match else None
+
+    def _digests_path(self, instance_path: Path) -> Path:
+        """Return the file the hashes of an instance are stored in."""
+        return self._cache_dir / f"{instance_path.name}.json"
+
+    def _load_digests(self, instance_path: Path) -> Dict[str, FileDigest]:
+        """Load the hashes stored by a previous check of an instance."""
+        try:
+            with open(self._digests_path(instance_path), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("instance_path") != str(instance_path):
+                return {}
+            return {rel: FileDigest.model_validate(digest) for rel, digest in data["files"].items()}
+        except (OSError, ValueError, KeyError, AttributeError, ValidationError):
+            return {}
+
+    def _save_digests(self, instance_path: Path, digests: Dict[str, FileDigest]) -> None:
+        """Persist the hashes of an instance so the next check only hashes changed files."""
+        path = self._digests_path(instance_path)
+        data = {"instance_path": str(instance_path), "files": {rel: d.model_dump() for rel, d in digests.items()}}
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(data), encoding="utf-8")
+            tmp_path.replace(path)
+        except OSError as e:
+            self.logger.warning(f"Could not save the health check hashes of {instance_path}: {e}")
+
+    @staticmethod
+    def _signature(path: Path) -> Optional[FileSignature]:
+        """Return the metadata a cached result is keyed by, or None if the file is missing."""
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
@@ -5,31 +5,133 @@ This module provides functionality to create and manage virtual input devices,
 particularly virtual joysticks for use with Steam instances.
 """
 
+import fcntl
+import os
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
 
-from evdev import AbsInfo, InputDevice, UInput
+from evdev import AbsInfo, UInput
 from evdev import ecodes as e
-from evdev import list_devices
 
 from src.core import VirtualDeviceError
 
 
 class VirtualDeviceService:
-    """Manages virtual input devices, particularly virtual joysticks for Steam instances."""
+    """
+    Pool of virtual joysticks, one per instance without a physical controller.
+
+    Devices are created in the background as soon as the instances that need
+    them are known, so creating them overlaps with the rest of the launch
+    preparation. Every device carries its instance number in its name and
+    physical path, so instances never share an event stream. A device is
+    kept across relaunches of its instance, until the instance gets a
+    physical controller (`release`) or the session ends (`destroy_all`).
+    """
+
+    # UI_GET_SYSNAME(len) from linux/uinput.h: _IOC(_IOC_READ, 'U', 44, len)
+    SYSNAME_LENGTH = 64
+    UI_GET_SYSNAME = (2 << 30) | (SYSNAME_LENGTH << 16) | (ord("U") << 8) | 44
+    SYSFS_VIRTUAL_INPUT = Path("/sys/devices/virtual/input")
+    DEV_INPUT = Path("/dev/input")
+    NODE_TIMEOUT_SECONDS = 5
+    NODE_POLL_SECONDS = 0.005
+    MAX_WORKERS = 4
 
     def __init__(self, logger):
         """Initialize the virtual device service with a logger."""
         self._logger = logger
-        self._ui = None
+        self._devices: Dict[int, Tuple[UInput, str]] = {}
+        self._pending: Dict[int, Future] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def reserve(self, instance_nums: Iterable[int]) -> None:
+        """
+        Start creating the virtual joysticks of some instances in the background.
+
+        Instances that already have a device, or whose device is being created,
+        are skipped.
+
+        Args:
+            instance_nums: The instances that need a virtual joystick.
+        """
+        with self._lock:
+            for instance_num in instance_nums:
+                if instance_num in self._devices or instance_num in self._pending:
+                    continue
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.MAX_WORKERS, thread_name_prefix="virtual-device"
+                    )
+                self._pending[instance_num] = self._executor.submit(self._create_virtual_joystick, instance_num)
+
+    def get_joystick(self, instance_num: int) -> str:
+        """
+        Return the event node of an instance's virtual joystick, creating it if needed.
+
+        Args:
+            instance_num: The instance number.
+
+        Returns:
+            The path of the event node.
+
+        Raises:
+            VirtualDeviceError: If the device could not be created.
+        """
+        self.reserve([instance_num])
+        with self._lock:
+            if instance_num in self._devices:
+                return self._devices[instance_num][1]
+            future = self._pending[instance_num]
+
+        try:
+            path = future.result()
+        finally:
+            with self._lock:
+                if self._pending.get(instance_num) is future:
+                    del self._pending[instance_num]
+        return path
+
+    def get_path(self, instance_num: int) -> Optional[str]:
+        """Return the event node of an instance's virtual joystick, or None if it has none yet."""
+        with self._lock:
+            device = self._devices.get(instance_num)
+            return device[1] if device else None
+
+    def release(self, instance_num: int) -> None:
+        """Destroy the virtual joystick of an instance, if it has one."""
+        with self._lock:
+            device = self._devices.pop(instance_num, None)
+        if device:
+            self._close(instance_num, device[0])
 
-    def create_virtual_joystick(self):
-        """Create a minimal virtual joystick and find its event node."""
-        if self._ui:
-            self._logger.warning("Virtual joystick already exists.")
-            # If it exists, we assume the devnode is also known and correct
-            return self._ui.devnode
+    def destroy_all(self) -> None:
+        """Destroy every virtual joystick, waiting for the ones still being created, and stop the workers."""
+        with self._lock:
+            pending = list(self._pending.values())
+            self._pending.clear()
+            executor, self._executor = self._executor, None
+        for future in pending:
+            try:
+                future.result()
+            except VirtualDeviceError:
+                pass
+        if executor:
+            executor.shutdown(wait=True)
+
+        with self._lock:
+            devices = list(self._devices.items())
+            self._devices.clear()
+        for instance_num, (ui, _) in devices:
+            self._close(instance_num, ui)
 
-        device_name = "Virtual Joystick by Twinverse"
+    def _create_virtual_joystick(self, instance_num: int) -> str:
+        """Create a minimal virtual joystick for an instance and find its event node."""
+        device_name = f"Virtual Joystick {instance_num + 1} by Twinverse"
+        ui = None
         try:
             capabilities = {
                 e.EV_KEY: [e.BTN_A],
@@ -44,39 +146,63 @@ class VirtualDeviceService:
                     ),
                 ],
             }
-            self._ui = UInput(capabilities, name=device_name, vendor=0x1234, product=0x5678)
-            self._logger.info("Virtual device object created. Searching for its event node...")
-
-            # Robustly find the device node
-            start_time = time.time()
-            timeout = 5  # seconds
-            while time.time() - start_time < timeout:
-                devices = [InputDevice(path) for path in list_devices()]
-                for device in devices:
-                    if device.name == device_name:
-                        self._logger.info(f"Found virtual joystick at {device.path}")
-                        # UInput object doesn't always have a correct devnode attribute immediately.
-                        # We store the found path for reliability.
-                        self._ui.devnode = device.path
-                        return device.path
-                time.sleep(0.1)
-
-            raise VirtualDeviceError("Virtual joystick created but its event node could not be found.")
-
+            ui = UInput(
+                capabilities,
+                name=device_name,
+                vendor=0x1234,
+                product=0x5678,
+                phys=f"twinverse/instance{instance_num}",
+            )
+            devnode = self.find_event_node(ui.fd)
         except Exception as ex:
-            self._logger.error(f"Failed to create virtual joystick: {ex}")
-            if self._ui:
-                self._ui.close()
-                self._ui = None
+            self._logger.error(f"Instance {instance_num}: Failed to create virtual joystick: {ex}")
+            if ui:
+                ui.close()
             raise VirtualDeviceError(f"Failed to create virtual joystick: {ex}") from ex
 
-    def destroy_virtual_joystick(self):
-        """Destroy the virtual joystick if it exists."""
-        if self._ui:
-            try:
-                self._ui.close()
-                self._logger.info("Virtual joystick destroyed.")
-            except Exception as ex:
-                self._logger.error(f"Error destroying virtual joystick: {ex}")
-            finally:
-                self._ui = None
+        with self._lock:
+            self._devices[instance_num] = (ui, devnode)
+        self._logger.info(f"Instance {instance_num}: Found virtual joystick at {devnode}")
+        return devnode
+
+    def _close(self, instance_num: int, ui: UInput) -> None:
+        """Close a virtual joystick."""
+        try:
+            ui.close()
+            self._logger.info(f"Instance {instance_num}: Virtual joystick destroyed.")
+        except Exception as ex:
+            self._logger.error(f"Instance {instance_num}: Error destroying virtual joystick: {ex}")
+
+    @classmethod
+    def find_event_node(cls, uinput_fd: int) -> str:
+        """
+        Resolve the event node of a uinput device from its sysfs entry.
+
+        The kernel reports the name of the input device behind the uinput file
+        descriptor, so no other input device has to be opened. The node is
+        returned once udev made it accessible.
+
+        Args:
+            uinput_fd: The file descriptor of the created uinput device.
+
+        Returns:
+            The path of the event node, e.g. /dev/input/event21.
+
+        Raises:
+            VirtualDeviceError: If the node cannot be resolved in time.
+        """
+        buffer = bytearray(cls.SYSNAME_LENGTH)
+        fcntl.ioctl(uinput_fd, cls.UI_GET_SYSNAME, buffer)
+        sysname = buffer.split(b"\0", 1)[0].decode()
+
+        # The sysfs entries exist as soon as the device is created; udev applies permissions right after
+        deadline = time.monotonic() + cls.NODE_TIMEOUT_SECONDS
+        while True:
+            event_dirs = sorted((cls.SYSFS_VIRTUAL_INPUT / sysname).glob("event*"))
+            if event_dirs:
+                devnode = cls.DEV_INPUT / event_dirs[0].name
+                if os.access(devnode, os.R_OK):
+                    return str(devnode)
+            if time.monotonic() >= deadline:
+                raise VirtualDeviceError(f"Event node of {sysname} not available after {cls.NODE_TIMEOUT_SECONDS}s.")
+            time.sleep(cls.NODE_POLL_SECONDS)
@@ -0,0 +1,43 @@
+"""Tests for the cached audio sink discovery."""
+
+import subprocess
+from unittest.mock import MagicMock, patch
+
+from src.services.audio_backend import AudioBackend
+
+JSON_SINKS = '[{"name": "alsa_output.usb", "description": "USB Headset"}, {"name": "alsa_output.pci"}]'
+TEXT_SINKS = """Sink #1
+\tState: SUSPENDED
+\tName: alsa_output.pci
+\tDescription: Built-in Audio
+\tProperties:
+\t\tdevice.description = "Built-in Audio"
+"""
+
+
+def test_sinks_are_read_from_json_and_cached():
+    """Sinks come from the JSON output and are only queried once."""
+    backend = AudioBackend(MagicMock())
+    with patch("subprocess.run", return_value=MagicMock(stdout=JSON_SINKS)) as run:
+        assert backend.get_sinks() == [
+            {"id": "alsa_output.usb", "name": "USB Headset"},
+            {"id": "alsa_output.pci", "name": "alsa_output.pci"},
+        ]
+        backend.get_sinks()
+    run.assert_called_once()
+
+
+def test_text_output_is_used_without_json_support():
+    """Older pactl versions without JSON output fall back to the text format."""
+    backend = AudioBackend(MagicMock())
+    responses = [subprocess.CalledProcessError(1, "pactl"), MagicMock(stdout=TEXT_SINKS)]
+    with patch("subprocess.run", side_effect=responses):
+        assert backend.get_sinks() == [{"id": "alsa_output.pci", "name": "Built-in Audio"}]
+
+
+def test_only_sink_additions_and_removals_trigger_a_refresh():
+    """Volume changes do not cause the sink list to be read again."""
+    assert AudioBackend._is_sink_event("Event 'new' on sink #55")
+    assert AudioBackend._is_sink_event("Event 'remove' on sink #55")
+    assert not AudioBackend._is_sink_event("Event 'change' on sink #55")
+    assert not AudioBackend._is_sink_event("Event 'new' on sink-input #12")
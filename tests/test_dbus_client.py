@@ -0,0 +1,24 @@
+"""Tests for the session bus client."""
+
+from unittest.mock import MagicMock, patch
+
+from src.services.dbus_client import DBusClient
+
+
+def test_proxies_are_cached_and_latency_is_tracked():
+    """Calls to the same object share one proxy and are counted per method."""
+    client = DBusClient(MagicMock(), connection=MagicMock())
+    with patch("src.services.dbus_client.Gio") as gio:
+        proxy = gio.DBusProxy.new_sync.return_value
+        proxy.call_sync.return_value.unpack.return_value = ("dodgewindows",)
+
+        results = [
+            client.call_sync("org.kde.plasmashell", "/PlasmaShell", "org.kde.PlasmaShell", "evaluateScript")
+            for _ in range(2)
+        ]
+
+    assert results == ["dodgewindows", "dodgewindows"]
+    gio.DBusProxy.new_sync.assert_called_once()
+    stats = client.get_stats()["org.kde.PlasmaShell.evaluateScript"]
+    assert (stats.calls, stats.failures, stats.timeouts) == (2, 0, 0)
+    assert stats.max_ms >= stats.average_ms >= 0
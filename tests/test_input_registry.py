@@ -0,0 +1,59 @@
+"""Tests for the sysfs based input device registry."""
+
+import os
+from unittest.mock import MagicMock
+
+from src.services.input_registry import InputDeviceRegistry
+
+
+def _add_device(sysfs, event, name, ev, key="0", rel="0", abs_="0"):
+    """Create the sysfs entry of an input device."""
+    capabilities = sysfs / event / "device/capabilities"
+    capabilities.mkdir(parents=True)
+    (sysfs / event / "device/name").write_text(f"{name}\n")
+    for attribute, value in {"ev": ev, "key": key, "rel": rel, "abs": abs_}.items():
+        (capabilities / attribute).write_text(f"{value}\n")
+
+
+def _registry(tmp_path):
+    """Create a registry reading a fake sysfs and /dev/input."""
+    registry = InputDeviceRegistry(MagicMock())
+    registry.SYSFS_INPUT = tmp_path / "sys"
+    registry.DEV_INPUT = tmp_path / "dev"
+    (tmp_path / "dev/by-id").mkdir(parents=True)
+    return registry
+
+
+def test_devices_are_classified_by_capabilities(tmp_path):
+    """Devices are classified by what they report, not by their name."""
+    sysfs = tmp_path / "sys"
+    keys = 1 << 16 | 1 << 30 | 1 << 44 | 1 << 57
+    _add_device(sysfs, "event0", "Some Keyboard", ev="120013", key=f"{keys:x}")
+    _add_device(sysfs, "event1", "Some Mouse", ev="17", key=f"{1 << 0x110 - 256:x} 0 0 0 0", rel="103")
+    _add_device(sysfs, "event2", "Pad", ev="1b", key=f"{1 << 0x130 - 256:x} 0 0 0 0", abs_="3")
+    _add_device(sysfs, "event3", "Power Button", ev="3", key=f"{1 << 116:x} 0")
+    _add_device(sysfs, "event4", "Virtual Joystick by Twinverse", ev="b", key=f"{1 << 0x130 - 256:x} 0 0 0 0", abs_="3")
+    registry = _registry(tmp_path)
+    os.symlink("../event2", tmp_path / "dev/by-id/usb-Pad-event-joystick")
+
+    devices = registry.get_devices()
+
+    assert devices["keyboard"] == [{"id": str(tmp_path / "dev/event0"), "name": "Some Keyboard"}]
+    assert devices["mouse"] == [{"id": str(tmp_path / "dev/event1"), "name": "Some Mouse"}]
+    assert devices["joystick"] == [{"id": str(tmp_path / "dev/by-id/usb-Pad-event-joystick"), "name": "Pad"}]
+
+
+def test_subscribers_are_notified_on_change(tmp_path):
+    """Subscribers only hear about refreshes that change the device lists."""
+    registry = _registry(tmp_path)
+    (tmp_path / "sys").mkdir()
+    callback = MagicMock()
+    registry.subscribe(callback)
+    registry.get_devices()
+
+    registry.refresh()
+    callback.assert_not_called()
+
+    _add_device(tmp_path / "sys", "event2", "Pad", ev="1b", key=f"{1 << 0x130 - 256:x} 0 0 0 0", abs_="3")
+    registry.refresh()
+    callback.assert_called_once()
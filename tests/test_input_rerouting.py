@@ -0,0 +1,21 @@
+"""Tests for applying keyboard and mouse changes to running instances."""
+
+import threading
+from unittest.mock import MagicMock
+
+from src.models import Profile
+from src.services.instance import InstanceService
+
+
+def test_rerouting_runs_off_the_calling_thread():
+    """Routing changes are applied on a worker thread, not on the caller's (the GTK main thread)."""
+    service = InstanceService(MagicMock(), device_manager=MagicMock())
+    service.processes[0] = MagicMock()
+    service.input_router = MagicMock()
+    service.input_router.get_paths.return_value = {"keyboard": "/dev/input/event30"}
+    threads = []
+    service.input_router.route.side_effect = lambda *args, **kwargs: threads.append(threading.current_thread())
+
+    service.reroute_inputs(Profile()).result(timeout=5)
+
+    assert threads and threads[0] is not threading.current_thread()
@@ -0,0 +1,69 @@
+"""Tests for the keyboard and mouse input router."""
+
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from evdev import ecodes
+
+from src.services.input_router import InputRouter
+
+
+def test_sources_are_swapped_on_the_same_virtual_device(monkeypatch):
+    """Changing the routed keyboard keeps the virtual keyboard and forwards the new device's events."""
+    monkeypatch.setattr(InputRouter, "_ensure_loop", lambda self: None)
+    sources = {}
+
+    def open_source(device_id):
+        sources[device_id] = MagicMock(fd=len(sources) + 100)
+        return sources[device_id]
+
+    router = InputRouter(MagicMock())
+    with (
+        patch("src.services.input_router.InputDevice", side_effect=open_source),
+        patch("src.services.input_router.UInput") as uinput,
+        patch("src.services.input_router.VirtualDeviceService.find_event_node", return_value="/dev/input/event30"),
+    ):
+        assert router.route(0, "/dev/input/by-id/kbd-a", None) == {"keyboard": "/dev/input/event30"}
+        assert router.route(0, "/dev/input/by-id/kbd-b", None) == {"keyboard": "/dev/input/event30"}
+
+    assert uinput.call_count == 1
+    sources["/dev/input/by-id/kbd-a"].ungrab.assert_called_once()
+    sources["/dev/input/by-id/kbd-a"].close.assert_called_once()
+    sources["/dev/input/by-id/kbd-b"].grab.assert_called_once()
+
+    target = uinput.return_value
+    now = time.time()
+    sources["/dev/input/by-id/kbd-b"].read.return_value = [
+        SimpleNamespace(type=ecodes.EV_KEY, code=ecodes.KEY_A, value=1, timestamp=lambda: now),
+        SimpleNamespace(type=ecodes.EV_SYN, code=ecodes.SYN_REPORT, value=0, timestamp=lambda: now),
+    ]
+    router._forward(sources["/dev/input/by-id/kbd-b"].fd)
+
+    target.write.assert_called_once_with(ecodes.EV_KEY, ecodes.KEY_A, 1)
+    target.syn.assert_called_once()
+    assert router.get_latency_stats()["frames"] == 1
+
+    router.stop_all()
+    target.close.assert_called_once()
+    assert router.get_paths(0) == {}
+
+
+def test_devices_are_only_grabbed_once_the_route_is_activated(monkeypatch):
+    """A route prepared before a launch creates its virtual device but leaves the physical one to the desktop."""
+    monkeypatch.setattr(InputRouter, "_ensure_loop", lambda self: None)
+    router = InputRouter(MagicMock())
+    with (
+        patch("src.services.input_router.InputDevice") as input_device,
+        patch("src.services.input_router.UInput"),
+        patch("src.services.input_router.VirtualDeviceService.find_event_node", return_value="/dev/input/event30"),
+    ):
+        assert router.route(1, None, "/dev/input/by-id/mouse", activate=False) == {"mouse": "/dev/input/event30"}
+        router.on_devices_changed({})
+        input_device.assert_not_called()
+
+        router.activate(1)
+        input_device.return_value.grab.assert_called_once()
+
+    router.unroute(1)
+    input_device.return_value.ungrab.assert_called_once()
@@ -0,0 +1,68 @@
+"""Tests for the per-instance log capture."""
+
+import subprocess
+import sys
+from unittest.mock import MagicMock
+
+from src.services.instance_logs import InstanceLogs
+
+
+def _spawn(script):
+    return subprocess.Popen([sys.executable, "-c", script], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, bufsize=0)
+
+
+def test_output_is_written_to_the_log_and_rotated(tmp_path, monkeypatch):
+    """Both output streams end up in the log, which is rotated past its size limit and on relaunch."""
+    monkeypatch.setattr(InstanceLogs, "MAX_BYTES", 4096)
+    monkeypatch.setattr(InstanceLogs, "CHUNK_SIZE", 1024)
+    logs = InstanceLogs(MagicMock(), log_dir=tmp_path)
+
+    process = _spawn("import sys\nfor i in range(1000): print(f'line {i}')\nsys.stderr.write('failed\\n')")
+    logs.capture(0, process)
+    assert process.stdout is None
+    process.wait()
+    logs.stop_all()
+
+    log_path = logs.log_path(0)
+    assert log_path.read_text().endswith("line 999\nfailed\n")
+    assert log_path.with_name(f"{log_path.name}.1").exists()
+    assert not log_path.with_name(f"{log_path.name}.{InstanceLogs.BACKUP_COUNT + 1}").exists()
+
+    process = _spawn("print('relaunched')")
+    logs.capture(0, process)
+    process.wait()
+    logs.stop_all()
+    assert log_path.read_text() == "relaunched\n"
+    assert log_path.with_name(f"{log_path.name}.1").read_text().endswith("failed\n")
+
+
+def test_output_keeps_flowing_when_the_log_cannot_be_rotated(tmp_path, monkeypatch):
+    """A failed rotation is logged and the output keeps going to the current log."""
+    monkeypatch.setattr(InstanceLogs, "MAX_BYTES", 4096)
+    monkeypatch.setattr(InstanceLogs, "CHUNK_SIZE", 1024)
+    logs = InstanceLogs(MagicMock(), log_dir=tmp_path)
+    open_log = logs._open_log
+    # Only the log opened on capture can be created
+    monkeypatch.setattr(
+        logs, "_open_log", MagicMock(side_effect=[open_log(0)] + [OSError("No space left on device")] * 10)
+    )
+    process = _spawn("for i in range(1000): print(f'line {i}')")
+    logs.capture(0, process)
+
+    process.wait()
+    logs.stop_all()
+
+    text = logs.log_path(0).read_text()
+    assert text.startswith("line 0\n") and text.endswith("line 999\n")
+    logs._logger.error.assert_called()
+
+
+def test_tail_is_bounded_and_starts_at_a_line(tmp_path):
+    """The tail returns whole lines from the end of the log, never more than asked for."""
+    logs = InstanceLogs(MagicMock(), log_dir=tmp_path)
+    logs.log_path(1).write_text("".join(f"line {i}\n" for i in range(100)))
+
+    tail = logs.tail(1, max_bytes=30)
+    assert len(tail) <= 30
+    assert tail.startswith("line ") and tail.endswith("line 99\n")
+    assert logs.tail(2) == ""
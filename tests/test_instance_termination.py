@@ -0,0 +1,57 @@
+"""Tests for the termination of running instances."""
+
+import os
+import subprocess
+import sys
+import time
+from unittest.mock import MagicMock, patch
+
+from src.core import Utils
+from src.services.instance import InstanceService
+
+_IGNORE_SIGTERM = (
+    "import signal, time\nsignal.signal(signal.SIGTERM, signal.SIG_IGN)\nprint(flush=True)\ntime.sleep(60)"
+)
+
+
+def _spawn(service, instance_num, script):
+    process = subprocess.Popen([sys.executable, "-c", script], stdout=subprocess.PIPE, preexec_fn=os.setpgrp)
+    process.stdout.readline()
+    service.processes[instance_num] = process
+    service.pids[instance_num] = process.pid
+    service.pgids[instance_num] = process.pid
+    return process
+
+
+def test_instances_are_stopped_together_against_one_deadline(monkeypatch):
+    """Hung instances are killed at a shared deadline, not one timeout after another."""
+    monkeypatch.setattr(InstanceService, "TERMINATE_TIMEOUT", 0.5)
+    service = InstanceService(MagicMock(), device_manager=MagicMock())
+    hung = [_spawn(service, n, _IGNORE_SIGTERM) for n in (0, 1, 2)]
+    polite = _spawn(service, 3, "import time\nprint(flush=True)\ntime.sleep(60)")
+
+    started_at = time.monotonic()
+    with patch.object(Utils, "is_flatpak", return_value=False):
+        service.terminate_all()
+    elapsed = time.monotonic() - started_at
+
+    assert elapsed < 2 * InstanceService.TERMINATE_TIMEOUT
+    assert all(process.returncode == -9 for process in hung)
+    assert polite.returncode == -15
+    assert not service.processes and not service.pgids
+
+
+def test_stopped_instances_are_no_longer_supervised():
+    """Stopping instances removes their supervision sources, so their exits are not reported."""
+    service = InstanceService(MagicMock(), device_manager=MagicMock())
+    process = _spawn(service, 0, "import time\nprint(flush=True)\ntime.sleep(60)")
+
+    with (
+        patch("src.services.process_supervisor.GLib") as glib,
+        patch.object(Utils, "is_flatpak", return_value=False),
+    ):
+        service.supervisor.watch(0, process)
+        service.terminate_all()
+        glib.source_remove.assert_called_once_with(glib.unix_fd_add_full.return_value)
+
+    assert not service.supervisor._watches
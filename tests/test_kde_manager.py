@@ -0,0 +1,134 @@
+"""Tests for the KDE manager."""
+
+import json
+import threading
+import time
+from concurrent.futures import Future
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from src.core import Config
+from src.core.layout import InstanceGeometry
+from src.services import kde_manager
+from src.services.kde_manager import KdeManager
+
+
+def _kde_manager(outputs):
+    """Create a KDE manager whose plasmashell answers with the given outputs."""
+    manager = KdeManager(MagicMock(), MagicMock(), MagicMock())
+    manager.is_kde_desktop = lambda: True
+    manager._run_plasmashell_script = MagicMock(side_effect=outputs)
+    return manager
+
+
+def test_panel_states_survive_a_restart(tmp_path, monkeypatch):
+    """Saved panel states are persisted and restored asynchronously by the next run."""
+    monkeypatch.setattr(Config, "CACHE_DIR", tmp_path)
+    manager = _kde_manager(['[{"id": 1, "hiding": "none"}, {"id": 2, "hiding": null}]'])
+    manager.save_and_dodge_panels()
+    assert manager._run_plasmashell_script.call_count == 1
+    assert (tmp_path / "panel_states.json").exists()
+
+    recovered = _kde_manager([])
+    assert recovered.original_panel_states == {"1": "none", "2": None}
+    answer = Future()
+    recovered.dbus.call.return_value = answer
+    recovered.recover_panel_states()
+    assert '{"1": "none", "2": null}' in recovered._restore_panels_script()
+    assert (tmp_path / "panel_states.json").exists()
+
+    # The states are forgotten once plasmashell answers
+    answer.set_result("[]")
+    assert recovered.original_panel_states == {}
+    assert not (tmp_path / "panel_states.json").exists()
+
+
+def test_launch_during_recovery_keeps_the_recovered_states(tmp_path, monkeypatch):
+    """States recovered from a previous run survive a launch made before plasmashell answered the recovery."""
+    monkeypatch.setattr(Config, "CACHE_DIR", tmp_path)
+    (tmp_path / "panel_states.json").write_text('{"1": "none"}')
+    manager = _kde_manager(['[{"id": 1, "hiding": "dodgewindows"}]'])
+    answer = Future()
+    manager.dbus.call.return_value = answer
+    manager.recover_panel_states()
+
+    manager.save_and_dodge_panels()
+    answer.set_result("[]")
+
+    assert manager.original_panel_states == {"1": "none"}
+    assert (tmp_path / "panel_states.json").exists()
+
+
+def test_relaunch_keeps_the_original_states(tmp_path, monkeypatch):
+    """A second launch before a restore does not record the dodging state as the original."""
+    monkeypatch.setattr(Config, "CACHE_DIR", tmp_path)
+    manager = _kde_manager(['[{"id": 1, "hiding": "none"}]', '[{"id": 1, "hiding": "dodgewindows"}]'])
+    manager.save_and_dodge_panels()
+    manager.save_and_dodge_panels()
+    assert manager.original_panel_states == {"1": "none"}
+
+
+def test_kwin_script_is_reused_across_launches(tmp_path, monkeypatch):
+    """A running placement script is reused and only the published layout changes."""
+    monkeypatch.setattr(Config, "CACHE_DIR", tmp_path)
+    # Pass the arguments through as plain tuples
+    monkeypatch.setattr(kde_manager, "GLib", SimpleNamespace(Variant=lambda signature, value: value))
+    manager = _kde_manager([])
+    manager.dbus.unique_name = ":1.42"
+    kwin_calls = []
+
+    def call_kwin(bus_name, object_path, interface, method, parameters=None):
+        kwin_calls.append((method, parameters or ()))
+        return {"loadScript": 7, "isScriptLoaded": True}.get(method)
+
+    manager.dbus.call_sync.side_effect = call_kwin
+    profile = MagicMock(is_splitscreen_mode=True)
+
+    manager.device_manager.get_session_layout.return_value = {0: InstanceGeometry(0, 0, 0, 0, 1920, 1080)}
+    manager.start_kwin_script(profile)
+    manager.device_manager.get_session_layout.return_value = {
+        0: InstanceGeometry(0, 0, 0, 0, 960, 1080),
+        1: InstanceGeometry(1, 0, 960, 0, 960, 1080),
+    }
+    manager.start_kwin_script(profile)
+
+    assert [method for method, _ in kwin_calls] == ["loadScript", "start", "isScriptLoaded"]
+    script_path, plugin_name = kwin_calls[0][1]
+    assert 'var service = ":1.42";' in (tmp_path / script_path).read_text()
+    layout = json.loads(manager._layout_service.get_layout())
+    assert layout["generation"] == 2
+    assert [slot["x"] for slot in layout["slots"]] == [0, 960]
+
+    manager.dbus.register_object.assert_called_once()
+
+    manager.stop_kwin_script()
+    assert kwin_calls[-1] == ("unloadScript", (plugin_name,))
+    assert not list(tmp_path.glob("kwin_script_*"))
+    # The layout is only exported while the script runs
+    manager.dbus.unregister_object.assert_called_once_with(manager.dbus.register_object.return_value)
+
+
+def test_concurrent_starts_load_the_kwin_script_once(tmp_path, monkeypatch):
+    """Launches racing each other load the placement script a single time."""
+    monkeypatch.setattr(Config, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(kde_manager, "GLib", SimpleNamespace(Variant=lambda signature, value: value))
+    manager = _kde_manager([])
+    manager.dbus.unique_name = ":1.42"
+    methods = []
+
+    def call_kwin(bus_name, object_path, interface, method, parameters=None):
+        methods.append(method)
+        # KWin answers slowly, so an unsynchronized second start would load the script again
+        time.sleep(0.05)
+        return {"loadScript": 7, "isScriptLoaded": True}.get(method)
+
+    manager.dbus.call_sync.side_effect = call_kwin
+    manager.device_manager.get_session_layout.return_value = {}
+    starts = [threading.Thread(target=manager.start_kwin_script, args=(MagicMock(),)) for _ in range(2)]
+    for start in starts:
+        start.start()
+    for start in starts:
+        start.join()
+
+    assert methods == ["loadScript", "start", "isScriptLoaded"]
+    manager.dbus.register_object.assert_called_once()
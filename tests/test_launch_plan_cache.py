@@ -0,0 +1,69 @@
+"""Tests for the launch plan cache of the instance service."""
+
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.models import Profile
+from src.services.instance import InstanceService
+
+
+@pytest.fixture
+def service(monkeypatch):
+    """Return an instance service whose plans are built by a recording stub."""
+    service = InstanceService(MagicMock(), device_manager=MagicMock())
+    service.device_manager.get_screen_info.return_value = [{"name": "DP-1", "width": 1920, "height": 1080}]
+    monkeypatch.setattr(service, "_needs_virtual_joystick", lambda profile, instance_num: False)
+    monkeypatch.setattr(service, "_host_library_state", lambda: {"steamapps": 1})
+    service.built = []
+
+    def build(profile, instance_num):
+        service.built.append((instance_num, threading.current_thread().name))
+        return ["steam", str(instance_num)], {"GAMESCOPE": str(profile.use_gamescope)}
+
+    monkeypatch.setattr(service, "_prepare_instance_launch", build)
+    return service
+
+
+def test_unchanged_inputs_reuse_the_cached_plans(service):
+    """Plans are built concurrently once, then reused while nothing they depend on changes."""
+    profile = Profile(num_players=2)
+    first = service.prepare_launch_plans(profile, [0, 1])
+    assert sorted(n for n, _ in service.built) == [0, 1]
+    assert all(name.startswith("launch-plan") for _, name in service.built)
+
+    second = service.prepare_launch_plans(profile, [0, 1])
+    assert len(service.built) == 2
+    assert second == first
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        lambda service, profile: setattr(profile, "use_gamescope", not profile.use_gamescope),
+        lambda service, profile: setattr(service, "_host_library_state", lambda: {"steamapps": 2}),
+        lambda service, profile: service.device_manager.get_screen_info.return_value.append({"name": "HDMI-1"}),
+    ],
+    ids=["profile", "host library", "monitors"],
+)
+def test_changed_inputs_rebuild_the_plans(service, change):
+    """A change to the profile, the host Steam library or the monitors invalidates the cached plans."""
+    profile = Profile(num_players=2)
+    first = service.prepare_launch_plans(profile, [0])
+
+    change(service, profile)
+    second = service.prepare_launch_plans(profile, [0])
+
+    assert [n for n, _ in service.built] == [0, 0]
+    assert second[0].key != first[0].key
+
+
+def test_gamescope_override_is_part_of_the_key(service):
+    """A single-instance launch without gamescope does not reuse the session's plan."""
+    profile = Profile(num_players=2, use_gamescope=True)
+    session = service.prepare_launch_plans(profile, [0])
+    single = service.prepare_launch_plans(profile, [0], use_gamescope_override=False)
+
+    assert single[0].key != session[0].key
+    assert single[0].env == {"GAMESCOPE": "False"}
@@ -0,0 +1,87 @@
+"""Tests for the launch schedule of the launch controller."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.core import TwinverseError
+from src.gui.controllers.launch_controller import LaunchController
+from src.models import InstanceReadiness, LaunchPlan, Profile
+
+
+class _FakeInstanceService:
+    """Instances that become ready after a few readiness checks."""
+
+    CHECKS_UNTIL_READY = 3
+
+    def __init__(self, failing=None):
+        self.failing = failing
+        self.spawned = []
+        self.checks = {}
+        self.max_starting = 0
+        self.terminate_all = MagicMock()
+
+    def prepare_launch_plans(self, _profile, instance_nums):
+        return {n: LaunchPlan(instance_num=n, key="", command=["steam"], env={}) for n in instance_nums}
+
+    def spawn_instance(self, plan):
+        self.spawned.append(plan.instance_num)
+        self.checks[plan.instance_num] = 0
+        starting = sum(1 for checks in self.checks.values() if checks < self.CHECKS_UNTIL_READY)
+        self.max_starting = max(self.max_starting, starting)
+
+    def check_ready(self, instance_num):
+        if instance_num == self.failing:
+            raise TwinverseError(f"Instance {instance_num} exited during startup with code 1")
+        self.checks[instance_num] += 1
+        return InstanceReadiness(
+            instance_num=instance_num, ready=self.checks[instance_num] >= self.CHECKS_UNTIL_READY, stages={}
+        )
+
+
+def _controller(service, monkeypatch):
+    monkeypatch.setattr(LaunchController, "READY_POLL_INTERVAL", 0.001)
+    return LaunchController(service, MagicMock(), MagicMock())
+
+
+def test_schedule_keeps_at_most_the_allowed_instances_starting(monkeypatch):
+    """Every instance is spawned, in order, while no more than max_parallel_launches are starting."""
+    service = _FakeInstanceService()
+    controller = _controller(service, monkeypatch)
+    profile = Profile(selected_players=[0, 1, 2, 3], max_parallel_launches=2)
+    progress = []
+
+    controller._run_launch_schedule(profile, profile.selected_players, progress.append)
+
+    assert service.spawned == progress == [0, 1, 2, 3]
+    assert service.max_starting == 2
+    assert all(checks >= service.CHECKS_UNTIL_READY for checks in service.checks.values())
+
+
+def test_instance_failing_to_start_stops_the_whole_launch(monkeypatch):
+    """An instance exiting while starting reports an error and stops the instances spawned so far."""
+    service = _FakeInstanceService(failing=1)
+    controller = _controller(service, monkeypatch)
+    profile = Profile(selected_players=[0, 1, 2], max_parallel_launches=2, enable_kwin_script=False)
+    on_complete, on_error = MagicMock(), MagicMock()
+
+    controller._launch_worker(profile, None, on_complete, on_error)
+
+    assert service.spawned == [0, 1]
+    service.terminate_all.assert_called_once()
+    on_complete.assert_not_called()
+    assert isinstance(on_error.call_args.args[0], TwinverseError)
+    assert not controller.is_running()
+
+
+@pytest.mark.parametrize("max_parallel_launches", [1, 3])
+def test_cancelled_schedule_spawns_nothing_more(monkeypatch, max_parallel_launches):
+    """A launch cancelled before its first slot frees up spawns nothing."""
+    service = _FakeInstanceService()
+    controller = _controller(service, monkeypatch)
+    controller._cancel_event.set()
+    profile = Profile(selected_players=[0, 1], max_parallel_launches=max_parallel_launches)
+
+    controller._run_launch_schedule(profile, profile.selected_players, None)
+
+    assert service.spawned == []
@@ -0,0 +1,62 @@
+"""Tests for the session layout engine."""
+
+from unittest.mock import MagicMock
+
+from src.core.layout import InstanceGeometry, LayoutCalculator
+from src.models import Profile
+from src.services import DeviceManager
+
+MONITORS = [
+    {"id": 0, "name": "DP-1", "x": 0, "y": 0, "width": 2560, "height": 1440},
+    {"id": 1, "name": "HDMI-A-1", "x": 2560, "y": 0, "width": 1920, "height": 1080},
+]
+
+
+def test_small_groups_keep_the_fixed_layouts():
+    """Up to four players per screen use the predefined layouts."""
+    assert LayoutCalculator.calculate_position(1920, 1080, 3, 0, "vertical") == (0, 0, 960, 1080)
+    assert LayoutCalculator.calculate_position(1920, 1080, 3, 2, "vertical") == (960, 540, 960, 540)
+    assert LayoutCalculator.calculate_position(1920, 1080, 2, 1, "horizontal") == (0, 540, 1920, 540)
+
+
+def test_dense_screens_use_a_grid_without_gaps():
+    """Six and nine players per screen tile the whole monitor."""
+    for num_players in (6, 9):
+        cells = [LayoutCalculator.calculate_position(1920, 1080, num_players, i) for i in range(num_players)]
+        assert sum(width * height for _, _, width, height in cells) == 1920 * 1080
+    assert LayoutCalculator.calculate_position(1920, 1080, 9, 4, "vertical") == (640, 360, 640, 360)
+
+
+def test_session_layout_fills_monitors_and_honours_assignments():
+    """Instances fill the monitors in order while explicit assignments are respected."""
+    layout = LayoutCalculator.compute_session_layout(
+        MONITORS, [0, 1, 2, 3], True, "vertical", players_per_screen=2, monitor_assignments={3: "DP-1"}
+    )
+
+    assert layout[0] == InstanceGeometry(0, 0, 0, 0, 1280, 1440)
+    assert layout[3] == InstanceGeometry(3, 0, 1280, 0, 1280, 1440)
+    # The assigned instance takes a slot on the first monitor, so instance 1 moves to the second one
+    assert layout[1] == InstanceGeometry(1, 1, 2560, 0, 960, 1080)
+    assert layout[2] == InstanceGeometry(2, 1, 3520, 0, 960, 1080)
+
+
+def test_fullscreen_places_one_instance_per_monitor():
+    """In fullscreen mode extra instances get no geometry."""
+    layout = LayoutCalculator.compute_session_layout(MONITORS, [0, 1, 2], False)
+
+    assert [layout[i].monitor_id for i in (0, 1)] == [0, 1]
+    assert 2 not in layout
+
+
+def test_session_layout_is_recomputed_when_the_monitors_change():
+    """A new monitor snapshot with other geometry is never answered from the cache."""
+    topology = MagicMock()
+    topology.snapshot.return_value = [dict(monitor) for monitor in MONITORS]
+    device_manager = DeviceManager(MagicMock(), MagicMock(), topology)
+    profile = Profile(selected_players=[0], mode="fullscreen")
+
+    assert device_manager.get_session_layout(profile)[0].width == 2560
+    assert device_manager.get_session_layout(profile) is device_manager.get_session_layout(profile)
+
+    topology.snapshot.return_value = [dict(MONITORS[0], width=3840, height=2160), MONITORS[1]]
+    assert device_manager.get_session_layout(profile)[0].width == 3840
@@ -71,5 +71,31 @@ def test_update_num_players_limits():
     print("Todos os testes passaram!")
 
 
+def test_update_num_players_limits_with_players_per_screen():
+    """Testa os limites de splitscreen quando o perfil define outro número de jogadores por tela."""
+    from src.gui.pages.layout_settings_page import LayoutSettingsPage
+
+    with patch.object(LayoutSettingsPage, "__init__", lambda x: None):
+        layout_page = LayoutSettingsPage()
+        mock_adjustment = MagicMock()
+        mock_adjustment.get_value.return_value = 1
+        layout_page.num_players_row = MagicMock()
+        layout_page.num_players_row.get_adjustment.return_value = mock_adjustment
+
+        # 2 jogadores por tela com 3 monitores (limite deve ser 6)
+        layout_page._players_per_screen = 2
+        layout_page._num_monitors = 3
+        layout_page._update_num_players_limits(is_splitscreen=True)
+        mock_adjustment.set_upper.assert_called_with(6)  # min(8, 3*2) = 6
+
+        # 9 jogadores por tela com 1 monitor (uma tela cheia passa do máximo de 8)
+        mock_adjustment.reset_mock()
+        layout_page._players_per_screen = 9
+        layout_page._num_monitors = 1
+        layout_page._update_num_players_limits(is_splitscreen=True)
+        mock_adjustment.set_upper.assert_called_with(9)  # min(max(8, 9), 1*9) = 9
+
+
 if __name__ == "__main__":
     test_update_num_players_limits()
+    test_update_num_players_limits_with_players_per_screen()
@@ -0,0 +1,36 @@
+"""Tests for the queue-based logger."""
+
+import json
+import logging
+
+from src.core import Logger
+
+
+def test_records_are_written_by_the_listener_with_fields(tmp_path):
+    """Messages are formatted lazily in the listener, with structured fields in the JSON file output."""
+    calls = []
+    logger = Logger("test-json-logger", tmp_path, level=logging.DEBUG, json_output=True)
+
+    logger.info("Instance %d spawned", 1, instance=1, phase="spawn", duration_ms=12.5)
+    logger.debug("Command: %s", Logger.lazy(lambda: calls.append(1) or "steam -silent"))
+    logger.close()
+
+    records = [json.loads(line) for line in (tmp_path / "test-json-logger.log").read_text().splitlines()]
+    assert records[0]["message"] == "Instance 1 spawned"
+    assert (records[0]["instance"], records[0]["phase"], records[0]["duration_ms"]) == (1, "spawn", 12.5)
+    assert records[1]["message"] == "Command: steam -silent"
+    # Formatted once by each of the console and file handlers, never by the caller
+    assert len(calls) == 2
+
+
+def test_disabled_levels_never_build_arguments(tmp_path):
+    """Lazy arguments of records below the logger level are not computed."""
+    calls = []
+    logger = Logger("test-text-logger", tmp_path, level=logging.INFO)
+    logger.debug("Environment: %s", Logger.lazy(calls.append, 1))
+    logger.info("Ready", instance=0)
+    logger.flush()
+
+    assert calls == []
+    assert (tmp_path / "test-text-logger.log").read_text().strip().endswith("Ready [instance=0]")
+    logger.close()
@@ -0,0 +1,63 @@
+"""Tests for the incremental sync of app manifests into instance homes."""
+
+import os
+from unittest.mock import MagicMock
+
+from src.services.manifest_sync import ManifestSync
+from src.services.steam_library import SteamLibraryIndex
+
+
+def _setup(tmp_path):
+    """Create a host library with one game and an empty instance steamapps."""
+    host_steamapps = tmp_path / "Steam/steamapps"
+    (host_steamapps / "common/Portal").mkdir(parents=True)
+    (host_steamapps / "appmanifest_400.acf").write_text('"AppState"\n{\n\t"installdir"\t\t"Portal"\n}\n')
+    dest_steamapps = tmp_path / "home_1/steamapps"
+    dest_steamapps.mkdir(parents=True)
+    index = SteamLibraryIndex(MagicMock(), tmp_path / "Steam", tmp_path / "index.json")
+    return host_steamapps, dest_steamapps, index
+
+
+def test_updated_manifests_are_copied_again(tmp_path):
+    """A manifest updated on the host replaces the copy in the instance."""
+    host_steamapps, dest_steamapps, index = _setup(tmp_path)
+    sync = ManifestSync(MagicMock())
+
+    sync.sync(index.snapshot(), dest_steamapps)
+    assert (dest_steamapps / "appmanifest_400.acf").exists()
+
+    (host_steamapps / "appmanifest_400.acf").write_text('"AppState"\n{\n\t"buildid"\t\t"2"\n}\n')
+    os.utime(host_steamapps, ns=(0, 1))
+    sync.sync(index.snapshot(), dest_steamapps)
+
+    assert "buildid" in (dest_steamapps / "appmanifest_400.acf").read_text()
+
+
+def test_only_synced_manifests_are_removed(tmp_path):
+    """Uninstalled host games disappear, games installed in the instance stay."""
+    host_steamapps, dest_steamapps, index = _setup(tmp_path)
+    (dest_steamapps / "appmanifest_620.acf").write_text("local")
+    sync = ManifestSync(MagicMock())
+    sync.sync(index.snapshot(), dest_steamapps)
+
+    (host_steamapps / "appmanifest_400.acf").unlink()
+    sync.sync(index.snapshot(), dest_steamapps)
+
+    assert not (dest_steamapps / "appmanifest_400.acf").exists()
+    assert (dest_steamapps / "appmanifest_620.acf").exists()
+
+
+def test_manifests_already_gone_are_not_counted_as_removed(tmp_path):
+    """A synced manifest the user deleted from the instance is forgotten without being reported as removed."""
+    host_steamapps, dest_steamapps, index = _setup(tmp_path)
+    logger = MagicMock()
+    sync = ManifestSync(logger)
+    sync.sync(index.snapshot(), dest_steamapps)
+
+    (dest_steamapps / "appmanifest_400.acf").unlink()
+    (host_steamapps / "appmanifest_400.acf").unlink()
+    logger.reset_mock()
+    sync.sync(index.snapshot(), dest_steamapps)
+
+    logger.info.assert_not_called()
+    assert "400" not in (dest_steamapps / ManifestSync.STATE_FILE).read_text()
@@ -0,0 +1,43 @@
+"""Tests for the cached monitor topology."""
+
+from unittest.mock import MagicMock, patch
+
+from screeninfo import Monitor
+
+from src.services.monitor_topology import MonitorTopology
+
+MONITORS = [
+    Monitor(x=0, y=0, width=2560, height=1440, name="DP-1", is_primary=True),
+    Monitor(x=2560, y=0, width=1920, height=1080, name="HDMI-A-1"),
+]
+
+
+def test_monitors_are_queried_once_until_invalidated():
+    """Geometry queries are answered from the snapshot."""
+    topology = MonitorTopology(MagicMock())
+    with patch("src.services.monitor_topology.get_monitors", return_value=MONITORS) as get_monitors:
+        for _ in range(8):
+            topology.snapshot()
+        get_monitors.assert_called_once()
+
+        topology.invalidate()
+        topology.snapshot()
+        assert get_monitors.call_count == 2
+
+
+def test_update_adds_refresh_rates_and_notifies():
+    """Refresh rates reported by the toolkit are matched by connector or position."""
+    topology = MonitorTopology(MagicMock())
+    callback = MagicMock()
+    topology.subscribe(callback)
+    details = [
+        {"connector": "DP-1", "x": 0, "y": 0, "refresh_rate": 144.0},
+        {"connector": None, "x": 2560, "y": 0, "refresh_rate": 60.0},
+    ]
+
+    with patch("src.services.monitor_topology.get_monitors", return_value=MONITORS):
+        monitors = topology.update(details)
+
+    assert [m["refresh_rate"] for m in monitors] == [144.0, 60.0]
+    assert monitors[0]["is_primary"] and not monitors[1]["is_primary"]
+    callback.assert_called_once_with(monitors)
@@ -0,0 +1,62 @@
+"""Tests for the bind-mount planning of the host Steam library."""
+
+from unittest.mock import MagicMock
+
+from src.models import Profile
+from src.services.mount_planner import MountPlanner
+from src.services.steam_library import SteamLibraryIndex
+
+
+def _make_library(tmp_path, num_games):
+    """Create a fake host Steam library with the given number of games."""
+    steam_path = tmp_path / "host/.local/share/Steam"
+    for i in range(num_games):
+        (steam_path / "steamapps/common" / f"Game {i}").mkdir(parents=True)
+    (steam_path / "compatibilitytools.d/GE-Proton").mkdir(parents=True)
+    (steam_path / "compatibilitytools.d/LegacyRuntime").mkdir()
+    return steam_path
+
+
+def _make_planner(tmp_path, steam_path):
+    """Create a mount planner reading the given host library."""
+    return MountPlanner(MagicMock(), SteamLibraryIndex(MagicMock(), steam_path, tmp_path / "index.json"))
+
+
+def test_large_library_uses_single_shared_bind(tmp_path):
+    """A large library is shared with one bind when the instance has no local games."""
+    steam_path = _make_library(tmp_path, MountPlanner.SHARED_THRESHOLD + 1)
+    planner = _make_planner(tmp_path, steam_path)
+
+    args = planner.build_mount_args(Profile(), tmp_path / "home_1", tmp_path / "host")
+
+    common = str(steam_path / "steamapps/common")
+    assert args[:3] == ["--bind", common, str(tmp_path / "host/.local/share/Steam/steamapps/common")]
+    # One bind for the games plus one for the compatibility tool, LegacyRuntime is skipped
+    assert len(args) == 6
+
+
+def test_local_games_keep_per_folder_binds(tmp_path):
+    """Games installed inside the instance stay visible by falling back to per-folder binds."""
+    steam_path = _make_library(tmp_path, MountPlanner.SHARED_THRESHOLD + 1)
+    instance_home = tmp_path / "home_1"
+    (instance_home / ".local/share/Steam/steamapps/common/Local Game").mkdir(parents=True)
+    planner = _make_planner(tmp_path, steam_path)
+
+    args = planner.build_mount_args(Profile(), instance_home, tmp_path / "host")
+
+    common = str(steam_path / "steamapps/common")
+    assert common not in args
+    assert args.count("--bind") == MountPlanner.SHARED_THRESHOLD + 2
+
+
+def test_allowlist_binds_only_listed_games(tmp_path):
+    """Only the games listed in the profile are bound in allowlist mode."""
+    steam_path = _make_library(tmp_path, 3)
+    (steam_path / "steamapps/appmanifest_42.acf").write_text('"AppState"\n{\n\t"installdir"\t\t"Game 1"\n}\n')
+    planner = _make_planner(tmp_path, steam_path)
+    profile = Profile(LIBRARY_APP_IDS=["42", "43"])
+
+    args = planner.build_mount_args(profile, tmp_path / "home_1", tmp_path / "host")
+
+    assert str(steam_path / "steamapps/common/Game 1") in args
+    assert str(steam_path / "steamapps/common/Game 0") not in args
@@ -0,0 +1,48 @@
+"""Tests for the pidfd based process supervisor."""
+
+import select
+import subprocess
+import sys
+from unittest.mock import MagicMock, patch
+
+from src.services.process_supervisor import InstanceExit, ProcessSupervisor
+
+
+def test_exit_is_reported_when_the_pidfd_becomes_readable():
+    """The exit code and runtime of a watched process reach the subscribers once its pidfd fires."""
+    supervisor = ProcessSupervisor(MagicMock())
+    events = []
+    supervisor.subscribe(events.append)
+
+    with patch("src.services.process_supervisor.GLib") as glib:
+        process = subprocess.Popen([sys.executable, "-c", "raise SystemExit(3)"])
+        supervisor.watch(2, process)
+        (_priority, pidfd, _condition, callback, instance_num), _ = glib.unix_fd_add_full.call_args
+        glib.child_watch_add.assert_not_called()
+
+        assert select.select([pidfd], [], [], 5)[0] == [pidfd]
+        callback(pidfd, None, instance_num)
+
+    assert len(events) == 1
+    assert isinstance(events[0], InstanceExit)
+    assert events[0][:3] == (2, process.pid, 3)
+    assert events[0].runtime >= 0
+    assert process.returncode == 3
+    assert not supervisor._watches
+
+
+def test_child_watch_is_used_without_pidfd():
+    """Without pidfd support, the exit is reported from a GLib child watch."""
+    supervisor = ProcessSupervisor(MagicMock())
+    events = []
+    supervisor.subscribe(events.append)
+    process = MagicMock(pid=1234)
+
+    with patch("src.services.process_supervisor.GLib") as glib, patch("os.pidfd_open", side_effect=OSError):
+        supervisor.watch(0, process)
+        (_priority, pid, callback, instance_num), _ = glib.child_watch_add.call_args
+        callback(pid, 9, instance_num)
+
+    assert events[0][:3] == (0, 1234, -9)
+    # GLib reaped the process, so its status is handed to Popen
+    assert process.returncode == -9
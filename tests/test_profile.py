@@ -0,0 +1,34 @@
+"""Tests for loading and saving the profile."""
+
+import pytest
+
+from src.core import Config
+from src.models import Profile
+
+
+def test_profile_round_trip(tmp_path, monkeypatch):
+    """A saved profile loads back with the same values, and a missing one is created."""
+    monkeypatch.setattr(Config, "get_profile_path", staticmethod(lambda: tmp_path / "profile.json"))
+    assert Profile.load() == Profile()
+
+    profile = Profile(NUM_PLAYERS=3, PLAYERS=[{"REFRESH_RATE": 144}], selected_players=[0, 2])
+    profile.save()
+    assert Profile.load() == profile
+
+
+def test_profile_errors(tmp_path, monkeypatch):
+    """Unreadable and invalid profiles are reported as ValueError."""
+    profile_path = tmp_path / "profile.json"
+    monkeypatch.setattr(Config, "get_profile_path", staticmethod(lambda: profile_path))
+
+    profile_path.write_text("{not json")
+    with pytest.raises(ValueError, match="Error reading profile file"):
+        Profile.load()
+
+    profile_path.write_text('{"MODE": "splitscreen", "SPLITSCREEN": {"ORIENTATION": "diagonal"}}')
+    with pytest.raises(ValueError, match="validation failed"):
+        Profile.load()
+
+    profile_path.write_text('{"PLAYERS_PER_SCREEN": 12}')
+    with pytest.raises(ValueError, match="validation failed"):
+        Profile.load()
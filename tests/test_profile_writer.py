@@ -0,0 +1,44 @@
+"""Tests for the write-behind profile writer."""
+
+import json
+import time
+from unittest.mock import MagicMock, patch
+
+from src.core import Utils
+from src.models import Profile
+from src.services.profile_writer import ProfileWriter
+
+
+def test_rapid_saves_are_coalesced_and_unchanged_content_is_skipped(tmp_path):
+    """Several saves in a row produce one atomic write, and saving the same content again writes nothing."""
+    path = tmp_path / "profile.json"
+    writer = ProfileWriter(MagicMock(), path=path)
+    profile = Profile()
+
+    with patch.object(Utils, "write_atomic", wraps=Utils.write_atomic) as write_atomic:
+        for num_players in (2, 3, 4):
+            profile.num_players = num_players
+            writer.schedule(profile)
+        writer.flush()
+        assert write_atomic.call_count == 1
+        assert json.loads(path.read_text())["NUM_PLAYERS"] == 4
+
+        writer.schedule(profile)
+        writer.close()
+        assert write_atomic.call_count == 1
+
+    assert [p.name for p in tmp_path.iterdir()] == ["profile.json"]
+
+
+def test_pending_save_is_written_in_the_background(tmp_path, monkeypatch):
+    """A save is written by the background thread once no new request arrives."""
+    monkeypatch.setattr(ProfileWriter, "DELAY_SECONDS", 0.01)
+    path = tmp_path / "profile.json"
+    writer = ProfileWriter(MagicMock(), path=path)
+    writer.schedule(Profile())
+
+    deadline = time.monotonic() + 2
+    while not path.exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert json.loads(path.read_text())["NUM_PLAYERS"] == Profile().num_players
+    writer.close()
@@ -0,0 +1,127 @@
+"""Tests for the instance readiness probe."""
+
+import os
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.core import TwinverseError, Utils
+from src.services.readiness_probe import ReadinessProbe
+
+PGID = 4242
+
+
+@pytest.fixture
+def probe(tmp_path, monkeypatch):
+    """Return a probe reading a fake /proc, outside of Flatpak."""
+    (tmp_path / "proc").mkdir()
+    monkeypatch.setattr(ReadinessProbe, "PROC_DIR", tmp_path / "proc")
+    monkeypatch.setattr(ReadinessProbe, "POLL_INTERVAL", 0.01)
+    with patch.object(Utils, "is_flatpak", return_value=False):
+        yield ReadinessProbe(MagicMock(), output_tail=lambda instance_num: f"output of {instance_num}")
+
+
+def _add_process(tmp_path, pid, name, pgid=PGID):
+    (tmp_path / "proc" / str(pid)).mkdir()
+    (tmp_path / "proc" / str(pid) / "stat").write_text(f"{pid} ({name}) S 1 {pgid} {pgid} 0 -1")
+
+
+def _write_steam_log(home):
+    logs_dir = home / ".local/share/Steam/logs"
+    logs_dir.mkdir(parents=True)
+    (logs_dir / "console_log.txt").write_text("Steam started")
+
+
+def _track(probe, home, expects_window=False, returncode=None):
+    process = MagicMock()
+    process.poll.return_value = returncode
+    probe.track(0, process, PGID, home, expects_window)
+    return process
+
+
+def test_untracked_instance_is_not_ready(probe):
+    """An instance that was never spawned reports no stages."""
+    readiness = probe.check(3)
+    assert not readiness.ready and readiness.stages == {}
+
+
+def test_process_tree_stage_needs_steam_in_the_process_group(probe, tmp_path):
+    """Only a Steam process in the instance's own process group counts."""
+    home = tmp_path / "home"
+    _track(probe, home)
+    _add_process(tmp_path, 100, "steam", pgid=PGID + 1)
+    _add_process(tmp_path, 101, "bwrap")
+    assert "process_tree" not in probe.check(0).stages
+
+    _add_process(tmp_path, 102, "steamwebhelper")
+    assert "process_tree" in probe.check(0).stages
+
+
+def test_steam_log_stage_needs_a_log_written_after_the_spawn(probe, tmp_path):
+    """A Steam log left over from a previous run does not count."""
+    home = tmp_path / "home"
+    _write_steam_log(home)
+    log = home / ".local/share/Steam/logs/console_log.txt"
+    old = time.time() - 60
+    os.utime(log, (old, old))
+    _track(probe, home)
+    assert "steam_log" not in probe.check(0).stages
+
+    log.write_text("Steam started again")
+    assert "steam_log" in probe.check(0).stages
+
+
+def test_ready_once_every_expected_stage_was_reached(probe, tmp_path):
+    """Instances in gamescope also wait for Xwayland; the stages stay recorded once reached."""
+    home = tmp_path / "home"
+    _track(probe, home, expects_window=True)
+    _add_process(tmp_path, 100, "steam")
+    _write_steam_log(home)
+    readiness = probe.check(0)
+    assert not readiness.ready
+    assert set(readiness.stages) == {"process_tree", "steam_log"}
+
+    _add_process(tmp_path, 101, "Xwayland")
+    readiness = probe.check(0)
+    assert readiness.ready
+    assert set(readiness.stages) == {"process_tree", "steam_log", "window"}
+    assert probe.wait_ready(0, timeout=1).ready
+
+
+def test_process_group_is_listed_with_pgrep_in_flatpak(probe, tmp_path):
+    """Inside Flatpak, the host process group is listed with pgrep."""
+    _track(probe, tmp_path / "home")
+    pgrep = MagicMock(stdout="100 steam\n101 Xwayland\n")
+    with (
+        patch.object(Utils, "is_flatpak", return_value=True),
+        patch.object(Utils, "flatpak_spawn_host", return_value=pgrep) as spawn,
+    ):
+        assert "process_tree" in probe.check(0).stages
+    assert spawn.call_args.args[0] == ["pgrep", "-l", "-g", str(PGID)]
+
+
+def test_wait_ready_gives_up_at_the_timeout(probe, tmp_path):
+    """An instance that never gets ready is reported as not ready once the timeout expired."""
+    _track(probe, tmp_path / "home")
+    _add_process(tmp_path, 100, "steam")
+
+    started_at = time.monotonic()
+    readiness = probe.wait_ready(0, timeout=0.1)
+
+    assert not readiness.ready
+    assert set(readiness.stages) == {"process_tree"}
+    assert 0.1 <= time.monotonic() - started_at < 1
+    probe._logger.warning.assert_called_once()
+
+
+def test_exit_during_startup_reports_the_output(probe, tmp_path):
+    """An instance that exits before it is ready raises an error with the end of its output."""
+    _track(probe, tmp_path / "home", returncode=1)
+    with pytest.raises(TwinverseError, match="code 1\nOutput: output of 0"):
+        probe.wait_ready(0, timeout=1)
+
+
+def test_stages_are_formatted_in_the_order_they_were_reached():
+    """The stage summary lists stages chronologically."""
+    assert ReadinessProbe.format_stages({"window": 2.5, "process_tree": 0.25}) == "process_tree +0.25s, window +2.50s"
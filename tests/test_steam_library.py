@@ -0,0 +1,41 @@
+"""Tests for the cached index of the host Steam library."""
+
+from unittest.mock import MagicMock
+
+from src.services.steam_library import SteamLibraryIndex
+
+
+def _write_manifest(steamapps, app_id, install_dir):
+    """Write a minimal app manifest."""
+    (steamapps / f"appmanifest_{app_id}.acf").write_text(
+        f'"AppState"\n{{\n\t"appid"\t\t"{app_id}"\n\t"name"\t\t"{install_dir}"\n\t"installdir"\t\t"{install_dir}"\n}}\n'
+    )
+
+
+def test_index_is_persisted_and_reused(tmp_path):
+    """A second index over an unchanged library is served from the on-disk cache."""
+    steam_path = tmp_path / "Steam"
+    (steam_path / "steamapps/common/Portal").mkdir(parents=True)
+    _write_manifest(steam_path / "steamapps", "400", "Portal")
+    cache_path = tmp_path / "index.json"
+
+    library = SteamLibraryIndex(MagicMock(), steam_path, cache_path).snapshot()
+    assert library.install_dir("400") == "Portal"
+    assert library.games == ["Portal"]
+    assert cache_path.exists()
+
+    logger = MagicMock()
+    assert SteamLibraryIndex(logger, steam_path, cache_path).snapshot() == library
+    logger.info.assert_not_called()
+
+
+def test_index_picks_up_new_manifests(tmp_path):
+    """Manifests added after the first scan appear in the next snapshot."""
+    steam_path = tmp_path / "Steam"
+    (steam_path / "steamapps/common").mkdir(parents=True)
+    index = SteamLibraryIndex(MagicMock(), steam_path, tmp_path / "index.json")
+    assert index.snapshot().manifests == {}
+
+    _write_manifest(steam_path / "steamapps", "620", "Portal 2")
+
+    assert list(index.snapshot().manifests) == ["620"]
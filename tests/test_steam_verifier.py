@@ -0,0 +1,66 @@
+"""Tests for the cached Steam installation verifier."""
+
+from unittest.mock import MagicMock
+
+from src.services.steam_verifier import SteamVerifier
+
+
+def test_results_follow_the_installation(tmp_path):
+    """An unwatched home is verified from the library metadata on every call."""
+    verifier = SteamVerifier(MagicMock())
+    assert verifier.verify(tmp_path) is False
+
+    steam_client = tmp_path / SteamVerifier.STEAM_CLIENT
+    steam_client.parent.mkdir(parents=True)
+    steam_client.touch()
+    assert verifier.verify(tmp_path) is True
+
+    steam_client.unlink()
+    assert verifier.verify(tmp_path) is False
+
+
+def test_watched_home_is_not_read_until_invalidated(tmp_path, monkeypatch):
+    """A watched home keeps its cached result until its monitor reports a change."""
+    verifier = SteamVerifier(MagicMock())
+    verifier.watch(tmp_path, lambda path: None)
+    assert verifier.verify(tmp_path) is False
+
+    stat_calls = []
+    monkeypatch.setattr(SteamVerifier, "_signature", staticmethod(lambda path: stat_calls.append(path) or (1, 1, 1)))
+    assert verifier.verify(tmp_path) is False
+    assert stat_calls == []
+
+    verifier.invalidate(tmp_path)
+    assert verifier.verify(tmp_path) is True
+    assert len(stat_calls) == 1
+
+
+def _install_client(home, content=b"client"):
+    """Create the files of a Steam client in an instance home."""
+    steam_dir = home / SteamVerifier.STEAM_DIR
+    for rel in SteamVerifier.REQUIRED_FILES:
+        (steam_dir / rel).parent.mkdir(parents=True, exist_ok=True)
+        (steam_dir / rel).write_bytes(b"x")
+    (steam_dir / "ubuntu12_32/libsteam.so").write_bytes(content)
+    (steam_dir / SteamVerifier.CLIENT_MANIFEST).parent.mkdir(parents=True, exist_ok=True)
+    (steam_dir / SteamVerifier.CLIENT_MANIFEST).write_text('"ubuntu12"\n{\n\t"version"\t\t"1700000000"\n}\n')
+
+
+def test_health_check_flags_the_odd_instance_and_reuses_hashes(tmp_path):
+    """A file differing from the other instances is reported, and unchanged files are not hashed again."""
+    homes = [tmp_path / f"home_{number}" for number in (1, 2, 3)]
+    for home in homes:
+        _install_client(home)
+    (homes[2] / SteamVerifier.STEAM_DIR / "ubuntu12_32/libsteam.so").write_bytes(b"corrupt")
+    (homes[2] / SteamVerifier.STEAM_DIR / "steam.sh").write_bytes(b"")
+
+    verifier = SteamVerifier(MagicMock(), cache_dir=tmp_path / "cache")
+    reports = verifier.check_health(homes)
+
+    assert reports[homes[0]].healthy and reports[homes[1]].healthy
+    assert reports[homes[2]].mismatched == ["steam.sh", "ubuntu12_32/libsteam.so"]
+    assert reports[homes[2]].empty == ["steam.sh"]
+    assert reports[homes[0]].hashed == len(SteamVerifier.REQUIRED_FILES) + 1
+
+    reports = SteamVerifier(MagicMock(), cache_dir=tmp_path / "cache").check_health(homes)
+    assert all(report.hashed == 0 for report in reports.values())
@@ -0,0 +1,43 @@
+"""Tests for the virtual joystick pool."""
+
+from unittest.mock import MagicMock, patch
+
+from src.services.virtual_device import VirtualDeviceService
+
+
+def test_each_instance_gets_its_own_reusable_joystick(tmp_path, monkeypatch):
+    """Every instance gets a distinct device, found through its uinput sysname and kept until destroyed."""
+    for number in (1, 2):
+        (tmp_path / f"sys/input{number}/event{number + 20}").mkdir(parents=True)
+    (tmp_path / "dev").mkdir()
+    for number in (1, 2):
+        (tmp_path / f"dev/event{number + 20}").touch()
+    monkeypatch.setattr(VirtualDeviceService, "SYSFS_VIRTUAL_INPUT", tmp_path / "sys")
+    monkeypatch.setattr(VirtualDeviceService, "DEV_INPUT", tmp_path / "dev")
+
+    def create_uinput(capabilities, name, **kwargs):
+        return MagicMock(fd=int(name.split()[2]))
+
+    def get_sysname(fd, request, buffer):
+        buffer[:7] = f"input{fd}\0".encode()
+
+    service = VirtualDeviceService(MagicMock())
+    with (
+        patch("src.services.virtual_device.UInput", side_effect=create_uinput) as uinput,
+        patch("src.services.virtual_device.fcntl.ioctl", side_effect=get_sysname),
+    ):
+        service.reserve([0, 1])
+        assert service.get_joystick(0) == str(tmp_path / "dev/event21")
+        assert service.get_joystick(1) == str(tmp_path / "dev/event22")
+        assert service.get_joystick(0) == str(tmp_path / "dev/event21")
+
+    assert uinput.call_count == 2
+    assert {call.kwargs["phys"] for call in uinput.call_args_list} == {"twinverse/instance0", "twinverse/instance1"}
+    # An instance that got a physical controller gives its joystick back
+    service.release(1)
+    assert service.get_path(1) is None
+    assert service.get_path(0) == str(tmp_path / "dev/event21")
+
+    service.destroy_all()
+    assert service.get_path(0) is None
+    assert service._executor is None